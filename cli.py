@@ -0,0 +1,583 @@
+# cli.py
+
+import argparse
+import os
+import sys
+
+from config import SERVER_HOST, SERVER_PORT, STARTUP_BUDGET_MS, THUMBNAIL_SIZE
+
+# Subcommands import what they need from core/ themselves, so “--help” and each command
+# only pay for their own modules (see “startup”). Choices are spelled out for the same
+# reason; keep them in step with ValueSeries.SERIES/UNITS, LibraryImporter.POLICIES,
+# MemoryReport.MODES, ContentHasher.KINDS and XMLHandler.RENAME_KINDS.
+SERIES_CHOICES = ("E6", "E12", "E24", "E48", "E96", "E192")
+KIND_CHOICES = ("resistor", "capacitor")
+POLICY_CHOICES = ("skip", "rename", "replace")
+MEMORY_MODE_CHOICES = ("tree", "indexed", "catalog")
+KIND_UNUSED_CHOICES = ("package", "symbol")
+RENAME_KIND_CHOICES = ("package", "symbol", "deviceset")
+
+
+def _save(session):
+    """
+    Save a LibrarySession (under the library's lock); mention it if our changes had to be
+    re‐applied because someone else saved the file while we were working.
+    """
+    replayed = session.save()
+    if replayed:
+        print(f"note: {session.path} changed on disk; re‐applied: {', '.join(replayed)}")
+
+
+def _cmd_duplicates(args):
+    """
+    Report groups of geometry‐identical packages/symbols; with --rewrite, point every
+    device/gate reference at one canonical member of each group and save the library.
+    """
+    from core.content_hash import ContentHasher
+    from core.library_catalog import LibraryCatalog
+    from core.library_session import LibrarySession
+    from core.xml_handler import XMLHandler
+
+    if args.rewrite:
+        session = LibrarySession.open(args.library)
+        groups = {kind: XMLHandler.find_duplicates(session.tree, kind) for kind in ContentHasher.KINDS}
+    else:
+        # Report only: sections are hashed independently (in parallel on multi‐core machines)
+        catalog = LibraryCatalog.load(args.library, sections=("packages", "symbols"), workers=args.workers)
+        groups = {
+            kind: XMLHandler.duplicate_groups(catalog.content_hashes(kind)) for kind in ContentHasher.KINDS
+        }
+
+    for kind in ContentHasher.KINDS:
+        print(f"{len(groups[kind])} duplicate {kind} group(s)")
+        for group in groups[kind]:
+            print("  " + ", ".join(group))
+
+    if args.rewrite:
+        redirected = 0
+        for kind in ContentHasher.KINDS:
+            # groups=None: recomputed if the merge has to be replayed onto a newer file
+            redirected += len(session.apply(f"merge duplicate {kind}s", XMLHandler.merge_duplicates, kind))
+        _save(session)
+        print(f"Redirected references of {redirected} duplicate(s).")
+    return 0
+
+
+def _cmd_unused(args):
+    """
+    Report packages/symbols no deviceset refers to; with --prune, remove them and save.
+    """
+    from core.content_hash import ContentHasher
+    from core.library_catalog import LibraryCatalog
+    from core.library_session import LibrarySession
+    from core.xml_handler import XMLHandler
+
+    kinds = [args.kind] if args.kind else ContentHasher.KINDS
+    if args.prune:
+        session = LibrarySession.open(args.library)
+        unused = {kind: XMLHandler.find_unused(session.tree, kind) for kind in kinds}
+    else:
+        # Report only: the catalog's deviceset summaries carry every gate symbol and device package
+        catalog = LibraryCatalog.load(args.library, workers=args.workers)
+        unused = {kind: catalog.unused(kind) for kind in kinds}
+
+    for kind in kinds:
+        print(f"{len(unused[kind])} unused {kind}(s)")
+        for name in unused[kind]:
+            print("  " + name)
+
+    if args.prune:
+        removed = 0
+        with session.transaction():
+            for kind in kinds:
+                # names=None: recomputed if the prune has to be replayed onto a newer file
+                removed += len(session.apply(f"prune unused {kind}s", XMLHandler.prune_unused, kind))
+        _save(session)
+        print(f"Removed {removed} unused package(s)/symbol(s).")
+    return 0
+
+
+def _cmd_rename(args):
+    """
+    Rename packages/symbols/devicesets together with every reference to them, from
+    -r KIND OLD NEW and/or mapping files, in one transaction; --undo-file writes the
+    renames that revert it.
+    """
+    from core.library_session import LibrarySession
+    from core.rename_map import read_rename_map, write_rename_map
+    from core.xml_handler import XMLHandler
+
+    renames = [tuple(r) for r in args.rename or ()]
+    for path in args.map or ():
+        renames += read_rename_map(path)
+    if not renames:
+        print("Nothing to rename (use -r KIND OLD NEW or --map FILE).", file=sys.stderr)
+        return 2
+    bad = [kind for kind, _old, _new in renames if kind not in RENAME_KIND_CHOICES]
+    if bad:
+        print(f"Unknown kind(s): {', '.join(bad)} (one of {', '.join(RENAME_KIND_CHOICES)}).", file=sys.stderr)
+        return 2
+
+    session = LibrarySession.open(args.library)
+    updated, undo = session.apply(f"rename {len(renames)} name(s)", XMLHandler.rename_many, renames)
+    _save(session)
+    if args.undo_file:
+        write_rename_map(args.undo_file, undo)
+    print(f"Renamed {len(renames)} name(s), {updated} reference(s) updated.")
+    return 0
+
+
+def _cmd_import(args):
+    """
+    Import devicesets (default: all) plus their symbols/packages from another library.
+    """
+    from core.library_import import LibraryImporter
+    from core.library_session import LibrarySession
+    from core.xml_handler import XMLHandler
+
+    session = LibrarySession.open(args.library)
+    src_tree = XMLHandler.parse_library(args.source)
+    report = session.apply(
+        f"import from {os.path.basename(args.source)}",
+        LibraryImporter.import_devicesets,
+        src_tree, ds_names=args.deviceset or None, policy=args.on_conflict
+    )
+    for key, lines in report.items():
+        for line in lines:
+            print(f"{key:>8}: {line}")
+    _save(session)
+    return 0
+
+
+def _cmd_index(args):
+    """
+    Scan a directory tree of libraries into the parts index (only changed files are re‐read).
+    """
+    from core.parts_index import PartsIndex
+
+    index = PartsIndex(args.db)
+    rescanned, removed, failed = index.update(args.directory, workers=args.workers)
+    for path, error in failed:
+        print(f"failed: {path}: {error}")
+    libs, rows = index.count()
+    index.close()
+    print(f"{len(rescanned)} rescanned, {len(removed)} removed; {libs} libraries, {rows} parts indexed.")
+    return 1 if failed else 0
+
+
+def _cmd_search(args):
+    """
+    Search the parts index; every term must match one of the fields.
+    """
+    from core.parts_index import PartsIndex
+
+    index = PartsIndex(args.db)
+    rows = index.search(" ".join(args.query), limit=args.limit)
+    index.close()
+    for library, deviceset, device, technology, package, lcsc, value, description in rows:
+        print(f"{os.path.basename(library)}\t{deviceset}\t{device}\t{technology}\t"
+              f"{package}\t{lcsc}\t{value}\t{description}")
+    return 0 if rows else 1
+
+
+def _cmd_series(args):
+    """
+    Create one deviceset per standard value in a range, for every given package; save once.
+    """
+    from core.library_session import LibrarySession
+    from core.value_series import ValueSeries
+
+    session = LibrarySession.open(args.library)
+    warnings = []
+    created, merged = session.apply(
+        f"{args.series} series {args.start}–{args.stop}",
+        ValueSeries.generate,
+        args.series, args.start, args.stop, args.package,
+        kind=args.kind,
+        name_template=args.name,
+        value_template=args.value,
+        desc_template=args.description,
+        lcsc_template=args.lcsc,
+        prefix=args.prefix,
+        symbol_name=args.symbol,
+        template=args.template,
+        warnings=warnings,
+        technologies=args.technologies,
+    )
+    _save(session)
+    for line in warnings:
+        print(f"warning: {line}")
+    print(f"{created} deviceset(s) created, {merged} merged.")
+    return 0
+
+
+def _cmd_templates(args):
+    """
+    List the library's template devicesets: gates → symbols and the packages they cover.
+    """
+    from core.library_index import LibraryIndex
+    from core.xml_handler import XMLHandler
+
+    index = LibraryIndex.for_tree(XMLHandler.parse_library(args.library))
+    names = index.template_names()
+    if not names:
+        print(f"No template devicesets; the first deviceset "
+              f"({index.template().name}) is used as template.")
+        return 1
+    for name in names:
+        tpl = index.template(name)
+        gates = ", ".join(f"{gate}:{sym}" for gate, sym in tpl.gate_symbols.items())
+        print(f"{name}\t{gates}\t{len(tpl.devices)} package(s): {', '.join(tpl.devices)}")
+    return 0
+
+
+def _cmd_preview(args):
+    """
+    Render package (and with --symbols, symbol) thumbnails into the shared thumbnail cache,
+    so the GUI finds them ready; with --out, also write one PNG per element there.
+    """
+    import xml.etree.ElementTree as ET
+    from config import THUMBNAIL_CACHE_DIR, THUMBNAIL_MEMORY_ITEMS
+    from core.compressed_io import open_library
+    from core.preview import ThumbnailCache
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    cache = ThumbnailCache(None if args.no_cache else THUMBNAIL_CACHE_DIR, THUMBNAIL_MEMORY_ITEMS)
+    kinds = ("package", "symbol") if args.symbols else ("package",)
+    wanted = set(args.name or ())
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    count = 0
+    with open_library(args.library) as source:
+        for _, elem in ET.iterparse(source, events=("end",)):
+            if elem.tag not in kinds or not elem.get("name"):
+                continue
+            name = elem.get("name")
+            if not wanted or name in wanted:
+                _, data = cache.thumbnail(elem, width, height)
+                count += 1
+                if args.out:
+                    safe = "".join(c if c.isalnum() or c in "-_.+" else "_" for c in name)
+                    with open(os.path.join(args.out, f"{elem.tag}-{safe}.png"), "wb") as f:
+                        f.write(data)
+            elem.clear()
+    print(f"{count} thumbnail(s), {cache.rendered} rendered, {count - cache.rendered} from cache.")
+    return 0
+
+
+def _cmd_normalize(args):
+    """
+    Rewrite libraries in canonical form (core/canonical_xml.py), streaming: each file is
+    written to a temporary file next to it and swapped in under the library's lock only if
+    it changed. .lbr.gz/.lbr.zst files are rewritten compressed. With --check nothing is
+    written; exit 1 if any file isn't canonical yet.
+    """
+    import filecmp
+    from config import SORT_DEVICESETS, XML_INDENT
+    from core.canonical_xml import CanonicalWriter
+    from core.compressed_io import compression_of, open_library, open_library_text
+    from core.library_session import LibraryLock
+
+    indent = XML_INDENT if args.indent is None else " " * args.indent
+    writer = CanonicalWriter(indent, args.sort_devicesets or SORT_DEVICESETS)
+    changed = 0
+    for path in args.library:
+        tmp = path + ".normalize.tmp"
+        with LibraryLock(path):
+            try:
+                # Compressed libraries stay compressed (in the same format)
+                with open_library(path) as source, open_library_text(tmp, compression_of(path) or "") as out:
+                    writer.normalize(source, out)
+                if filecmp.cmp(path, tmp, shallow=False):
+                    continue
+                changed += 1
+                if args.check:
+                    print(f"not canonical: {path}")
+                else:
+                    os.replace(tmp, path)
+                    print(f"normalized: {path}")
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+    print(f"{changed} of {len(args.library)} file(s) {'not canonical' if args.check else 'rewritten'}.")
+    return 1 if args.check and changed else 0
+
+
+def _cmd_memory(args):
+    """
+    Report the memory a library costs per load mode (tree, indexed, catalog), by section,
+    with element counts and bytes per element; optionally save it as JSON and compare
+    with an earlier run.
+    """
+    import json
+    from core.memory_report import MemoryReport
+
+    rows = MemoryReport.profile(args.library, modes=args.mode or MemoryReport.MODES)
+    print(MemoryReport.format_table(rows))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = MemoryReport.compare(rows, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"regression: {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+def _cmd_scan_schematics(args):
+    """
+    Check the parts of schematics against the libraries: LCSC_PART missing in the
+    library, stale in the schematic, or parts the libraries no longer have. The JSON
+    report opens in the GUI (“Schematic Report…”) to fill the gaps.
+    """
+    from core.parts_index import PartsIndex
+    from core.schematic_scan import SchematicScanner, STATUSES
+
+    libraries = []
+    for path in args.library:
+        libraries.extend(PartsIndex.find_libraries(path) if os.path.isdir(path) else [path])
+    scanner = SchematicScanner.for_paths(libraries)
+    report = scanner.scan(args.schematic, workers=args.workers, keep_ok=args.all)
+    for row in report["issues"]:
+        print(f"{row['status']}\t{os.path.basename(row['schematic'])}\t{row['part']}\t{row['library']}\t"
+              f"{row['deviceset']}\t{row['device']}\t{row['technology']}\t{row['sch_lcsc']}\t{row['lib_lcsc']}")
+    for path, error in report["failed"]:
+        print(f"failed: {path}: {error}", file=sys.stderr)
+    print(", ".join(f"{report['counts'][status]} {status}" for status in STATUSES), file=sys.stderr)
+    if args.json:
+        SchematicScanner.save_report(report, args.json)
+    return 1 if any(row["status"] != "ok" for row in report["issues"]) or report["failed"] else 0
+
+
+def _cmd_serve(args):
+    """
+    Keep libraries parsed in memory and answer JSON‐RPC requests on localhost (server.py).
+    """
+    from config import SERVER_TOKEN_FILE
+    from server import make_server, write_token
+
+    server = make_server(args.host, args.port)
+    for path in args.preload or []:
+        server.service.rpc_list_packages(path)    # parse + index now rather than on first request
+    write_token(server.token)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port}/ (Ctrl+C to stop)")
+    print(f"Token in {SERVER_TOKEN_FILE} (send it as X-Library-Token)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _cmd_gui_bench(args):
+    """
+    Time the main GUI operations on generated libraries (gui/perf_harness.py); needs a
+    display or Xvfb.
+    """
+    from gui.perf_harness import main as run_harness
+
+    sizes = []
+    for spec in args.sizes.split(","):
+        n_packages, _, n_devicesets = spec.partition("x")
+        sizes.append((int(n_packages), int(n_devicesets or n_packages)))
+    return run_harness(sizes, json_path=args.json, baseline_path=args.compare,
+                       tolerance=args.tolerance, track_memory=args.memory)
+
+
+def _import_time(module, runs=3):
+    """
+    Measure “import module” in a fresh interpreter with -X importtime (best of 'runs').
+    Returns (total_us, [(self_us, name), …]) for the modules it pulled in.
+    """
+    import subprocess
+
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        )
+        rows = []
+        total = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative, name = line[len("import time:"):].split("|")
+            top_level = not name[1:].startswith(" ")
+            if top_level and name.strip() == "site":
+                rows = []    # interpreter startup, not ours
+                continue
+            rows.append((int(self_us), name.strip()))
+            if top_level and name.strip() == module:
+                total = int(cumulative)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    return best
+
+
+def _cmd_startup(args):
+    """
+    Check the import‐time budget (config.STARTUP_BUDGET_MS) of the CLI and of core/.
+    """
+    over = False
+    for module in ("cli", "core.xml_handler"):
+        total, rows = _import_time(module)
+        ms = total / 1000
+        over |= ms > args.budget
+        print(f"{module}: {ms:.1f} ms ({'over' if ms > args.budget else 'within'} {args.budget} ms budget)")
+        for self_us, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:6.1f} ms  {name}")
+    return 1 if over else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="eagle_editor.py",
+        description="Eagle Library Device Adder. Run without arguments to start the GUI.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("duplicates", help="find geometry‐identical packages and symbols")
+    p.add_argument("library", help="Eagle library (.lbr/.xml)")
+    p.add_argument("--rewrite", action="store_true",
+                   help="redirect device/gate references to one canonical duplicate and save")
+    p.add_argument("--workers", type=int, default=None,
+                   help="processes for the report (default: CPU count; 1 = in‐process)")
+    p.set_defaults(func=_cmd_duplicates)
+
+    p = sub.add_parser("unused", help="list packages and symbols no deviceset refers to (optionally remove them)")
+    p.add_argument("library", help="Eagle library (.lbr/.xml)")
+    p.add_argument("--kind", choices=KIND_UNUSED_CHOICES, help="only packages or only symbols (default: both)")
+    p.add_argument("--prune", action="store_true", help="remove them from the library and save it")
+    p.add_argument("--workers", type=int, default=None,
+                   help="processes for the report (default: CPU count; 1 = in‐process)")
+    p.set_defaults(func=_cmd_unused)
+
+    p = sub.add_parser("rename", help="rename packages/symbols/devicesets and update every reference to them")
+    p.add_argument("library", help="Eagle library (.lbr/.xml), modified in place")
+    p.add_argument("-r", "--rename", nargs=3, action="append", metavar=("KIND", "OLD", "NEW"),
+                   help=f"one rename; KIND is {', '.join(RENAME_KIND_CHOICES)} (repeatable)")
+    p.add_argument("--map", action="append", metavar="FILE",
+                   help="CSV of kind,old,new rows, applied in order (repeatable)")
+    p.add_argument("--undo-file", metavar="FILE", help="write the reverse renames here (use it with --map to undo)")
+    p.set_defaults(func=_cmd_rename)
+
+    p = sub.add_parser("import", help="import devicesets with their symbols/packages from another library")
+    p.add_argument("library", help="destination Eagle library (modified in place)")
+    p.add_argument("source", help="library to import from")
+    p.add_argument("-d", "--deviceset", action="append",
+                   help="deviceset to import (repeatable; default: all)")
+    p.add_argument("--on-conflict", choices=POLICY_CHOICES, default="skip",
+                   help="what to do when a name exists with different content (default: skip)")
+    p.set_defaults(func=_cmd_import)
+
+    p = sub.add_parser("index", help="index every library under a directory for searching")
+    p.add_argument("directory", help="directory tree containing .lbr files")
+    p.add_argument("--db", help="index file (default: config.PARTS_INDEX_PATH)")
+    p.add_argument("--workers", type=int, help="parallel worker processes (default: CPU count)")
+    p.set_defaults(func=_cmd_index)
+
+    p = sub.add_parser("search", help="search the parts index (LCSC#, package, value, description, …)")
+    p.add_argument("query", nargs="+", help="search terms; all must match")
+    p.add_argument("--db", help="index file (default: config.PARTS_INDEX_PATH)")
+    p.add_argument("--limit", type=int, default=200, help="maximum number of results (default: 200)")
+    p.set_defaults(func=_cmd_search)
+
+    p = sub.add_parser("series", help="bulk‐create devicesets for a standard value series (E6…E192)")
+    p.add_argument("library", help="Eagle library (.lbr/.xml), modified in place")
+    p.add_argument("--series", choices=SERIES_CHOICES, default="E24")
+    p.add_argument("--kind", choices=KIND_CHOICES, default="resistor")
+    p.add_argument("--from", dest="start", required=True, help="lowest value, e.g. 10, 4K7, 100p")
+    p.add_argument("--to", dest="stop", required=True, help="highest value, e.g. 1M, 10u")
+    p.add_argument("-p", "--package", action="append", required=True, help="package (repeatable)")
+    p.add_argument("--name", default="{value}", help="deviceset name template (default: {value})")
+    p.add_argument("--value", default="{value}", help="VALUE attribute template (default: {value})")
+    p.add_argument("--description", default="", help="DESCRIPTION template, e.g. 'RES {si}Ω 1%% {package}'")
+    p.add_argument("--lcsc", default="", help="LCSC_PART template")
+    p.add_argument("--prefix", help="deviceset prefix (default: R or C)")
+    p.add_argument("--symbol", help="symbol for the gates (default: the template's)")
+    p.add_argument("--template", help="template deviceset for new devicesets (default: DEVICE_NAME)")
+    p.add_argument("--technologies", action="store_true",
+                   help="one deviceset (--name, e.g. 'R_{series}') with one technology per value")
+    p.set_defaults(func=_cmd_series)
+
+    p = sub.add_parser("templates", help="list the template devicesets (DEVICE_NAME, TEMPLATE_…)")
+    p.add_argument("library", help="Eagle library (.lbr/.xml)")
+    p.set_defaults(func=_cmd_templates)
+
+    p = sub.add_parser("preview", help="render package/symbol thumbnails (fills the GUI's thumbnail cache)")
+    p.add_argument("library", help="Eagle library (.lbr/.xml)")
+    p.add_argument("-n", "--name", action="append", help="package/symbol to render (repeatable; default: all)")
+    p.add_argument("--symbols", action="store_true", help="render symbols too")
+    p.add_argument("--size", default="{}x{}".format(*THUMBNAIL_SIZE),
+                   help="WIDTHxHEIGHT in pixels (default: config.THUMBNAIL_SIZE, as in the GUI)")
+    p.add_argument("--out", help="also write the PNGs to this directory")
+    p.add_argument("--no-cache", action="store_true", help="don't read or write config.THUMBNAIL_CACHE_DIR")
+    p.set_defaults(func=_cmd_preview)
+
+    p = sub.add_parser("normalize", help="rewrite libraries in canonical form for small version‐control diffs")
+    p.add_argument("library", nargs="+", help="Eagle libraries (.lbr/.xml), rewritten in place")
+    p.add_argument("--indent", type=int, default=None,
+                   help="spaces per nesting level (default: config.XML_INDENT, Eagle's own layout)")
+    p.add_argument("--sort-devicesets", action="store_true",
+                   help="write devicesets in natural name order (default: config.SORT_DEVICESETS)")
+    p.add_argument("--check", action="store_true",
+                   help="only report files that aren't canonical (exit 1 if any), e.g. in a pre‐commit hook")
+    p.set_defaults(func=_cmd_normalize)
+
+    p = sub.add_parser("memory", help="report memory use of a library by section and load mode (tracemalloc)")
+    p.add_argument("library", help="Eagle library (.lbr/.xml)")
+    p.add_argument("--mode", action="append", choices=MEMORY_MODE_CHOICES,
+                   help="load mode to profile (repeatable; default: all)")
+    p.add_argument("--json", metavar="OUT", help="save the rows as JSON")
+    p.add_argument("--compare", metavar="BASELINE", help="JSON of an earlier run; exit 1 on regressions")
+    p.add_argument("--tolerance", type=float, default=0.2,
+                   help="allowed growth per section vs. the baseline (default: 0.2 = 20%%)")
+    p.set_defaults(func=_cmd_memory)
+
+    p = sub.add_parser("scan-schematics", help="check schematics' parts for missing or stale LCSC_PART")
+    p.add_argument("schematic", nargs="+", help="Eagle schematics (.sch) or directories containing them")
+    p.add_argument("-l", "--library", action="append", required=True,
+                   help="library (.lbr) or directory of libraries to check against (repeatable)")
+    p.add_argument("--json", metavar="OUT", help="save the report as JSON (opens in the GUI's “Schematic Report…”)")
+    p.add_argument("--all", action="store_true", help="list parts that are fine too")
+    p.add_argument("--workers", type=int, help="parallel worker processes (default: CPU count)")
+    p.set_defaults(func=_cmd_scan_schematics)
+
+    p = sub.add_parser("serve", help="keep libraries in memory and serve JSON‐RPC requests on localhost")
+    p.add_argument("--host", default=SERVER_HOST, help=f"address to bind (default: {SERVER_HOST})")
+    p.add_argument("--port", type=int, default=SERVER_PORT, help=f"port (default: {SERVER_PORT})")
+    p.add_argument("--preload", action="append", metavar="LIB",
+                   help="library to load at startup (repeatable)")
+    p.set_defaults(func=_cmd_serve)
+
+    p = sub.add_parser("gui-bench", help="time GUI operations on generated libraries (uses Xvfb if needed)")
+    p.add_argument("--sizes", default="50x20,200x100,1000x400",
+                   help="comma‐separated PACKAGESxDEVICESETS (default: 50x20,200x100,1000x400)")
+    p.add_argument("--json", metavar="OUT", help="save the results as JSON")
+    p.add_argument("--compare", metavar="BASELINE", help="JSON of an earlier run; exit 1 on regressions")
+    p.add_argument("--tolerance", type=float, default=0.5,
+                   help="allowed slowdown vs. the baseline (default: 0.5 = 50%%)")
+    p.add_argument("--memory", action="store_true", help="also trace Python allocations (slower)")
+    p.set_defaults(func=_cmd_gui_bench)
+
+    p = sub.add_parser("startup", help="measure import time against the startup budget")
+    p.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS,
+                   help=f"milliseconds (default: {STARTUP_BUDGET_MS}, config.STARTUP_BUDGET_MS)")
+    p.add_argument("--top", type=int, default=5, help="list the N slowest modules (default: 5)")
+    p.set_defaults(func=_cmd_startup)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
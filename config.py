@@ -1,3 +1,5 @@
+import os
+
 # Window size and resizability
 WINDOW_WIDTH = 1300
 WINDOW_HEIGHT = 650
@@ -16,4 +18,66 @@ LEFT_PANEL_HEIGHT = 400
 
 # Right-side (“Package Selection”) panel size
 RIGHT_PANEL_WIDTH  = 430
-RIGHT_PANEL_HEIGHT = 400
\ No newline at end of file
+RIGHT_PANEL_HEIGHT = 400
+
+# Pin → pad rules used when a new <device> has to get generated <connects>
+# (no existing device in the library uses its package). A rule applies when its
+# pin names are exactly the symbol's pins (case‐insensitive) and all its pads exist.
+CONNECT_RULES = [
+    {"A": "1", "C": "2"},            # diode: anode/cathode
+    {"A": "1", "K": "2"},
+    {"+": "1", "-": "2"},            # polarized cap
+    {"B": "1", "E": "2", "C": "3"},  # SOT‐23 BJT
+    {"G": "1", "S": "2", "D": "3"},  # SOT‐23 MOSFET
+]
+
+
+# Where the cross‐library parts index (see core/parts_index.py) is stored
+PARTS_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".eagle_parts_index.sqlite")
+
+# Import‐time budget (ms) for the CLI and for scripts using core/, checked by
+# “eagle_editor.py startup”. The GUI toolkit is excluded; it is only imported for the GUI.
+STARTUP_BUDGET_MS = 50
+
+# Advisory lock (“<library>.lock”) taken while saving; see core/library_session.py.
+# Saves wait up to LOCK_TIMEOUT_SECONDS for another user's lock. A lock older than
+# LOCK_STALE_SECONDS (or whose process is gone, same host only) is treated as left over
+# from a crash and broken.
+LOCK_TIMEOUT_SECONDS = 15
+LOCK_STALE_SECONDS = 120
+
+# Where “eagle_editor.py serve” listens (JSON‐RPC over HTTP, see server.py). Keep it on
+# localhost: the server can modify any library file the user can write.
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+# Every request must carry the running server's token (a new one per start, written here
+# readable only by the user) in an X-Library-Token header; LibraryClient reads it from here.
+SERVER_TOKEN_FILE = os.path.join(os.path.expanduser("~"), ".eagle_server_token")
+# Largest request body the server reads (bytes); bigger ones are refused with 413.
+SERVER_MAX_BODY = 16 * 1024 * 1024
+
+# Package/symbol preview thumbnails (see core/preview.py): size in pixels, how many PNGs
+# stay in memory, and where they are cached on disk (keyed by content hash, so they
+# survive across sessions and are shared by identical footprints). None = memory only.
+THUMBNAIL_SIZE = (48, 32)
+THUMBNAIL_MEMORY_ITEMS = 512
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".eagle_thumbnails")
+
+# Template devicesets (see core/templates.py): new devicesets copy their gates, and new
+# devices prefer their devices' <connects>. DEFAULT_TEMPLATE is used unless another one is
+# chosen; every deviceset named TEMPLATE_PREFIX + something (TEMPLATE_LED, TEMPLATE_SOT23,
+# …) is a template too. Without any, the library's first deviceset serves as template.
+DEFAULT_TEMPLATE = "DEVICE_NAME"
+TEMPLATE_PREFIX = "TEMPLATE_"
+
+# Saved libraries are written in one canonical form (see core/canonical_xml.py), so an
+# edit shows up as a small git diff: fixed attribute order, one element per line,
+# XML_INDENT per nesting level ("" = Eagle's own layout). With SORT_DEVICESETS the
+# <deviceset>s are kept in natural name order and new ones are inserted in place.
+XML_INDENT = ""
+SORT_DEVICESETS = False
+
+# Libraries named *.lbr.gz / *.lbr.zst are read and written compressed, as a stream (see
+# core/compressed_io.py; zstd needs the 'zstandard' package or Python 3.14+).
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
@@ -0,0 +1,55 @@
+# core/__init__.py
+"""
+GUI‐free library model: XML I/O and editing (XMLHandler), per‐tree indexes, content
+hashing, connect synthesis, importing, value series, the sectioned catalog loader, the
+cross‐library parts index, locked, journaled save sessions with transactional edits,
+preview thumbnails, the canonical library writer, compressed (.gz/.zst) library I/O,
+memory reports, the schematic LCSC check and rename mapping files.
+Nothing here imports tkinter/customtkinter, so scripts and the CLI can use it directly:
+
+    from core import XMLHandler
+    tree = XMLHandler.parse_library("library.lbr")
+
+Names are resolved lazily (PEP 562): “import core” is free, and each submodule is
+imported the first time one of its names is used.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "XMLHandler":         "core.xml_handler",
+    "LibraryIndex":       "core.library_index",
+    "natural_key":        "core.library_index",
+    "ContentHasher":      "core.content_hash",
+    "ConnectSynthesizer": "core.connect_synth",
+    "LibraryCatalog":     "core.library_catalog",
+    "LibraryImporter":    "core.library_import",
+    "PartsIndex":         "core.parts_index",
+    "ValueSeries":        "core.value_series",
+    "LibrarySession":     "core.library_session",
+    "LibraryLock":        "core.library_session",
+    "PreviewRenderer":    "core.preview",
+    "ThumbnailCache":     "core.preview",
+    "DeviceTemplate":     "core.templates",
+    "CanonicalWriter":    "core.canonical_xml",
+    "TreeTransaction":    "core.transaction",
+    "MemoryReport":       "core.memory_report",
+    "SchematicScanner":   "core.schematic_scan",
+    "open_library":       "core.compressed_io",
+    "read_rename_map":    "core.rename_map",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'core' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
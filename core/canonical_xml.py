@@ -0,0 +1,244 @@
+# core/canonical_xml.py
+
+import os
+import shutil
+import xml.etree.ElementTree as ET
+
+from core.compressed_io import compression_of, open_library_text
+from core.library_index import LibraryIndex
+
+# Attribute order per tag, as in Eagle's DTD (and so as Eagle itself writes them).
+# Attributes not listed here follow the listed ones in alphabetical order.
+ATTRIBUTE_ORDER = {
+    "eagle":      ("version",),
+    "setting":    ("alwaysvectorfont", "verticaltext", "keepoldvectorfont"),
+    "grid":       ("distance", "unitdist", "unit", "style", "multiple", "display",
+                   "altdistance", "altunitdist", "altunit"),
+    "layer":      ("number", "name", "color", "fill", "visible", "active"),
+    "library":    ("name", "urn"),
+    "package":    ("name", "urn", "locally_modified", "library_version", "library_locally_modified"),
+    "symbol":     ("name", "urn", "locally_modified", "library_version", "library_locally_modified"),
+    "deviceset":  ("name", "urn", "locally_modified", "prefix", "uservalue", "library_version",
+                   "library_locally_modified"),
+    "device":     ("name", "package"),
+    "gate":       ("name", "symbol", "x", "y", "addlevel", "swaplevel"),
+    "connect":    ("gate", "pin", "pad", "route"),
+    "technology": ("name",),
+    "attribute":  ("name", "value", "x", "y", "size", "layer", "font", "ratio", "rot",
+                   "display", "constant", "align"),
+    "wire":       ("x1", "y1", "x2", "y2", "width", "layer", "extent", "style", "curve", "cap"),
+    "smd":        ("name", "x", "y", "dx", "dy", "layer", "roundness", "rot", "stop", "thermals", "cream"),
+    "pad":        ("name", "x", "y", "drill", "diameter", "shape", "rot", "stop", "thermals", "first"),
+    "pin":        ("name", "x", "y", "visible", "length", "direction", "function", "swaplevel", "rot"),
+    "text":       ("x", "y", "size", "layer", "font", "ratio", "rot", "align", "distance"),
+    "circle":     ("x", "y", "radius", "width", "layer"),
+    "rectangle":  ("x1", "y1", "x2", "y2", "layer", "rot"),
+    "polygon":    ("width", "layer", "spacing", "pour", "isolate", "orphans", "thermals", "rank"),
+    "vertex":     ("x", "y", "curve"),
+    "hole":       ("x", "y", "drill"),
+    "part":       ("name", "library", "library_urn", "deviceset", "device", "package3d_urn",
+                   "technology", "value"),
+    "instance":   ("part", "gate", "x", "y", "smashed", "rot"),
+}
+
+_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+_DOCTYPE = '<!DOCTYPE eagle SYSTEM "eagle.dtd">\n'
+
+
+def _escape_text(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _escape_attribute(value):
+    value = _escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\n" in value or "\r" in value or "\t" in value:
+        value = value.replace("\n", "&#10;").replace("\r", "&#13;").replace("\t", "&#09;")
+    return value
+
+
+class CanonicalWriter:
+    """
+    Writes an Eagle library in one canonical form, so that a change to one element changes
+    only that element's lines in the file (one hunk in a git diff), whatever wrote the
+    file before:
+
+      • XML declaration and <!DOCTYPE eagle …> as Eagle writes them
+      • one element per line, indented by 'indent' per level ("" = Eagle's own layout)
+      • attributes in ATTRIBUTE_ORDER (Eagle's DTD order), unknown ones alphabetically after
+      • whitespace between elements is dropped and regenerated; text with content
+        (<description>, <text>) is kept verbatim
+      • with sort_devicesets=True, <deviceset>s are written in natural name order
+        (XMLHandler inserts new ones at their sorted place when config.SORT_DEVICESETS is set)
+
+    write_tree() writes a parsed tree; normalize() rewrites a file with iterparse,
+    holding only the open elements (and, when sorting, the devicesets) in memory.
+    Both produce the same bytes.
+    """
+
+    def __init__(self, indent="", sort_devicesets=False):
+        self.indent = indent
+        self.sort_devicesets = sort_devicesets
+        self._order_cache = {}   # { (tag, attribute names) : names in canonical order }
+
+    # ─── Pieces ───
+
+    def _start_tag(self, elem):
+        """
+        "<tag a=\"…\" b=\"…\"" (unterminated) with the attributes in canonical order.
+        """
+        attrib = elem.attrib
+        if not attrib:
+            return "<" + elem.tag
+        names = tuple(attrib)
+        order = self._order_cache.get((elem.tag, names))
+        if order is None:
+            known = ATTRIBUTE_ORDER.get(elem.tag, ())
+            order = [n for n in known if n in attrib] + sorted(n for n in names if n not in known)
+            self._order_cache[(elem.tag, names)] = order
+        return "<" + elem.tag + "".join(
+            [f' {name}="{_escape_attribute(attrib[name])}"' for name in order]
+        )
+
+    @staticmethod
+    def _content(text):
+        """
+        Escaped text, or "" for None / whitespace only.
+        """
+        if not text or text.isspace():
+            return ""
+        return _escape_text(text)
+
+    @staticmethod
+    def _deviceset_key(ds):
+        return LibraryIndex.sort_key(ds.get("name", ""))
+
+    def _children(self, elem):
+        if self.sort_devicesets and elem.tag == "devicesets":
+            return sorted(elem, key=self._deviceset_key)
+        return elem
+
+    def _header(self, root_tag):
+        return _DECLARATION + (_DOCTYPE if root_tag == "eagle" else "")
+
+    # ─── Parsed trees ───
+
+    def _write_element(self, write, elem, depth):
+        pad = self.indent * depth
+        start = self._start_tag(elem)
+        text = self._content(elem.text)
+        if len(elem) == 0:
+            write(f"{pad}{start}>{text}</{elem.tag}>\n" if text else f"{pad}{start}/>\n")
+        else:
+            write(f"{pad}{start}>{text}\n")
+            for child in self._children(elem):
+                self._write_element(write, child, depth + 1)
+            write(f"{pad}</{elem.tag}>\n")
+        tail = self._content(elem.tail)
+        if tail:
+            write(f"{pad}{tail}\n")
+
+    def tostring(self, tree):
+        """
+        The canonical text of a whole ElementTree (or root Element).
+        """
+        root = tree.getroot() if hasattr(tree, "getroot") else tree
+        parts = [self._header(root.tag)]
+        self._write_element(parts.append, root, 0)
+        return "".join(parts)
+
+    def write_tree(self, tree, path, compression=None):
+        """
+        Write the canonical text to 'path' (gzip/zstd compressed for .gz/.zst, or as
+        'compression' says; see core/compressed_io.py), element by element rather than as
+        one string. The text goes to “<path>.tmp” first, which then replaces 'path' (same
+        permissions), so a failure part‐way leaves the previous file intact and readers
+        never see a truncated one.
+        """
+        root = tree.getroot() if hasattr(tree, "getroot") else tree
+        if compression is None:
+            compression = compression_of(path) or ""
+        tmp = path + ".tmp"
+        try:
+            with open_library_text(tmp, compression) as f:
+                f.write(self._header(root.tag))
+                self._write_element(f.write, root, 0)
+            if os.path.exists(path):
+                shutil.copymode(path, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # ─── Streaming ───
+
+    def normalize(self, source, out):
+        """
+        Read the library 'source' (path or binary file; see compressed_io.open_library for
+        compressed ones) with iterparse and write its canonical text to the text file 'out'.
+        Elements are written and dropped as soon as they end; with sort_devicesets, the
+        <deviceset>s are held until </devicesets>.
+        Returns the number of elements written.
+        """
+        write = out.write
+        stack = []        # [[elem, opened]] of the elements started but not ended
+        pending_tail = None   # (elem, depth) whose tail is known once the next event comes
+        held = 0          # > 0 while inside a deviceset held for sorting
+        count = 0
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if pending_tail is not None:
+                tail = self._content(pending_tail[0].tail)
+                if tail:
+                    write(f"{self.indent * pending_tail[1]}{tail}\n")
+                pending_tail = None
+
+            if event == "start":
+                if held:
+                    held += 1
+                    continue
+                if not stack:
+                    write(self._header(elem.tag))
+                elif not stack[-1][1]:
+                    # First child: the parent's start tag (and its text) can be written now
+                    parent = stack[-1][0]
+                    write(f"{self.indent * (len(stack) - 1)}{self._start_tag(parent)}>"
+                          f"{self._content(parent.text)}\n")
+                    stack[-1][1] = True
+                if (self.sort_devicesets and elem.tag == "deviceset" and stack
+                        and stack[-1][0].tag == "devicesets"):
+                    held = 1
+                    continue
+                stack.append([elem, False])
+                continue
+
+            # "end"
+            if held:
+                held -= 1
+                continue
+            elem, opened = stack.pop()
+            depth = len(stack)
+            if opened:
+                if self.sort_devicesets and elem.tag == "devicesets":
+                    for ds in self._children(elem):
+                        self._write_element(write, ds, depth + 1)
+                        count += sum(1 for _ in ds.iter())
+                write(f"{self.indent * depth}</{elem.tag}>\n")
+            else:
+                text = self._content(elem.text)
+                start = self._start_tag(elem)
+                write(f"{self.indent * depth}{start}>{text}</{elem.tag}>\n" if text
+                      else f"{self.indent * depth}{start}/>\n")
+            count += 1
+            if stack:
+                # Written: drop it from its parent. iterparse runs ahead of the events, so
+                # later siblings may already be there, but every earlier one is gone.
+                stack[-1][0].remove(elem)
+                pending_tail = (elem, depth)
+        return count
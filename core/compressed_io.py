@@ -0,0 +1,100 @@
+# core/compressed_io.py
+
+import gzip
+import io
+import os
+
+from config import GZIP_LEVEL, ZSTD_LEVEL
+
+# Compressed libraries are recognised by their last suffix: library.lbr.gz, library.lbr.zst
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+LIBRARY_SUFFIXES = (".lbr", ".xml")
+
+
+def compression_of(path):
+    """
+    "gzip", "zstd" or None (plain XML), from the file name.
+    """
+    return COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def library_name(path):
+    """
+    The library's name as Eagle uses it (file name without .lbr and compression suffix):
+    “/libs/passives.lbr.gz” → “passives”.
+    """
+    name = os.path.basename(path)
+    if compression_of(name):
+        name = os.path.splitext(name)[0]
+    root, ext = os.path.splitext(name)
+    return root if ext.lower() in LIBRARY_SUFFIXES else name
+
+
+class _OwnedGzipFile(gzip.GzipFile):
+    """
+    A GzipFile on a file object that it closes with itself.
+    """
+
+    def __init__(self, raw, mode, **kwargs):
+        super().__init__(filename="", mode=mode, fileobj=raw, **kwargs)
+        self._raw = raw
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def _zstd_module():
+    """
+    compression.zstd (Python 3.14+) or the zstandard package, whichever is available.
+    """
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        raise RuntimeError("Reading or writing .zst libraries needs the 'zstandard' package "
+                           "(pip install zstandard) or Python 3.14+.")
+
+
+def open_library(path, mode="rb", compression=None):
+    """
+    Open a library file for streaming in binary mode ("rb" or "wb"), decompressing or
+    compressing on the fly by its suffix (or 'compression': "gzip", "zstd", or "" for
+    plain). Neither direction holds the whole file in memory.
+
+    Written gzip files carry no name or time stamp, so the same library always gives
+    the same bytes (as plain files do, see core/canonical_xml.py).
+    """
+    if mode not in ("rb", "wb"):
+        raise ValueError(f"open_library: mode must be 'rb' or 'wb', not {mode!r}")
+    compression = compression_of(path) if compression is None else compression
+    if not compression:
+        return open(path, mode)
+    if compression == "gzip":
+        raw = open(path, mode)
+        if mode == "rb":
+            return _OwnedGzipFile(raw, mode)
+        return _OwnedGzipFile(raw, mode, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == "zstd":
+        zstd = _zstd_module()
+        if hasattr(zstd, "ZstdFile"):
+            return zstd.open(path, mode, level=ZSTD_LEVEL if mode == "wb" else None)
+        raw = open(path, mode)
+        if mode == "rb":
+            return zstd.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return zstd.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=True)
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def open_library_text(path, compression=None):
+    """
+    A UTF‐8 text file for writing a library (see open_library), with "\\n" line ends.
+    """
+    return io.TextIOWrapper(open_library(path, "wb", compression), encoding="utf-8", newline="\n")
@@ -0,0 +1,95 @@
+# core/connect_synth.py
+
+from config import CONNECT_RULES
+from core.library_index import LibraryIndex, natural_key
+
+
+class ConnectSynthesizer:
+    """
+    Generates a <connects> plan for a <device> when no existing device in the library
+    can be cloned for its package. The gates' symbol pins are matched against the
+    package's pads, trying in order:
+
+      1) exact name      – every pin has a pad with the same name (case‐insensitive)
+      2) rule table      – a CONNECT_RULES entry whose pins are exactly the symbol's pins
+      3) numeric order   – same number of pins and pads: pins in document order are paired
+                           with pads in natural (numeric‐aware) order. Nothing about the
+                           names backs this up, so it can mis‐wire an IC: callers must show
+                           the resulting pairs for checking (see GUESSED)
+
+    Pins and pads come from the tree's LibraryIndex, and plans are memoized per
+    (gates, package) on that index, so bulk jobs creating thousands of devices only
+    match each distinct combination once.
+    """
+
+    # Strategies whose result is a guess, to be shown to the user rather than used silently
+    GUESSED = ("numeric order",)
+
+    @staticmethod
+    def plan(tree, gate_symbols, pkg_name, rules=None):
+        """
+        Return (strategy, [(gate, pin, pad), ...]) for the given { gate_name : symbol_name }
+        and package name, or None if no strategy covers every pin.
+        'rules' defaults to config.CONNECT_RULES.
+        """
+        index = LibraryIndex.for_tree(tree)
+        if rules is None:
+            rules = CONNECT_RULES
+            cache = index.derived.setdefault("connect_plans", {})
+            key = (tuple(gate_symbols.items()), pkg_name)
+            if key in cache:
+                return cache[key]
+        else:
+            cache = None
+
+        result = ConnectSynthesizer._match(index, gate_symbols, pkg_name, rules)
+        if cache is not None:
+            cache[key] = result
+        return result
+
+    @staticmethod
+    def _match(index, gate_symbols, pkg_name, rules):
+        pads = index.package_pads(pkg_name)
+        if not pads:
+            return None
+
+        terminals = []
+        for gate_name, symbol_name in gate_symbols.items():
+            pins = index.symbol_pin_order(symbol_name)
+            if pins is None:
+                return None
+            terminals.extend((gate_name, pin) for pin in pins)
+        if not terminals:
+            return None
+
+        # Name‐based strategies need pin names to be unambiguous across gates
+        pin_names = [pin.upper() for _, pin in terminals]
+        if len(set(pin_names)) == len(pin_names):
+            pad_by_name = {}
+            for pad in pads:
+                pad_by_name.setdefault(pad.upper(), pad)
+
+            # 1) Exact name
+            if all(name in pad_by_name for name in pin_names):
+                return "exact name", [
+                    (gate, pin, pad_by_name[pin.upper()]) for gate, pin in terminals
+                ]
+
+            # 2) Rule table
+            for rule in rules:
+                upper_rule = {pin.upper(): pad.upper() for pin, pad in rule.items()}
+                if set(upper_rule) != set(pin_names):
+                    continue
+                if all(pad in pad_by_name for pad in upper_rule.values()):
+                    return "rule table", [
+                        (gate, pin, pad_by_name[upper_rule[pin.upper()]]) for gate, pin in terminals
+                    ]
+
+        # 3) Numeric order
+        if len(terminals) == len(pads):
+            ordered_pads = sorted(pads, key=natural_key)
+            return "numeric order", [
+                (gate, pin, pad) for (gate, pin), pad in zip(terminals, ordered_pads)
+            ]
+
+        return None
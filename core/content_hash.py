@@ -0,0 +1,89 @@
+# core/content_hash.py
+
+import hashlib
+import xml.etree.ElementTree as ET
+
+from core.compressed_io import open_library
+
+
+class ContentHasher:
+    """
+    Canonical content hashes for <package> and <symbol> elements, so that footprints
+    and symbols that are geometrically identical but named differently (R0603, 0603-RES, …)
+    hash the same:
+
+      • the element's own @name and its <description> are ignored
+      • attribute order and whitespace/indentation are ignored
+      • numeric attribute values are compared as numbers ("0.80" == "0.8")
+      • the order of the top‐level primitives (<smd>, <wire>, <pin>, …) is ignored,
+        while order inside them (e.g. <polygon> vertices) is kept
+
+    Hashes can be computed from an already parsed Element (element_hash) or in a single
+    iterparse pass straight from a file without building the whole tree (hash_file).
+    """
+
+    KINDS = ("package", "symbol")
+
+    # Normalized attribute values; coordinates repeat heavily, so this saves most float() calls.
+    _norm_cache = {}
+    _NORM_CACHE_LIMIT = 200_000
+
+    @staticmethod
+    def _norm(value):
+        cache = ContentHasher._norm_cache
+        norm = cache.get(value)
+        if norm is None:
+            try:
+                norm = repr(float(value))
+            except ValueError:
+                norm = value
+            if len(cache) >= ContentHasher._NORM_CACHE_LIMIT:
+                cache.clear()
+            cache[value] = norm
+        return norm
+
+    @staticmethod
+    def _canon(elem):
+        """
+        Canonical string for one element and its subtree (child order preserved).
+        """
+        norm = ContentHasher._norm
+        attrs = "\x1f".join([key + "=" + norm(val) for key, val in sorted(elem.items())])
+        text = (elem.text or "").strip()
+        if len(elem) == 0:
+            return f"<{elem.tag}\x1e{attrs}\x1e{text}>"
+        inner = "".join([ContentHasher._canon(child) for child in elem])
+        return f"<{elem.tag}\x1e{attrs}\x1e{text}{inner}>"
+
+    @staticmethod
+    def element_hash(elem):
+        """
+        Return the hex content hash of a <package> or <symbol> Element.
+        """
+        parts = sorted(
+            ContentHasher._canon(child) for child in elem if child.tag != "description"
+        )
+        digest = hashlib.blake2b(elem.tag.encode("utf-8"), digest_size=16)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_file(path):
+        """
+        Stream an Eagle library with iterparse and return
+          { "package": { name : hash }, "symbol": { name : hash } }
+        Each element is released as soon as it has been hashed, so memory stays flat
+        regardless of library size.
+        """
+        result = {kind: {} for kind in ContentHasher.KINDS}
+        with open_library(path) as f:
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag in result:
+                    name = elem.get("name")
+                    if name:
+                        result[elem.tag][name] = ContentHasher.element_hash(elem)
+                    elem.clear()
+                elif elem.tag == "deviceset":
+                    elem.clear()
+        return result
@@ -0,0 +1,218 @@
+# core/library_catalog.py
+
+import mmap
+import os
+import xml.etree.ElementTree as ET
+
+from core.compressed_io import compression_of, open_library
+from core.content_hash import ContentHasher
+from core.library_index import natural_key
+
+SECTIONS = ("packages", "symbols", "devicesets")
+
+# Sections smaller than this are parsed in‐process; a worker process isn't worth it.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+# Large sections are cut into roughly this many chunks per worker, for load balancing.
+CHUNKS_PER_WORKER = 2
+
+
+def find_sections(path):
+    """
+    Locate the <packages>, <symbols> and <devicesets> sections of an Eagle library without
+    parsing it: mmap the file and scan for the section tags.
+    Returns { section : (start, end) } byte ranges of the section contents (between the
+    opening and closing tag); sections that are missing or empty (<packages/>) are left out.
+    """
+    ranges = {}
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for section in SECTIONS:
+            open_tag = f"<{section}>".encode()
+            start = mm.find(open_tag)
+            if start < 0:
+                continue
+            start += len(open_tag)
+            end = mm.find(f"</{section}>".encode(), start)
+            if end > start:
+                ranges[section] = (start, end)
+    return ranges
+
+
+def split_section(path, section, start, end, parts):
+    """
+    Cut the byte range of a section into up to 'parts' chunks, each ending right after a
+    closing </package>, </symbol> or </deviceset> tag, so every chunk is well‐formed.
+    """
+    close_tag = f"</{section[:-1]}>".encode()
+    bounds = [start]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        step = (end - start) // parts
+        for i in range(1, parts):
+            cut = mm.find(close_tag, max(start + i * step, bounds[-1]), end)
+            if cut < 0:
+                break
+            cut += len(close_tag)
+            if cut < end:
+                bounds.append(cut)
+    bounds.append(end)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def parse_chunk(path, section, start, end):
+    """
+    Parse one chunk of a section and return compact, cheaply picklable summaries:
+      packages:   [(name, pads, content_hash), …]
+      symbols:    [(name, pins, content_hash), …]
+      devicesets: [(name, prefix, ((gate, symbol), …),
+                    ((device, package, ((technology, {attribute: value}), …)), …)), …]
+    Runs in worker processes.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    root = ET.fromstring(b"<%s>%s</%s>" % (section.encode(), data, section.encode()))
+    return [summarize(section, elem) for elem in root.iterfind(section[:-1])]
+
+
+def summarize(section, elem):
+    """
+    The parse_chunk summary of one <package>, <symbol> or <deviceset> of 'section'.
+    """
+    if section == "packages":
+        pads = tuple(c.get("name") for c in elem if c.tag in ("smd", "pad") and c.get("name"))
+        return elem.get("name"), pads, ContentHasher.element_hash(elem)
+    if section == "symbols":
+        pins = tuple(p.get("name") for p in elem.iterfind("pin") if p.get("name"))
+        return elem.get("name"), pins, ContentHasher.element_hash(elem)
+    gates = tuple((g.get("name"), g.get("symbol")) for g in elem.iterfind("gates/gate"))
+    devices = tuple(
+        (
+            dev.get("name"),
+            dev.get("package"),
+            tuple(
+                (tech.get("name", ""),
+                 {a.get("name"): a.get("value", "") for a in tech.iterfind("attribute")})
+                for tech in dev.iterfind("technologies/technology")
+            ),
+        )
+        for dev in elem.iterfind("devices/device")
+    )
+    return elem.get("name"), elem.get("prefix", ""), gates, devices
+
+
+def stream_sections(path, sections):
+    """
+    { section : [summary, …] } for a compressed library, in one iterparse pass over the
+    decompressing stream: byte offsets into a compressed file mean nothing, so find_sections
+    and the process pool don't apply. Each element is dropped once summarized.
+    """
+    tags = {section[:-1]: section for section in sections}
+    result = {section: [] for section in sections}
+    with open_library(path) as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            section = tags.get(elem.tag)
+            if section is not None:
+                result[section].append(summarize(section, elem))
+                elem.clear()
+            elif elem.tag in ("package", "symbol", "deviceset"):
+                elem.clear()
+    return result
+
+
+class LibraryCatalog:
+    """
+    Read‐only summary of an Eagle library (names, pads, pins, content hashes, deviceset
+    contents) loaded by parsing its sections independently:
+
+      1) find_sections() locates <packages>, <symbols> and <devicesets> with mmap + a tag scan
+      2) large sections are split into chunks at element boundaries (split_section)
+      3) chunks are parsed in a process pool (parse_chunk), small files in‐process
+      4) the compact results are merged here
+
+    Compressed libraries (.lbr.gz/.lbr.zst) have no usable byte offsets; they are read in
+    one streaming iterparse pass instead (stream_sections), giving the same summaries.
+
+    Workers return plain tuples rather than Element subtrees: pickling Elements back to the
+    parent costs several times more than parsing them, so a parallel load only pays off
+    for summaries. Use XMLHandler.parse_library() when you need the editable tree.
+    """
+
+    def __init__(self):
+        self.packages = {}      # { name : (pads, content_hash) }
+        self.symbols = {}       # { name : (pins, content_hash) }
+        self.devicesets = {}    # { name : (prefix, gates, devices) } as returned by parse_chunk
+
+    @classmethod
+    def load(cls, path, sections=SECTIONS, workers=None):
+        """
+        Build a catalog of the given sections of the library at 'path'.
+        'workers' defaults to the CPU count; 1 forces an in‐process load.
+        Compressed libraries (.lbr.gz/.lbr.zst) are read in one streaming pass instead.
+        """
+        if compression_of(path):
+            catalog = cls()
+            for section, rows in stream_sections(path, sections).items():
+                catalog._merge(section, rows)
+            return catalog
+
+        workers = workers or os.cpu_count() or 1
+        ranges = find_sections(path)
+
+        jobs = []
+        for section in sections:
+            if section not in ranges:
+                continue
+            start, end = ranges[section]
+            parts = 1
+            if workers > 1 and end - start >= PARALLEL_MIN_BYTES:
+                parts = workers * CHUNKS_PER_WORKER
+            jobs.extend((section, a, b) for a, b in split_section(path, section, start, end, parts))
+
+        catalog = cls()
+        if workers > 1 and len(jobs) > 1:
+            # Imported here: concurrent.futures/multiprocessing cost ~25 ms at startup
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(section, pool.submit(parse_chunk, path, section, a, b)) for section, a, b in jobs]
+                for section, future in futures:
+                    catalog._merge(section, future.result())
+        else:
+            for section, a, b in jobs:
+                catalog._merge(section, parse_chunk(path, section, a, b))
+        return catalog
+
+    def _merge(self, section, rows):
+        target = getattr(self, section)
+        for name, *rest in rows:
+            if name:
+                target[name] = tuple(rest)
+
+    def list_packages(self):
+        """
+        Package names in natural order (same order as XMLHandler.list_packages).
+        """
+        return sorted(self.packages, key=lambda s: (natural_key(s), s))
+
+    def list_symbols(self):
+        """
+        Symbol names in natural order (same order as XMLHandler.list_symbols).
+        """
+        return sorted(self.symbols, key=lambda s: (natural_key(s), s))
+
+    def content_hashes(self, kind):
+        """
+        { name : content hash } for kind "package" or "symbol" (see ContentHasher).
+        """
+        return {name: row[1] for name, row in getattr(self, kind + "s").items()}
+
+    def unused(self, kind):
+        """
+        Names of the packages (kind="package") or symbols (kind="symbol") that no device
+        or gate of the loaded devicesets refers to, in natural order (as
+        XMLHandler.find_unused). Needs the "devicesets" section loaded.
+        """
+        if kind == "package":
+            used = {package for _p, _g, devices in self.devicesets.values() for _d, package, _t in devices}
+        else:
+            used = {symbol for _p, gates, _d in self.devicesets.values() for _g, symbol in gates}
+        names = self.list_packages() if kind == "package" else self.list_symbols()
+        return [name for name in names if name not in used]
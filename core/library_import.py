@@ -0,0 +1,278 @@
+# core/library_import.py
+
+import copy
+import xml.etree.ElementTree as ET
+
+from core.library_index import LibraryIndex
+from core.transaction import TreeTransaction
+from core.xml_handler import XMLHandler
+
+
+class LibraryImporter:
+    """
+    Copies devicesets from one parsed Eagle library into another, together with every
+    <symbol> their gates use and every <package> their devices use.
+
+    Packages and symbols are matched by content hash (ContentHasher) against the
+    destination first: if the destination already has an identical one (under any name),
+    the imported devicesets are simply pointed at it. Otherwise the element is copied,
+    and a name collision with different content is resolved by the chosen policy:
+
+      • "skip"     – keep the destination's element (or deviceset) and don't import that one;
+                     a deviceset needing a skipped, different symbol/package is not imported
+                     either (its connects may name pins/pads the destination's lacks)
+      • "rename"   – import it under a free name (NAME_1, NAME_2, …) and update references
+      • "replace"  – overwrite the destination's element (or deviceset) with the imported one
+
+    Both trees' LibraryIndex tables are used for lookups, so an import stays linear in the
+    number of imported elements.
+    """
+
+    POLICIES = ("skip", "rename", "replace")
+
+    @staticmethod
+    def list_devicesets(tree):
+        """
+        Return the names of all <deviceset>s in 'tree', in document order.
+        """
+        return [
+            ds.get("name")
+            for ds in tree.getroot().iterfind("./drawing/library/devicesets/deviceset")
+            if ds.get("name")
+        ]
+
+    @staticmethod
+    def _section(tree, tag):
+        """
+        Return <drawing><library><tag>, creating it if it is missing.
+        """
+        lib_node = tree.getroot().find("./drawing/library")
+        if lib_node is None:
+            raise RuntimeError("Cannot find <library> in the destination tree.")
+        section = lib_node.find(tag)
+        if section is None:
+            TreeTransaction.record(lib_node)
+            section = ET.SubElement(lib_node, tag)
+        return section
+
+    @staticmethod
+    def _free_name(name, taken):
+        n = 1
+        while f"{name}_{n}".lower() in taken:
+            n += 1
+        return f"{name}_{n}"
+
+    @staticmethod
+    def _import_elements(src_tree, dst_tree, kind, names, policy, report):
+        """
+        Make sure every <kind> in 'names' (from src_tree) is available in dst_tree.
+        Returns { source_name : destination_name } for the ones that are.
+        """
+        src_index = LibraryIndex.for_tree(src_tree)
+        dst_index = LibraryIndex.for_tree(dst_tree)
+        src_hashes = src_index.content_hashes(kind)
+        dst_hashes = dst_index.content_hashes(kind)
+
+        dst_section = LibraryImporter._section(dst_tree, kind + "s")
+        dst_elems = {elem.get("name", "").lower(): elem for elem in dst_section.findall(kind)}
+        taken = set(dst_elems)
+        # Identical content already present → reuse it (prefer an element with the same name)
+        dst_by_hash = {}
+        for name, digest in dst_hashes.items():
+            dst_by_hash.setdefault(digest, name)
+
+        src_section = src_tree.getroot().find(f"./drawing/library/{kind}s")
+        src_elems = {} if src_section is None else {
+            elem.get("name"): elem for elem in src_section.findall(kind)
+        }
+
+        mapping = {}
+        for name in names:
+            src_elem = src_elems.get(name)
+            if src_elem is None:
+                report["missing"].append(f"{kind} {name}")
+                continue
+
+            digest = src_hashes.get(name)
+            if dst_hashes.get(name) == digest:
+                mapping[name] = name
+                report["reused"].append(f"{kind} {name}")
+                continue
+            if digest in dst_by_hash:
+                mapping[name] = dst_by_hash[digest]
+                report["reused"].append(f"{kind} {name} → {dst_by_hash[digest]}")
+                continue
+
+            new_elem = copy.deepcopy(src_elem)
+            TreeTransaction.record(dst_section)
+            if name.lower() not in taken:
+                dst_section.append(new_elem)
+                report["added"].append(f"{kind} {name}")
+                target = name
+            elif policy == "skip":
+                # Keep the destination's element of that name; its content differs (the
+                # hashes were compared above), so it is no stand‐in for the imported one
+                report["conflict"].append(f"{kind} {name}: differs from the destination's (use rename or replace)")
+                continue
+            elif policy == "rename":
+                target = LibraryImporter._free_name(name, taken)
+                new_elem.set("name", target)
+                dst_section.append(new_elem)
+                report["renamed"].append(f"{kind} {name} → {target}")
+            else:
+                old_elem = dst_elems[name.lower()]
+                target = old_elem.get("name")
+                new_elem.set("name", target)
+                if dst_by_hash.get(dst_hashes.get(target)) == target:
+                    del dst_by_hash[dst_hashes[target]]
+                position = list(dst_section).index(old_elem)
+                dst_section.remove(old_elem)
+                dst_section.insert(position, new_elem)
+                report["replaced"].append(f"{kind} {name}")
+
+            taken.add(target.lower())
+            dst_elems[target.lower()] = new_elem
+            dst_by_hash.setdefault(digest, target)
+            if kind == "package":
+                dst_index.add_package(new_elem)
+            else:
+                dst_index.add_symbol(new_elem)
+            mapping[name] = target
+        return mapping
+
+    @staticmethod
+    def _differing(src_tree, dst_tree, kind, names):
+        """
+        The names in 'names' that the "skip" policy can't import: dst_tree has an element
+        of that name (ignoring case) with other content, and no identical one to reuse.
+        """
+        src_hashes = LibraryIndex.for_tree(src_tree).content_hashes(kind)
+        dst_hashes = LibraryIndex.for_tree(dst_tree).content_hashes(kind)
+        dst_names = {name.lower() for name in dst_hashes}
+        dst_digests = set(dst_hashes.values())
+        return {
+            name for name in names
+            if name in src_hashes and name.lower() in dst_names and src_hashes[name] not in dst_digests
+        }
+
+    @staticmethod
+    def _dependencies(devicesets):
+        """
+        ({ symbol : None }, { package : None }) used by 'devicesets', in document order.
+        """
+        symbol_names = {}
+        package_names = {}
+        for ds in devicesets:
+            for gate in ds.iterfind("gates/gate"):
+                if gate.get("symbol"):
+                    symbol_names.setdefault(gate.get("symbol"))
+            for dev in ds.iterfind("devices/device"):
+                if dev.get("package"):
+                    package_names.setdefault(dev.get("package"))
+        return symbol_names, package_names
+
+    @staticmethod
+    def import_devicesets(dst_tree, src_tree, ds_names=None, policy="skip"):
+        """
+        Import the named devicesets (default: all) from src_tree into dst_tree, pulling in
+        the symbols and packages they depend on. 'policy' is one of POLICIES and applies to
+        name collisions of devicesets, symbols and packages alike.
+
+        Returns a report dict of lists of human‐readable lines:
+          { "added", "reused", "renamed", "replaced", "skipped", "missing", "conflict" }
+        """
+        if policy not in LibraryImporter.POLICIES:
+            raise RuntimeError(f"Unknown collision policy '{policy}'.")
+
+        src_ds_parent = src_tree.getroot().find("./drawing/library/devicesets")
+        src_devicesets = [] if src_ds_parent is None else src_ds_parent.findall("deviceset")
+        if ds_names is not None:
+            wanted = set(ds_names)
+            src_devicesets = [ds for ds in src_devicesets if ds.get("name") in wanted]
+
+        report = {key: [] for key in ("added", "reused", "renamed", "replaced", "skipped", "missing", "conflict")}
+        dst_ds_parent = LibraryImporter._section(dst_tree, "devicesets")
+        dst_devicesets = {ds.get("name", "").lower(): ds for ds in dst_ds_parent.findall("deviceset")}
+
+        # 1) Which devicesets will be inserted, so that only their dependencies are copied
+        #    (nothing is left unused by a skipped or refused deviceset)
+        if policy == "skip":
+            chosen = []
+            for ds in src_devicesets:
+                if ds.get("name", "").lower() in dst_devicesets:
+                    report["skipped"].append(f"deviceset {ds.get('name')}")
+                else:
+                    chosen.append(ds)
+            symbol_names, package_names = LibraryImporter._dependencies(chosen)
+            differing = {}
+            for kind, names in (("symbol", symbol_names), ("package", package_names)):
+                differing[kind] = LibraryImporter._differing(src_tree, dst_tree, kind, names)
+                for name in names:
+                    if name in differing[kind]:
+                        report["conflict"].append(f"{kind} {name}: differs from the destination's (use rename or replace)")
+            src_devicesets = []
+            for ds in chosen:
+                blocking = [gate.get("symbol") for gate in ds.iterfind("gates/gate")
+                            if gate.get("symbol") in differing["symbol"]]
+                blocking += [dev.get("package") for dev in ds.iterfind("devices/device")
+                             if dev.get("package") in differing["package"]]
+                if blocking:
+                    report["conflict"].append(
+                        f"deviceset {ds.get('name')}: not imported, needs {', '.join(dict.fromkeys(blocking))}"
+                    )
+                else:
+                    src_devicesets.append(ds)
+
+        # 2) Dependencies, collected once across the devicesets to insert (document order)
+        symbol_names, package_names = LibraryImporter._dependencies(src_devicesets)
+        symbol_map = LibraryImporter._import_elements(
+            src_tree, dst_tree, "symbol", symbol_names, policy, report
+        )
+        package_map = LibraryImporter._import_elements(
+            src_tree, dst_tree, "package", package_names, policy, report
+        )
+
+        # 3) The devicesets themselves, with references rewritten to the destination names
+        dst_index = LibraryIndex.for_tree(dst_tree)
+        stale_index = False
+
+        for src_ds in src_devicesets:
+            name = src_ds.get("name")
+            new_ds = copy.deepcopy(src_ds)
+            for gate in new_ds.iterfind("gates/gate"):
+                if gate.get("symbol") in symbol_map:
+                    gate.set("symbol", symbol_map[gate.get("symbol")])
+            for dev in new_ds.iterfind("devices/device"):
+                if dev.get("package") in package_map:
+                    dev.set("package", package_map[dev.get("package")])
+
+            existing = dst_devicesets.get(name.lower())
+            if existing is None:
+                XMLHandler.insert_deviceset(dst_tree, dst_ds_parent, new_ds)
+                report["added"].append(f"deviceset {name}")
+            elif policy == "skip":
+                # Only reached for a name imported twice in this call (e.g. “1K” and “1k”)
+                report["skipped"].append(f"deviceset {name}")
+                continue
+            elif policy == "rename":
+                target = LibraryImporter._free_name(name, set(dst_devicesets))
+                new_ds.set("name", target)
+                XMLHandler.insert_deviceset(dst_tree, dst_ds_parent, new_ds)
+                report["renamed"].append(f"deviceset {name} → {target}")
+            else:
+                TreeTransaction.record(dst_ds_parent)
+                position = list(dst_ds_parent).index(existing)
+                dst_ds_parent.remove(existing)
+                dst_ds_parent.insert(position, new_ds)
+                report["replaced"].append(f"deviceset {name}")
+                # Devices of the removed deviceset are still in the index's tables
+                stale_index = True
+
+            dst_devicesets[new_ds.get("name").lower()] = new_ds
+            for dev in new_ds.iterfind("devices/device"):
+                dst_index.add_device(dev)
+            dst_index.deviceset_changed(new_ds)
+
+        if stale_index:
+            dst_index.invalidate()
+        return report
@@ -0,0 +1,559 @@
+# core/library_index.py
+
+import bisect
+import re
+import weakref
+
+from core.content_hash import ContentHasher
+from config import DEFAULT_TEMPLATE
+from core.templates import DeviceTemplate, is_template_name
+
+
+# Where each kind of element is referenced from, relative to a <deviceset>:
+# (referring element path, referencing attribute)
+REFERENCES = {
+    "package": ("devices/device", "package"),
+    "symbol":  ("gates/gate", "symbol"),
+}
+
+# What XMLHandler.rename (and a rename mapping file) can rename
+RENAME_KINDS = tuple(REFERENCES) + ("deviceset",)
+
+
+def natural_key(name):
+    """
+    Sort key that orders embedded numbers numerically and ignores case,
+    e.g. "R2" < "R10" and "pad 9" < "pad 10".
+    """
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+class LibraryIndex:
+    """
+    Lookup tables derived from one parsed Eagle library tree, built lazily on first use
+    and then kept up to date by XMLHandler as it modifies the tree:
+
+      • symbol_pins:           { symbol_name : frozenset(pin names) }
+      • symbol_pin_order:      { symbol_name : (pin names in document order) }
+      • package_pads:          { package_name : (<smd>/<pad> names in document order) }
+      • content_hashes:        { "package"|"symbol" : { name : ContentHasher hash } }
+      • device_variants:       { package_name : { connect wiring : first <device>Element } }
+                               (a device is listed under both its @package and its @name)
+      • sorted_names:          { "package"|"symbol"|"deviceset" : names in natural order },
+                               kept sorted by bisect insertion as elements are added
+      • devicesets:            { lower‐case deviceset name : <deviceset> }
+      • technologies:          per <deviceset>: { (device name, technology name) : <technology> },
+                               so a (deviceset, device, technology) address is two lookups
+      • templates:             { template name : <deviceset> } of the template devicesets
+                               (see core/templates.py), each compiled to a DeviceTemplate
+                               on first use
+      • elements:              { "package"|"symbol" : { name : Element } }
+      • references:            { "package"|"symbol" : { name : referring <device>s/<gate>s } },
+                               the reverse of device → package and gate → symbol, so
+                               reachability and renames cost one lookup per name
+
+    Get one through LibraryIndex.for_tree(tree) so every caller shares the same instance.
+    Anything that edits the tree behind XMLHandler's back should call invalidate().
+    """
+
+    _instances = weakref.WeakKeyDictionary()
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._symbol_pins = None
+        self._symbol_pin_order = None
+        self._package_pads = None
+        self._content_hashes = {}
+        # { kind : (sort keys, names) }, two parallel lists in natural order
+        self._sorted = {}
+        self._devices_by_package = None
+        self._devicesets = None
+        self._technologies = {}
+        self._templates = None
+        self._compiled_templates = {}
+        # { kind : { name : { referring Element : None } } }; entries are checked against the
+        # element's current attribute when read, so re‐pointed references need no removal
+        self._references = {}
+        self._elements = {}
+        # Scratch space for derived results keyed by callers (e.g. generated connect plans);
+        # cleared together with the tables it was derived from.
+        self.derived = {}
+
+    @classmethod
+    def for_tree(cls, tree):
+        """
+        Return the shared LibraryIndex for 'tree', creating it on first request.
+        """
+        index = cls._instances.get(tree)
+        if index is None:
+            index = cls(tree)
+            cls._instances[tree] = index
+        return index
+
+    def invalidate(self):
+        """
+        Drop every table; they are rebuilt on next access.
+        """
+        self._symbol_pins = None
+        self._symbol_pin_order = None
+        self._package_pads = None
+        self._content_hashes = {}
+        self._sorted = {}
+        self._devices_by_package = None
+        self._devicesets = None
+        self._technologies = {}
+        self._templates = None
+        self._compiled_templates = {}
+        self._references = {}
+        self._elements = {}
+        self.derived.clear()
+
+    # ─── Symbols ───
+
+    def symbol_pins(self, symbol_name):
+        """
+        Return the frozenset of <pin name="..."> inside <symbol name="symbol_name">,
+        or None if there is no such symbol.
+        """
+        self._build_symbols()
+        return self._symbol_pins.get(symbol_name)
+
+    def symbol_pin_order(self, symbol_name):
+        """
+        Return the tuple of pin names of <symbol name="symbol_name"> in document order,
+        or None if there is no such symbol.
+        """
+        self._build_symbols()
+        return self._symbol_pin_order.get(symbol_name)
+
+    def _build_symbols(self):
+        if self._symbol_pins is not None:
+            return
+        self._symbol_pins = {}
+        self._symbol_pin_order = {}
+        sym_parent = self.tree.getroot().find("./drawing/library/symbols")
+        if sym_parent is not None:
+            for sym in sym_parent.findall("symbol"):
+                self._index_symbol_pins(sym)
+
+    def add_symbol(self, sym):
+        """
+        Record (or re-record) a <symbol> Element's pins, content hash and name.
+        """
+        if self._symbol_pins is not None:
+            self._index_symbol_pins(sym)
+        self._record_element(sym)
+        self._record_hash(sym)
+        self._insert_name("symbol", sym.get("name"))
+
+    def _index_symbol_pins(self, sym):
+        name = sym.get("name")
+        if name:
+            order = tuple(pin.get("name") for pin in sym.findall("pin") if pin.get("name"))
+            self._symbol_pin_order[name] = order
+            self._symbol_pins[name] = frozenset(order)
+
+    # ─── Packages ───
+
+    def package_pads(self, pkg_name):
+        """
+        Return the tuple of <smd>/<pad> names of <package name="pkg_name"> in document order,
+        or None if there is no such package.
+        """
+        if self._package_pads is None:
+            self._package_pads = {}
+            pk_parent = self.tree.getroot().find("./drawing/library/packages")
+            if pk_parent is not None:
+                for pkg in pk_parent.findall("package"):
+                    self._index_package_pads(pkg)
+        return self._package_pads.get(pkg_name)
+
+    def add_package(self, pkg):
+        """
+        Record (or re-record) a <package> Element's pads, content hash and name.
+        """
+        if self._package_pads is not None:
+            self._index_package_pads(pkg)
+        self._record_element(pkg)
+        self._record_hash(pkg)
+        self._insert_name("package", pkg.get("name"))
+
+    def _index_package_pads(self, pkg):
+        name = pkg.get("name")
+        if name:
+            self._package_pads[name] = tuple(
+                child.get("name") for child in pkg
+                if child.tag in ("smd", "pad") and child.get("name")
+            )
+
+    # ─── Content hashes ───
+
+    def content_hashes(self, kind):
+        """
+        Return { name : hash } for every <package> (kind="package") or <symbol> (kind="symbol")
+        in the library. The returned dict must not be modified.
+        """
+        hashes = self._content_hashes.get(kind)
+        if hashes is None:
+            hashes = self._content_hashes[kind] = {}
+            parent = self.tree.getroot().find(f"./drawing/library/{kind}s")
+            if parent is not None:
+                for elem in parent.findall(kind):
+                    if elem.get("name"):
+                        hashes[elem.get("name")] = ContentHasher.element_hash(elem)
+        return hashes
+
+    def _record_hash(self, elem):
+        hashes = self._content_hashes.get(elem.tag)
+        if hashes is not None and elem.get("name"):
+            hashes[elem.get("name")] = ContentHasher.element_hash(elem)
+
+    # ─── Sorted names ───
+
+    @staticmethod
+    def sort_key(name):
+        """
+        The key names are kept sorted by: natural_key, then the name itself to break ties
+        between names natural_key considers equal ("R1"/"r1").
+        """
+        return (natural_key(name), name)
+
+    def sorted_names(self, kind):
+        """
+        Return the names of all <package>s (kind="package"), <symbol>s (kind="symbol") or
+        <deviceset>s (kind="deviceset") in natural order (see natural_key), each name once.
+        Built on first use, then kept sorted by add_package/add_symbol/deviceset_changed/
+        remove_name. The returned list must not be modified.
+        """
+        entry = self._sorted.get(kind)
+        if entry is None:
+            parent = self.tree.getroot().find(f"./drawing/library/{kind}s")
+            names = set()
+            if parent is not None:
+                names = {elem.get("name") for elem in parent.findall(kind) if elem.get("name")}
+            pairs = sorted((self.sort_key(name), name) for name in names)
+            entry = self._sorted[kind] = ([key for key, _ in pairs], [name for _, name in pairs])
+        return entry[1]
+
+    def sorted_keys(self, kind):
+        """
+        The natural‐order sort keys matching sorted_names(kind), for bisecting.
+        """
+        self.sorted_names(kind)
+        return self._sorted[kind][0]
+
+    def names_ignoring_case(self, kind, name):
+        """
+        The names in sorted_names(kind) equal to 'name' when case is ignored (“R1”, “r1”),
+        found by bisecting rather than scanning.
+        """
+        self.sorted_names(kind)
+        keys, names = self._sorted[kind]
+        nkey, folded = natural_key(name), name.lower()
+        i = bisect.bisect_left(keys, (nkey,))
+        found = []
+        while i < len(keys) and keys[i][0] == nkey:
+            if names[i].lower() == folded:
+                found.append(names[i])
+            i += 1
+        return found
+
+    def _insert_name(self, kind, name):
+        entry = self._sorted.get(kind)
+        if entry is None or not name:
+            return
+        keys, names = entry
+        key = self.sort_key(name)
+        i = bisect.bisect_left(keys, key)
+        if i == len(keys) or keys[i] != key:
+            keys.insert(i, key)
+            names.insert(i, name)
+
+    def remove_name(self, kind, name):
+        """
+        Drop 'name' from sorted_names(kind) (a <package>/<symbol>/<deviceset> that was
+        removed or renamed).
+        """
+        entry = self._sorted.get(kind)
+        if entry is None or not name:
+            return
+        keys, names = entry
+        key = self.sort_key(name)
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+            del names[i]
+
+    # ─── Devices ───
+
+    def device_variants(self, pkg_name):
+        """
+        Return the <device>s whose @package or @name equals pkg_name, keeping only the first
+        one (in document order) of each distinct <connects> wiring. Candidates that wire the
+        same gate/pin pairs are interchangeable for cloning, so callers scoring candidates
+        stay proportional to the number of wirings rather than the number of devices.
+        """
+        if self._devices_by_package is None:
+            self._devices_by_package = {}
+            path = "./drawing/library/devicesets/deviceset/devices/device"
+            for dev in self.tree.getroot().iterfind(path):
+                self.add_device(dev)
+        variants = self._devices_by_package.get(pkg_name)
+        return list(variants.values()) if variants else []
+
+    def add_device(self, dev):
+        """
+        Record a <device> Element that was just appended to the tree.
+        """
+        self._add_reference("package", dev)
+        if self._devices_by_package is None:
+            return
+        keys = {dev.get("package"), dev.get("name")}
+        keys.discard(None)
+        if not keys:
+            return
+        wiring = frozenset(
+            (conn.get("gate"), conn.get("pin")) for conn in dev.iterfind("connects/connect")
+        )
+        for key in keys:
+            self._devices_by_package.setdefault(key, {}).setdefault(wiring, dev)
+
+    # ─── Devicesets and technologies ───
+
+    def deviceset(self, name):
+        """
+        Return the <deviceset> whose @name matches 'name' case‐insensitively, or None.
+        """
+        if self._devicesets is None:
+            self._devicesets = {}
+            for ds in self.tree.getroot().iterfind("./drawing/library/devicesets/deviceset"):
+                self._devicesets.setdefault(ds.get("name", "").lower(), ds)
+        return self._devicesets.get(name.lower())
+
+    def technologies(self, ds):
+        """
+        Return { (device name, technology name) : <technology> } for a <deviceset> Element,
+        built on first use. The returned dict must not be modified; see add_technology.
+        """
+        table = self._technologies.get(ds)
+        if table is None:
+            table = self._technologies[ds] = {}
+            for dev in ds.iterfind("devices/device"):
+                for tech in dev.iterfind("technologies/technology"):
+                    table.setdefault((dev.get("name"), tech.get("name", "")), tech)
+        return table
+
+    def technology(self, ds_name, device_name, tech_name=""):
+        """
+        Return the <technology> addressed by (deviceset, device, technology), or None.
+        """
+        ds = self.deviceset(ds_name)
+        if ds is None:
+            return None
+        return self.technologies(ds).get((device_name, tech_name))
+
+    def add_technology(self, ds, device_name, tech):
+        """
+        Record a <technology> Element that was just added under ds/device_name.
+        """
+        table = self._technologies.get(ds)
+        if table is not None:
+            table.setdefault((device_name, tech.get("name", "")), tech)
+
+    # ─── Templates ───
+
+    def _build_templates(self):
+        if self._templates is not None:
+            return
+        self._templates = {}
+        for ds in self.tree.getroot().iterfind("./drawing/library/devicesets/deviceset"):
+            if is_template_name(ds.get("name")):
+                self._templates.setdefault(ds.get("name"), ds)
+
+    def template_names(self):
+        """
+        Names of the library's template devicesets, the default one first, the others in
+        natural order. Empty if the library has none (template() then falls back to the
+        first deviceset).
+        """
+        self._build_templates()
+        default = DEFAULT_TEMPLATE.upper()
+        return sorted(self._templates, key=lambda name: (name.upper() != default, natural_key(name)))
+
+    def template(self, name=None):
+        """
+        Return the compiled DeviceTemplate called 'name' (case‐insensitive), or the default
+        one for name=None: DEFAULT_TEMPLATE, else the first template, else the library's
+        first deviceset. Raises RuntimeError if there is no such template or no deviceset.
+        """
+        self._build_templates()
+        if name:
+            for tpl_name, ds in self._templates.items():
+                if tpl_name.lower() == name.lower():
+                    return self.compiled_template(ds)
+            raise RuntimeError(f"Template deviceset '{name}' not found.")
+        names = self.template_names()
+        if names:
+            return self.compiled_template(self._templates[names[0]])
+        ds_parent = self.tree.getroot().find("./drawing/library/devicesets")
+        if ds_parent is None:
+            raise RuntimeError("<devicesets> not found under <library>.")
+        first = ds_parent.find("deviceset")
+        if first is None:
+            raise RuntimeError("No <deviceset> found under <devicesets>.")
+        return self.compiled_template(first)
+
+    def compiled_template(self, ds):
+        """
+        Return the DeviceTemplate for any <deviceset> Element, compiling it on first use.
+        """
+        compiled = self._compiled_templates.get(ds)
+        if compiled is None:
+            compiled = self._compiled_templates[ds] = DeviceTemplate(ds)
+        return compiled
+
+    def deviceset_changed(self, ds):
+        """
+        Record that a <deviceset> was added or modified: its compiled template and technology
+        table (if any) are dropped, it can be found by name, and a deviceset with a template
+        name becomes available as a template.
+        """
+        self._compiled_templates.pop(ds, None)
+        self._technologies.pop(ds, None)
+        if self._devicesets is not None:
+            self._devicesets.setdefault(ds.get("name", "").lower(), ds)
+        self._insert_name("deviceset", ds.get("name"))
+        for gate in ds.iterfind(REFERENCES["symbol"][0]):
+            self._add_reference("symbol", gate)
+        if self._templates is not None and is_template_name(ds.get("name")):
+            self._templates.setdefault(ds.get("name"), ds)
+
+    # ─── Elements by name ───
+
+    def element(self, kind, name):
+        """
+        The <package> (kind="package") or <symbol> (kind="symbol") called 'name', or None.
+        """
+        table = self._elements.get(kind)
+        if table is None:
+            table = self._elements[kind] = {}
+            parent = self.tree.getroot().find(f"./drawing/library/{kind}s")
+            if parent is not None:
+                for elem in parent.findall(kind):
+                    if elem.get("name"):
+                        table.setdefault(elem.get("name"), elem)
+        return table.get(name)
+
+    def _record_element(self, elem):
+        # Overwrite: a re‐recorded name (e.g. an import replacing a package) maps to the new Element
+        table = self._elements.get(elem.tag)
+        if table is not None and elem.get("name"):
+            table[elem.get("name")] = elem
+
+    # ─── References ───
+
+    def _build_references(self, kind):
+        table = self._references.get(kind)
+        if table is None:
+            table = self._references[kind] = {}
+            path, attr = REFERENCES[kind]
+            for elem in self.tree.getroot().iterfind("./drawing/library/devicesets/deviceset/" + path):
+                name = elem.get(attr)
+                if name:
+                    table.setdefault(name, {})[elem] = None
+        return table
+
+    def _add_reference(self, kind, elem):
+        """
+        Record that 'elem' (a <device> or <gate>) now refers to the name in its attribute.
+        """
+        table = self._references.get(kind)
+        name = elem.get(REFERENCES[kind][1])
+        if table is not None and name:
+            table.setdefault(name, {})[elem] = None
+
+    def referrers(self, kind, name):
+        """
+        The <device>s (kind="package") or <gate>s (kind="symbol") that refer to 'name',
+        in the order they were indexed.
+        """
+        attr = REFERENCES[kind][1]
+        entries = self._build_references(kind).get(name)
+        return [elem for elem in entries if elem.get(attr) == name] if entries else []
+
+    def is_referenced(self, kind, name):
+        """
+        True if any device/gate refers to the <package>/<symbol> 'name'.
+        """
+        attr = REFERENCES[kind][1]
+        return any(elem.get(attr) == name for elem in self._build_references(kind).get(name, ()))
+
+    def unreferenced(self, kind):
+        """
+        Names of the <package>s/<symbol>s that no device/gate refers to, in natural order.
+        """
+        return [name for name in self.sorted_names(kind) if not self.is_referenced(kind, name)]
+
+    def element_removed(self, elem):
+        """
+        Record that a <package> or <symbol> Element was removed from the library: its
+        pads/pins, content hash and sorted name are dropped.
+        """
+        kind, name = elem.tag, elem.get("name")
+        if not name:
+            return
+        tables = (self._package_pads,) if kind == "package" else (self._symbol_pins, self._symbol_pin_order)
+        for table in tables:
+            if table is not None:
+                table.pop(name, None)
+        hashes = self._content_hashes.get(kind)
+        if hashes is not None:
+            hashes.pop(name, None)
+        elements = self._elements.get(kind)
+        if elements is not None and elements.get(name) is elem:
+            del elements[name]
+        self.remove_name(kind, name)
+        self.derived.clear()
+
+    def renamed(self, elem, old, referrers=()):
+        """
+        Record that a <package>, <symbol> or <deviceset> was renamed from 'old' to its
+        current @name, and that 'referrers' (the <device>s/<gate>s that referred to it)
+        were pointed at the new name. Every table keyed by the name moves its entry;
+        the tables derived from device names or gate symbols are dropped.
+        """
+        kind, new = elem.tag, elem.get("name")
+        self.remove_name(kind, old)
+        self._insert_name(kind, new)
+        self.derived.clear()
+        if kind == "deviceset":
+            if self._devicesets is not None:
+                if self._devicesets.get(old.lower()) is elem:
+                    del self._devicesets[old.lower()]
+                self._devicesets.setdefault(new.lower(), elem)
+            self._templates = None       # the name decides whether it is a template
+            self._compiled_templates.pop(elem, None)
+            return
+
+        tables = [self._elements.get(kind), self._content_hashes.get(kind)]
+        if kind == "package":
+            tables.append(self._package_pads)
+            # Device names (technology keys) and template device maps may have changed
+            self._technologies = {}
+            if self._devices_by_package is not None:
+                self._devices_by_package.pop(old, None)
+                for dev in referrers:
+                    self.add_device(dev)
+        else:
+            tables += [self._symbol_pins, self._symbol_pin_order]
+        self._compiled_templates = {}
+        for table in tables:
+            if table is not None and old in table:
+                table[new] = table.pop(old)
+
+        references = self._references.get(kind)
+        if references is not None:
+            moved = references.pop(old, {})
+            references.setdefault(new, {}).update(moved)
+            for ref in referrers:
+                references[new][ref] = None
@@ -0,0 +1,282 @@
+# core/library_session.py
+
+import getpass
+import hashlib
+import json
+import os
+import secrets
+import socket
+import time
+from contextlib import contextmanager
+
+from config import LOCK_STALE_SECONDS, LOCK_TIMEOUT_SECONDS
+from core.transaction import TreeTransaction
+from core.xml_handler import XMLHandler
+
+
+def _pid_alive(pid):
+    """
+    True if a process with this PID exists on this machine (best effort).
+    """
+    if os.name == "nt":
+        # os.kill() would terminate the process on Windows; ask the kernel instead.
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return code.value == STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class LibraryLock:
+    """
+    Advisory lock for one library file: “<path>.lock”, created atomically (O_EXCL) and
+    holding who owns it as JSON (owner, pid, host, time). Works across machines on a
+    shared drive as long as every writer uses it.
+
+      with LibraryLock(path):
+          … read / check / write the library …
+
+    A lock is stale, and gets broken, when it is older than LOCK_STALE_SECONDS or when it
+    was taken on this host by a process that no longer exists. Otherwise acquire() waits
+    up to 'timeout' seconds and then raises RuntimeError naming the holder.
+
+    Breaking is race‐free: the lock file is renamed away (atomic, so only one waiter gets
+    it) and checked again; if it turns out to be a fresh lock someone took in between,
+    it is put back.
+    """
+
+    POLL_SECONDS = 0.2
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT_SECONDS):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.timeout = timeout
+        self.held = False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    @staticmethod
+    def _owner_info():
+        return {
+            "owner": getpass.getuser(),
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "time": time.time(),
+        }
+
+    def read_holder(self, lock_path=None):
+        """
+        Return the current lock file's contents (dict), {} if unreadable, None if unlocked.
+        """
+        try:
+            with open(lock_path or self.lock_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            return {}
+
+    def is_stale(self, holder, lock_path=None):
+        try:
+            age = time.time() - os.stat(lock_path or self.lock_path).st_mtime
+        except FileNotFoundError:
+            return True
+        if age > LOCK_STALE_SECONDS:
+            return True
+        if holder.get("host") == socket.gethostname() and isinstance(holder.get("pid"), int):
+            return not _pid_alive(holder["pid"])
+        return False
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                holder = self.read_holder()
+                if holder is not None and self.is_stale(holder):
+                    self._break_stale()
+                    continue
+                if time.monotonic() >= deadline:
+                    holder = holder or {}
+                    raise RuntimeError(
+                        f"'{os.path.basename(self.path)}' is locked by "
+                        f"{holder.get('owner', '?')}@{holder.get('host', '?')} (PID {holder.get('pid', '?')}). "
+                        f"Try again in a moment."
+                    )
+                time.sleep(self.POLL_SECONDS)
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._owner_info(), f)
+            self.held = True
+            return
+
+    def _break_stale(self):
+        """
+        Remove a lock found stale. Between the check and the removal another waiter may
+        have broken it and taken a fresh one, so the file is first renamed to a name of
+        our own and checked again there; a fresh lock is linked back (the link fails if
+        the name was taken yet again, which leaves that newer lock alone).
+        """
+        grave = f"{self.lock_path}.{os.getpid()}.{secrets.token_hex(4)}.stale"
+        try:
+            os.rename(self.lock_path, grave)
+        except FileNotFoundError:
+            return    # someone else broke it first
+        try:
+            holder = self.read_holder(grave)
+            if holder is not None and not self.is_stale(holder, grave):
+                try:
+                    os.link(grave, self.lock_path)
+                except OSError:
+                    pass
+        finally:
+            os.remove(grave)
+
+    def release(self):
+        if self.held:
+            self.held = False
+            try:
+                os.remove(self.lock_path)
+            except FileNotFoundError:
+                pass
+
+
+class LibrarySession:
+    """
+    One editing session on a library file, safe against other users saving the same
+    file in between (optimistic concurrency):
+
+      session = LibrarySession.open(path)            # parse + remember the base version
+      session.apply("add 10K", XMLHandler.add_or_merge_deviceset, "10K", "R", pkgs)
+      session.save()
+
+      • apply(label, func, *args, **kwargs) runs func(session.tree, *args, **kwargs) and
+        journals the call. Operations must depend only on their arguments and the tree
+        (XMLHandler.add_or_merge_deviceset, ValueSeries.generate,
+        LibraryImporter.import_devicesets, XMLHandler.merge_duplicates, …). A call that
+        raises is rolled back (core/transaction.py) and not journaled; inside
+        “with session.transaction():” several calls commit or abort together.
+      • save() takes the LibraryLock, then compares the file with the base version
+        (size/mtime, then content hash). If someone else saved in the meantime, the
+        fresh file is parsed and this session's journal is replayed onto it, so both
+        sides' changes survive; then it writes. The journal is cleared after each save.
+      • The file is written to a temporary file next to it and renamed over it (see
+        CanonicalWriter.write_tree), so a reader (open() doesn't take the lock) sees the
+        old or the new library, never a half‐written one, and a crash while writing
+        leaves the old one intact.
+
+    After a save that had to replay, session.tree is a new tree; callers holding
+    elements of the old one must reload them.
+    """
+
+    def __init__(self, path, tree, version):
+        self.path = path
+        self.tree = tree
+        self.version = version     # (mtime_ns, size, content hash) of the file this tree is based on
+        self.journal = []          # [(label, func, args, kwargs), …] applied since the last save
+
+    @staticmethod
+    def file_version(path, previous=None):
+        """
+        (mtime_ns, size, blake2b hex digest) of the file at 'path'. If size and mtime
+        match 'previous', its hash is reused instead of re‐reading the file.
+        """
+        st = os.stat(path)
+        if previous is not None and previous[:2] == (st.st_mtime_ns, st.st_size):
+            return previous
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return st.st_mtime_ns, st.st_size, digest.hexdigest()
+
+    @classmethod
+    def open(cls, path):
+        # Version first: if the file changes while we parse, save() sees a mismatch and replays.
+        version = cls.file_version(path)
+        return cls(path, XMLHandler.parse_library(path), version)
+
+    def apply(self, label, func, *args, **kwargs):
+        """
+        Run func(self.tree, *args, **kwargs), record it in the journal and return its result.
+        The call is a transaction of its own: if it raises, the tree is rolled back to how
+        it was before and nothing is journaled.
+        """
+        with TreeTransaction(self.tree):
+            result = func(self.tree, *args, **kwargs)
+        self.journal.append((label, func, args, kwargs))
+        return result
+
+    @contextmanager
+    def transaction(self):
+        """
+        with session.transaction(): … — several apply() calls that commit or abort as a
+        unit. If the block raises, the tree and the journal are restored to how they were
+        at its start and the exception propagates.
+        """
+        mark = len(self.journal)
+        try:
+            with TreeTransaction(self.tree):
+                yield self
+        except BaseException:
+            del self.journal[mark:]
+            raise
+
+    def changed_on_disk(self):
+        """
+        True if the file no longer has the content this session was based on.
+        """
+        current = self.file_version(self.path, self.version)
+        return current[2] != self.version[2]
+
+    def save(self):
+        """
+        Write the session's changes under the lock. Returns the labels of the journaled
+        changes that had to be replayed onto a newer version of the file ([] if the
+        file was unchanged since it was loaded or last saved).
+
+        If a change can't be replayed onto the newer file (e.g. someone removed the
+        deviceset it edits), nothing is written, session.tree and the journal stay as they
+        were, and RuntimeError names the change.
+        """
+        replayed = []
+        with LibraryLock(self.path):
+            if self.changed_on_disk():
+                fresh = XMLHandler.parse_library(self.path)
+                with TreeTransaction(fresh):
+                    for label, func, args, kwargs in self.journal:
+                        if "warnings" in kwargs:
+                            # Reported when the change was first applied; don't add them again
+                            kwargs = dict(kwargs, warnings=[])
+                        try:
+                            func(fresh, *args, **kwargs)
+                        except Exception as e:
+                            raise RuntimeError(
+                                f"Could not replay '{label}' onto the newer version of "
+                                f"'{os.path.basename(self.path)}': {e}"
+                            ) from e
+                        replayed.append(label)
+                self.tree = fresh
+            XMLHandler.save_library(self.tree, self.path)
+            self.version = self.file_version(self.path)
+        self.journal.clear()
+        return replayed
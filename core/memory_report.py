@@ -0,0 +1,351 @@
+# core/memory_report.py
+
+import gc
+import os
+import sys
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from core.library_catalog import LibraryCatalog
+from core.library_index import LibraryIndex
+from core.xml_handler import XMLHandler
+
+SECTIONS = ("packages", "symbols", "devicesets")
+
+# A section growing by more than the tolerance counts as a regression only above this
+# many bytes, so small libraries don't fail on allocator noise.
+NOISE_FLOOR_BYTES = 64 * 1024
+
+
+def deep_size(obj, seen=None):
+    """
+    Bytes used by obj and everything it references through dicts, lists, tuples, sets
+    and object __dict__s (sys.getsizeof, each object counted once per 'seen' set).
+    Elements are not followed: tables that point into a tree don't own it.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (ET.Element, type)):
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__") and not callable(o):
+            stack.append(vars(o))
+    return size
+
+
+def _own_size(e, seen):
+    """
+    Bytes of one Element without its children: the object, its attribute dict and the
+    attribute/text strings not in 'seen' yet.
+    """
+    size = sys.getsizeof(e)
+    # .attrib would create an empty dict on elements that have none
+    if e.keys():
+        attrib = e.attrib
+        size += sys.getsizeof(attrib)
+        for key, value in attrib.items():
+            for s in (key, value):
+                if id(s) not in seen:
+                    seen.add(id(s))
+                    size += sys.getsizeof(s)
+    for s in (e.text, e.tail):
+        if s is not None and id(s) not in seen:
+            seen.add(id(s))
+            size += sys.getsizeof(s)
+    return size
+
+
+def element_size(elem, seen):
+    """
+    (element count, bytes) of an Element subtree (see _own_size; each string is counted
+    once per 'seen').
+    """
+    count = size = 0
+    for e in elem.iter():
+        count += 1
+        size += _own_size(e, seen)
+    return count, size
+
+
+class MemoryReport:
+    """
+    Where the memory of a loaded library goes, per load mode:
+
+      • tree:     XMLHandler.parse_library(): the editable tree
+      • indexed:  the tree plus every LibraryIndex table built (what the GUI and the
+                  server hold once a library has been used)
+      • catalog:  LibraryCatalog.load(), the read‐only summary (in‐process)
+
+    Each mode is loaded on its own under tracemalloc, giving the traced total and the
+    peak during loading. The total is then broken down by walking what was loaded:
+    <packages>/<symbols>/<devicesets>/rest of the tree with element counts and bytes
+    per element, each index table, and each catalog table. The walk counts objects
+    only, so “unattributed” is what tracemalloc saw beyond them (allocator slack,
+    parser name caches, …).
+
+    Rows are dicts { mode, section, elements, bytes, per_element } for printing
+    (format_table), saving as JSON and comparing with an earlier run (compare), so a
+    change that costs memory shows up like a slowdown does in gui-bench.
+    """
+
+    MODES = ("tree", "indexed", "catalog")
+
+    # ─── Breakdowns ───
+
+    @staticmethod
+    def row(mode, section, elements, size):
+        """
+        One report row; elements/size may be None where they don't apply.
+        """
+        return {
+            "mode": mode,
+            "section": section,
+            "elements": elements,
+            "bytes": size,
+            "per_element": round(size / elements, 1) if elements else None,
+        }
+
+    @staticmethod
+    def tree_sections(tree, mode="tree", seen=None):
+        """
+        One row per library section plus “other” (settings, layers, the containers).
+        """
+        seen = set() if seen is None else seen
+        root = tree.getroot()
+        rows = []
+        in_sections = set()
+        for section in SECTIONS:
+            parent = root.find(f"./drawing/library/{section}")
+            count = size = 0
+            if parent is not None:
+                for child in parent:
+                    c, s = element_size(child, seen)
+                    count += c
+                    size += s
+                    in_sections.add(child)
+            rows.append(MemoryReport.row(mode, section, count, size))
+        count = size = 0
+        stack = [root]
+        while stack:
+            e = stack.pop()
+            count += 1
+            size += _own_size(e, seen)
+            stack.extend(child for child in e if child not in in_sections)
+        rows.append(MemoryReport.row(mode, "other", count, size))
+        return rows
+
+    @staticmethod
+    def build_index(tree):
+        """
+        Build every lazily built LibraryIndex table of 'tree' and return the index.
+        """
+        index = LibraryIndex.for_tree(tree)
+        index.symbol_pins("")
+        index.package_pads("")
+        index.device_variants("")
+        index.deviceset("")
+        index.template_names()
+        for kind in ("package", "symbol"):
+            index.content_hashes(kind)
+            index.referrers(kind, "")    # reverse references (unused, rename)
+            index.element(kind, "")      # elements by name (rename)
+        for kind in ("package", "symbol", "deviceset"):
+            index.sorted_names(kind)
+        return index
+
+    @staticmethod
+    def _entries(name, table):
+        """
+        Number of entries of an index table: inner entries for tables of tables
+        ({ kind : { name : hash } }, { kind : (keys, names) }).
+        """
+        if not isinstance(table, dict):
+            return len(table) if hasattr(table, "__len__") else 0
+        values = list(table.values())
+        if values and all(isinstance(v, dict) for v in values):
+            return sum(len(v) for v in values)
+        if name == "_sorted":
+            return sum(len(names) for _keys, names in values)
+        return len(table)
+
+    @staticmethod
+    def index_tables(index, mode="indexed", seen=None):
+        """
+        One row per LibraryIndex table ("index.<name>"); elements = number of entries.
+        """
+        seen = set() if seen is None else seen
+        rows = []
+        for name, table in sorted(vars(index).items()):
+            if name == "tree":
+                continue
+            entries = MemoryReport._entries(name, table)
+            rows.append(MemoryReport.row(mode, "index." + name.lstrip("_"), entries,
+                                          deep_size(table, seen)))
+        return rows
+
+    @staticmethod
+    def catalog_tables(catalog, mode="catalog", seen=None):
+        seen = set() if seen is None else seen
+        return [
+            MemoryReport.row(mode, "catalog." + section, len(getattr(catalog, section)),
+                              deep_size(getattr(catalog, section), seen))
+            for section in SECTIONS
+        ]
+
+    # ─── Profiling ───
+
+    @staticmethod
+    def _load(path, mode):
+        if mode == "catalog":
+            return LibraryCatalog.load(path, workers=1)
+        tree = XMLHandler.parse_library(path)
+        if mode == "indexed":
+            MemoryReport.build_index(tree)
+        return tree
+
+    @staticmethod
+    def _traced_load(path, mode):
+        """
+        Load one mode under tracemalloc: (loaded object, traced bytes, peak bytes). Tracing
+        runs only for the load (it slows everything down ~5×) unless it was already on.
+        """
+        was_tracing = tracemalloc.is_tracing()
+        gc.collect()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            loaded = MemoryReport._load(path, mode)
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        return loaded, current - before, peak - before
+
+    @staticmethod
+    def breakdown(loaded, mode):
+        """
+        The rows for what one mode loaded (a tree, with its index for "indexed", or a
+        LibraryCatalog).
+        """
+        seen = set()
+        if mode == "catalog":
+            return MemoryReport.catalog_tables(loaded, mode, seen)
+        rows = MemoryReport.tree_sections(loaded, mode, seen)
+        if mode == "indexed":
+            rows += MemoryReport.index_tables(LibraryIndex.for_tree(loaded), mode, seen)
+        return rows
+
+    @staticmethod
+    def profile(path, modes=MODES):
+        """
+        Load the library at 'path' once per mode and return the rows: “traced” (what is
+        still allocated after loading), “peak” (during loading), the breakdown, and
+        “unattributed” (traced minus the breakdown).
+        """
+        rows = []
+        for mode in modes:
+            loaded, traced, peak = MemoryReport._traced_load(path, mode)
+            parts = MemoryReport.breakdown(loaded, mode)
+            elements = None if mode == "catalog" else sum(
+                r["elements"] for r in parts if not r["section"].startswith("index.")
+            )
+            rows.append(MemoryReport.row(mode, "traced", elements, traced))
+            rows.append(MemoryReport.row(mode, "peak", None, peak))
+            rows.extend(parts)
+            rows.append(MemoryReport.row(mode, "unattributed", None,
+                                          traced - sum(r["bytes"] for r in parts)))
+            del loaded, parts
+        return rows
+
+    @staticmethod
+    def allocations_by_source(snapshot, top=8):
+        """
+        Group a tracemalloc snapshot by where the memory was allocated: this program's
+        core/ and gui/, customtkinter, xml.etree, or the module file otherwise.
+        Returns [(source, bytes, blocks), …], largest first.
+        """
+        here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        groups = {}
+        for stat in snapshot.statistics("filename"):
+            filename = stat.traceback[0].filename
+            if filename.startswith(here):
+                source = os.path.relpath(filename, here).replace(os.sep, "/").split("/")[0]
+            elif "customtkinter" in filename:
+                source = "customtkinter"
+            elif os.path.join("xml", "etree") in filename:
+                source = "xml.etree"
+            else:
+                source = os.path.basename(filename)
+            size, blocks = groups.get(source, (0, 0))
+            groups[source] = (size + stat.size, blocks + stat.count)
+        ranked = sorted(groups.items(), key=lambda item: -item[1][0])
+        return [(source, size, blocks) for source, (size, blocks) in ranked[:top]]
+
+    @staticmethod
+    def rss_bytes():
+        """
+        Resident set size of this process (Linux only; None elsewhere).
+        """
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    # ─── Output ───
+
+    @staticmethod
+    def format_table(rows):
+        columns = ["mode", "section", "elements", "bytes", "per_element"]
+        cells = [columns]
+        for r in rows:
+            cells.append([
+                r["mode"], r["section"],
+                "" if r["elements"] is None else str(r["elements"]),
+                "" if r["bytes"] is None else MemoryReport.format_bytes(r["bytes"]),
+                "" if r["per_element"] is None else f"{r['per_element']:.0f} B",
+            ])
+        widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+        return "\n".join(
+            "  ".join(cell.rjust(w) if i >= 2 else cell.ljust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+            for row in cells
+        )
+
+    @staticmethod
+    def format_bytes(size):
+        if abs(size) >= 2 ** 20:
+            return f"{size / 2 ** 20:.1f} MB"
+        if abs(size) >= 2 ** 10:
+            return f"{size / 2 ** 10:.1f} KB"
+        return f"{size} B"
+
+    @staticmethod
+    def compare(rows, baseline, tolerance):
+        """
+        Return a message for every (mode, section) that uses more than 'tolerance'
+        (0.2 = 20 %) and NOISE_FLOOR_BYTES more memory than in 'baseline'.
+        """
+        before = {(r["mode"], r["section"]): r for r in baseline}
+        regressions = []
+        for r in rows:
+            b = before.get((r["mode"], r["section"]))
+            if b is None or r["bytes"] is None or b["bytes"] is None or r["section"] in ("unattributed", "peak"):
+                continue
+            if r["bytes"] > b["bytes"] * (1 + tolerance) and r["bytes"] - b["bytes"] > NOISE_FLOOR_BYTES:
+                regressions.append(
+                    f"{r['mode']} {r['section']}: {MemoryReport.format_bytes(b['bytes'])} → "
+                    f"{MemoryReport.format_bytes(r['bytes'])}"
+                )
+        return regressions
@@ -0,0 +1,169 @@
+# core/parts_index.py
+
+import os
+import sqlite3
+import xml.etree.ElementTree as ET
+
+from config import PARTS_INDEX_PATH
+from core.compressed_io import open_library
+
+LIBRARY_EXTENSIONS = (".lbr", ".lbr.gz", ".lbr.zst")
+
+# One row per <technology> of every <device>:
+PART_COLUMNS = ("library", "deviceset", "device", "technology", "package", "lcsc", "value", "description")
+
+
+def scan_library(path):
+    """
+    Stream one Eagle library with iterparse and return (path, rows), where each row is a
+    tuple in PART_COLUMNS order. Elements are released as soon as they have been read,
+    so memory stays flat regardless of library size. Runs in worker processes.
+    """
+    rows = []
+    with open_library(path) as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag == "deviceset":
+                ds_name = elem.get("name", "")
+                ds_desc = (elem.findtext("description") or "").strip()
+                for dev in elem.iterfind("devices/device"):
+                    techs = dev.findall("technologies/technology") or [None]
+                    for tech in techs:
+                        attrs = {}
+                        if tech is not None:
+                            attrs = {a.get("name"): a.get("value", "") for a in tech.iterfind("attribute")}
+                        rows.append((
+                            path,
+                            ds_name,
+                            dev.get("name", ""),
+                            "" if tech is None else tech.get("name", ""),
+                            dev.get("package", ""),
+                            attrs.get("LCSC_PART", ""),
+                            attrs.get("VALUE", ""),
+                            attrs.get("DESCRIPTION", "") or ds_desc,
+                        ))
+                elem.clear()
+            elif elem.tag in ("package", "symbol"):
+                elem.clear()
+    return path, rows
+
+
+class PartsIndex:
+    """
+    Persistent, combined index of the parts in every Eagle library under one or more
+    directory trees, stored in SQLite (default: config.PARTS_INDEX_PATH).
+
+      • update(root) rescans only the libraries whose size/mtime changed since the last
+        update (in parallel, one process per library) and drops rows of deleted files
+      • search(query) returns matching rows in milliseconds: every whitespace‐separated
+        term must occur (case‐insensitively) in one of the row's fields
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or PARTS_INDEX_PATH
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS parts (
+                library TEXT, deviceset TEXT, device TEXT, technology TEXT,
+                package TEXT, lcsc TEXT, value TEXT, description TEXT, haystack TEXT
+            );
+            CREATE INDEX IF NOT EXISTS parts_library ON parts (library);
+            CREATE INDEX IF NOT EXISTS parts_lcsc ON parts (lcsc);
+            """
+        )
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def find_libraries(root):
+        """
+        Return { path : (mtime_ns, size) } for every library file under 'root'.
+        """
+        found = {}
+        for dirpath, _, filenames in os.walk(root):
+            for fn in filenames:
+                if fn.lower().endswith(LIBRARY_EXTENSIONS):
+                    path = os.path.abspath(os.path.join(dirpath, fn))
+                    st = os.stat(path)
+                    found[path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def update(self, root, workers=None):
+        """
+        Bring the index up to date with the libraries under 'root'.
+        Returns (rescanned, removed, failed): lists of library paths, plus (path, error)
+        pairs for files that failed to parse (those are left out of the index).
+        """
+        root = os.path.abspath(root)
+        on_disk = self.find_libraries(root)
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.conn.execute("SELECT path, mtime_ns, size FROM files")
+            if path == root or path.startswith(root + os.sep)
+        }
+
+        removed = [path for path in known if path not in on_disk]
+        changed = [path for path, stamp in on_disk.items() if known.get(path) != stamp]
+
+        failed = []
+        results = []
+        if len(changed) > 1 and workers != 1:
+            # Imported here: concurrent.futures/multiprocessing cost ~25 ms at startup
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {path: pool.submit(scan_library, path) for path in changed}
+                for path, future in futures.items():
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        failed.append((path, e))
+        else:
+            for path in changed:
+                try:
+                    results.append(scan_library(path))
+                except Exception as e:
+                    failed.append((path, e))
+
+        with self.conn:
+            for path in removed + [path for path, _ in failed]:
+                self.conn.execute("DELETE FROM parts WHERE library = ?", (path,))
+                self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            for path, rows in results:
+                self.conn.execute("DELETE FROM parts WHERE library = ?", (path,))
+                self.conn.executemany(
+                    "INSERT INTO parts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row + (" ".join(row[1:]).lower(),) for row in rows],
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (path,) + on_disk[path]
+                )
+
+        return [path for path, _ in results], removed, failed
+
+    def search(self, query, limit=200):
+        """
+        Return up to 'limit' rows (tuples in PART_COLUMNS order) matching every term of
+        'query', ordered by library and deviceset.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return []
+        where = " AND ".join("haystack LIKE ? ESCAPE '\\'" for _ in terms)
+        params = [
+            "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            for term in terms
+        ]
+        sql = f"SELECT {', '.join(PART_COLUMNS)} FROM parts WHERE {where} ORDER BY library, deviceset LIMIT ?"
+        return self.conn.execute(sql, params + [limit]).fetchall()
+
+    def count(self):
+        """
+        Return (number of libraries, number of rows) currently indexed.
+        """
+        libs = self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        rows = self.conn.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+        return libs, rows
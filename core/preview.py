@@ -0,0 +1,317 @@
+# core/preview.py
+
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+from core.content_hash import ContentHasher
+
+# Bump when the drawing changes, so thumbnails cached on disk by an older version are redrawn.
+RENDER_VERSION = 1
+
+# Eagle pin lengths (mm) by @length
+_PIN_LENGTHS = {"point": 0.0, "short": 2.54, "middle": 5.08, "long": 7.62}
+
+# RGBA per layer; anything else is drawn in _DEFAULT_COLOR
+_LAYER_COLORS = {
+    "1":  (200, 60, 60, 255),      # Top
+    "16": (60, 90, 220, 255),      # Bottom
+    "17": (60, 180, 90, 255),      # Pads
+    "21": (220, 220, 220, 255),    # tPlace
+    "94": (230, 200, 80, 255),     # Symbols
+}
+_DEFAULT_COLOR = (140, 140, 140, 255)
+_PAD_COLOR = _LAYER_COLORS["17"]
+_PIN_COLOR = (150, 170, 200, 255)
+
+
+class PreviewRenderer:
+    """
+    Draws the geometry of a <package> (smd, pad, wire, polygon, circle, rectangle) or a
+    <symbol> (wire, pin, polygon, circle, rectangle) into a small RGBA image and encodes it
+    as PNG, in pure Python (no Tk, no PIL), so it can run on any thread:
+
+      png = PreviewRenderer.render_png(package_elem, 48, 32)
+
+    Every primitive is turned into a polygon in library coordinates (mm), the drawing is
+    scaled to fit the image (aspect ratio kept, y pointing up), and polygons are filled by
+    scanline. Text, arcs (@curve) and holes are ignored; at thumbnail size they add nothing.
+    """
+
+    # ─── Geometry ───
+
+    @staticmethod
+    def _f(elem, key, default=0.0):
+        try:
+            return float(elem.get(key, default))
+        except ValueError:
+            return default
+
+    @staticmethod
+    def _rotation(elem):
+        """
+        Degrees from an Eagle @rot such as "R90", "MR180" or "SR45" (mirroring is ignored).
+        """
+        rot = elem.get("rot", "")
+        digits = rot.lstrip("MSR")
+        try:
+            return float(digits) if digits else 0.0
+        except ValueError:
+            return 0.0
+
+    @staticmethod
+    def _rect(cx, cy, dx, dy, degrees=0.0):
+        hx, hy = dx / 2, dy / 2
+        corners = [(-hx, -hy), (hx, -hy), (hx, hy), (-hx, hy)]
+        if degrees:
+            a = math.radians(degrees)
+            c, s = math.cos(a), math.sin(a)
+            corners = [(x * c - y * s, x * s + y * c) for x, y in corners]
+        return [(cx + x, cy + y) for x, y in corners]
+
+    @staticmethod
+    def _disc(cx, cy, r, sides=12):
+        return [(cx + r * math.cos(2 * math.pi * i / sides), cy + r * math.sin(2 * math.pi * i / sides))
+                for i in range(sides)]
+
+    @staticmethod
+    def _segment(x1, y1, x2, y2, width):
+        """
+        A line of the given width as a quad (width 0 is widened to one pixel at raster time).
+        """
+        return ("line", (x1, y1, x2, y2, width))
+
+    @staticmethod
+    def shapes(elem):
+        """
+        Return [(kind, data, rgba)] for the element's primitives, in library coordinates:
+        kind "poly" with data [(x, y), …], or "line" with data (x1, y1, x2, y2, width).
+        """
+        f = PreviewRenderer._f
+        result = []
+        for child in elem:
+            tag = child.tag
+            color = _LAYER_COLORS.get(child.get("layer"), _DEFAULT_COLOR)
+            if tag == "smd":
+                poly = PreviewRenderer._rect(f(child, "x"), f(child, "y"), f(child, "dx"), f(child, "dy"),
+                                             PreviewRenderer._rotation(child))
+                result.append(("poly", poly, color))
+            elif tag == "pad":
+                drill = f(child, "drill", 0.8)
+                diameter = f(child, "diameter", 0.0) or drill * 1.6
+                x, y = f(child, "x"), f(child, "y")
+                if child.get("shape") in ("square", "octagon"):
+                    poly = PreviewRenderer._rect(x, y, diameter, diameter, PreviewRenderer._rotation(child))
+                elif child.get("shape") == "long":
+                    poly = PreviewRenderer._rect(x, y, diameter * 2, diameter, PreviewRenderer._rotation(child))
+                else:
+                    poly = PreviewRenderer._disc(x, y, diameter / 2)
+                result.append(("poly", poly, _PAD_COLOR))
+            elif tag == "wire":
+                result.append(PreviewRenderer._segment(f(child, "x1"), f(child, "y1"), f(child, "x2"),
+                                                       f(child, "y2"), f(child, "width")) + (color,))
+            elif tag == "polygon":
+                poly = [(f(v, "x"), f(v, "y")) for v in child.iter("vertex")]
+                if len(poly) >= 3:
+                    result.append(("poly", poly, color))
+            elif tag == "rectangle":
+                x1, y1, x2, y2 = f(child, "x1"), f(child, "y1"), f(child, "x2"), f(child, "y2")
+                poly = PreviewRenderer._rect((x1 + x2) / 2, (y1 + y2) / 2, abs(x2 - x1), abs(y2 - y1),
+                                             PreviewRenderer._rotation(child))
+                result.append(("poly", poly, color))
+            elif tag == "circle":
+                x, y, r, width = f(child, "x"), f(child, "y"), f(child, "radius"), f(child, "width")
+                if width == 0:
+                    result.append(("poly", PreviewRenderer._disc(x, y, r), color))
+                else:
+                    ring = PreviewRenderer._disc(x, y, r, sides=16)
+                    for (ax, ay), (bx, by) in zip(ring, ring[1:] + ring[:1]):
+                        result.append(PreviewRenderer._segment(ax, ay, bx, by, width) + (color,))
+            elif tag == "pin":
+                length = _PIN_LENGTHS.get(child.get("length", "long"), 7.62)
+                a = math.radians(PreviewRenderer._rotation(child))
+                x, y = f(child, "x"), f(child, "y")
+                result.append(PreviewRenderer._segment(x, y, x + length * math.cos(a), y + length * math.sin(a),
+                                                       0.15) + (_PIN_COLOR,))
+        return result
+
+    # ─── Raster ───
+
+    @staticmethod
+    def _line_poly(x1, y1, x2, y2, width):
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return PreviewRenderer._rect(x1, y1, width, width)
+        # Extend by half the width at both ends, like Eagle's round caps
+        ux, uy = dx / length * width / 2, dy / length * width / 2
+        nx, ny = -uy, ux
+        return [(x1 - ux + nx, y1 - uy + ny), (x2 + ux + nx, y2 + uy + ny),
+                (x2 + ux - nx, y2 + uy - ny), (x1 - ux - nx, y1 - uy - ny)]
+
+    @staticmethod
+    def _fill(pixels, width, height, poly, rgba):
+        """
+        Fill a polygon (pixel coordinates, y down) with the even‐odd rule, sampling pixel centers.
+        """
+        ys = [y for _, y in poly]
+        top = max(0, int(math.floor(min(ys))))
+        bottom = min(height - 1, int(math.ceil(max(ys))))
+        edges = list(zip(poly, poly[1:] + poly[:1]))
+        color = bytes(rgba)
+        for row in range(top, bottom + 1):
+            cy = row + 0.5
+            xs = []
+            for (ax, ay), (bx, by) in edges:
+                if (ay <= cy < by) or (by <= cy < ay):
+                    xs.append(ax + (cy - ay) * (bx - ax) / (by - ay))
+            xs.sort()
+            for left, right in zip(xs[::2], xs[1::2]):
+                start = max(0, int(math.ceil(left - 0.5)))
+                stop = min(width, int(math.ceil(right - 0.5)))
+                if stop > start:
+                    base = row * width
+                    pixels[(base + start) * 4:(base + stop) * 4] = color * (stop - start)
+
+    @staticmethod
+    def render(elem, width, height, margin=2):
+        """
+        Return the element drawn into a width × height RGBA bytearray (transparent background).
+        """
+        pixels = bytearray(width * height * 4)
+        shapes = PreviewRenderer.shapes(elem)
+        if not shapes:
+            return pixels
+
+        def points(kind, data):
+            if kind == "poly":
+                return data
+            x1, y1, x2, y2, w = data
+            return PreviewRenderer._line_poly(x1, y1, x2, y2, w)
+
+        all_points = [p for kind, data, _ in shapes for p in points(kind, data)]
+        min_x = min(x for x, _ in all_points)
+        max_x = max(x for x, _ in all_points)
+        min_y = min(y for _, y in all_points)
+        max_y = max(y for _, y in all_points)
+        span_x = max(max_x - min_x, 1e-6)
+        span_y = max(max_y - min_y, 1e-6)
+        scale = min((width - 2 * margin) / span_x, (height - 2 * margin) / span_y)
+        off_x = (width - span_x * scale) / 2
+        off_y = (height - span_y * scale) / 2
+
+        def to_px(poly):
+            return [(off_x + (x - min_x) * scale, height - off_y - (y - min_y) * scale) for x, y in poly]
+
+        # Pads on top of silkscreen/outline, whatever the document order
+        shapes.sort(key=lambda s: s[2] == _PAD_COLOR or s[2] == _LAYER_COLORS["1"])
+        for kind, data, rgba in shapes:
+            if kind == "line":
+                x1, y1, x2, y2, w = data
+                # At least one pixel wide, so thin outlines don't vanish
+                data = PreviewRenderer._line_poly(x1, y1, x2, y2, max(w, 1.0 / scale))
+            PreviewRenderer._fill(pixels, width, height, to_px(data), rgba)
+        return pixels
+
+    @staticmethod
+    def encode_png(width, height, rgba):
+        """
+        Encode a width × height RGBA bytearray as PNG bytes.
+        """
+        def chunk(tag, data):
+            return (struct.pack(">I", len(data)) + tag + data
+                    + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+        stride = width * 4
+        raw = b"".join(b"\x00" + bytes(rgba[y * stride:(y + 1) * stride]) for y in range(height))
+        return (b"\x89PNG\r\n\x1a\n"
+                + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+                + chunk(b"IDAT", zlib.compress(raw, 9))
+                + chunk(b"IEND", b""))
+
+    @staticmethod
+    def render_png(elem, width, height):
+        return PreviewRenderer.encode_png(width, height, PreviewRenderer.render(elem, width, height))
+
+
+class ThumbnailCache:
+    """
+    PNG thumbnails of <package>/<symbol> Elements, keyed by their ContentHasher hash and
+    size, so identical footprints share one thumbnail and a renamed or moved package is
+    not redrawn. Two levels:
+
+      • memory: the most recently used 'memory_items' PNGs (LRU)
+      • disk:   one file per thumbnail in 'cache_dir' (None = memory only), kept across
+                sessions; files are written atomically, so concurrent writers are harmless
+
+    thumbnail() is thread‐safe; the lock is not held while rendering.
+    """
+
+    def __init__(self, cache_dir=None, memory_items=512):
+        self.cache_dir = cache_dir
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.rendered = 0    # thumbnails drawn by this instance (neither level had them)
+
+    @staticmethod
+    def key(elem, width, height):
+        return f"{elem.tag}-{ContentHasher.element_hash(elem)}-{width}x{height}-v{RENDER_VERSION}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def get(self, key):
+        """
+        Return the PNG bytes for 'key' from memory or disk, or None.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        self._remember(key, data)
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass    # a read‐only cache directory only costs re‐rendering next session
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def thumbnail(self, elem, width, height):
+        """
+        Return (key, PNG bytes) for a <package>/<symbol> Element, rendering it only if
+        neither cache level has it yet.
+        """
+        key = self.key(elem, width, height)
+        data = self.get(key)
+        if data is None:
+            data = PreviewRenderer.render_png(elem, width, height)
+            self.rendered += 1
+            self.put(key, data)
+        return key, data
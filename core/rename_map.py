@@ -0,0 +1,40 @@
+# core/rename_map.py
+
+import csv
+
+from core.library_index import RENAME_KINDS
+
+HEADER = ["kind", "old", "new"]
+
+
+def read_rename_map(path):
+    """
+    Read a bulk rename file: CSV rows “kind,old,new” (kind: package, symbol or deviceset),
+    applied top to bottom. An optional “kind,old,new” header, empty lines and lines
+    starting with # are skipped. Returns [(kind, old, new), …]; raises RuntimeError on
+    a malformed row.
+    """
+    renames = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_no, row in enumerate(csv.reader(f), start=1):
+            if not row or not "".join(row).strip() or row[0].lstrip().startswith("#"):
+                continue
+            row = [cell.strip() for cell in row]
+            if line_no == 1 and [cell.lower() for cell in row] == HEADER:
+                continue
+            if len(row) != 3 or row[0] not in RENAME_KINDS or not row[1] or not row[2]:
+                raise RuntimeError(f"{path}:{line_no}: expected 'kind,old,new' with kind one of "
+                                   f"{', '.join(RENAME_KINDS)}, got {','.join(row)!r}")
+            renames.append(tuple(row))
+    return renames
+
+
+def write_rename_map(path, renames):
+    """
+    Write [(kind, old, new), …] in the format read_rename_map reads (e.g. the undo list
+    returned by XMLHandler.rename_many).
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(HEADER)
+        writer.writerows(renames)
@@ -0,0 +1,80 @@
+# core/sample_library.py
+
+import random
+
+_HEADER = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE eagle SYSTEM "eagle.dtd">
+<eagle version="9.6.2">
+<drawing>
+<settings><setting alwaysvectorfont="no"/></settings>
+<grid distance="0.1" unitdist="inch" unit="inch"/>
+<layers>
+<layer number="1" name="Top" color="4" fill="1" visible="yes" active="yes"/>
+<layer number="21" name="tPlace" color="7" fill="1" visible="yes" active="yes"/>
+<layer number="94" name="Symbols" color="4" fill="1" visible="yes" active="yes"/>
+</layers>
+<library>"""
+
+_SYMBOLS = """<symbols>
+<symbol name="RESISTOR">
+<wire x1="-2.54" y1="0.889" x2="2.54" y2="0.889" width="0.254" layer="94"/>
+<wire x1="-2.54" y1="-0.889" x2="2.54" y2="-0.889" width="0.254" layer="94"/>
+<pin name="1" x="-5.08" y="0" visible="off" length="short" direction="pas"/>
+<pin name="2" x="5.08" y="0" visible="off" length="short" direction="pas" rot="R180"/>
+</symbol>
+<symbol name="CAPACITOR">
+<wire x1="-0.635" y1="-1.27" x2="-0.635" y2="1.27" width="0.254" layer="94"/>
+<wire x1="0.635" y1="-1.27" x2="0.635" y2="1.27" width="0.254" layer="94"/>
+<pin name="1" x="-2.54" y="0" visible="off" length="short" direction="pas"/>
+<pin name="2" x="2.54" y="0" visible="off" length="short" direction="pas" rot="R180"/>
+</symbol>
+</symbols>"""
+
+
+def write_sample_library(path, n_packages, n_devicesets, devices_per_set=3, seed=0):
+    """
+    Write a synthetic but valid Eagle library for benchmarks: 'n_packages' two‐pad SMD
+    packages (P0000, P0001, …), RESISTOR/CAPACITOR symbols, a DEVICE_NAME template
+    deviceset and 'n_devicesets' devicesets (1K, 2K, …) with 'devices_per_set' devices each,
+    all with DESCRIPTION/LCSC_PART/VALUE. The same arguments always give the same file.
+    """
+    rng = random.Random(seed)
+    lines = [_HEADER, "<packages>"]
+    packages = [f"P{i:04d}" for i in range(n_packages)]
+    for i, name in enumerate(packages):
+        half = 0.4 + (i % 12) * 0.1
+        lines.append(
+            f'<package name="{name}"><description>Sample package {i}</description>'
+            f'<smd name="1" x="{-half:.2f}" y="0" dx="0.6" dy="0.7" layer="1"/>'
+            f'<smd name="2" x="{half:.2f}" y="0" dx="0.6" dy="0.7" layer="1"/>'
+            f'<wire x1="{-half:.2f}" y1="0.5" x2="{half:.2f}" y2="0.5" width="0.127" layer="21"/>'
+            f'</package>'
+        )
+    lines += ["</packages>", _SYMBOLS, "<devicesets>"]
+
+    def device(pkg, value, lcsc):
+        return (
+            f'<device name="{pkg}" package="{pkg}"><connects>'
+            f'<connect gate="G$1" pin="1" pad="1"/><connect gate="G$1" pin="2" pad="2"/>'
+            f'</connects><technologies><technology name="">'
+            f'<attribute name="DESCRIPTION" value="RES {value} {pkg}" constant="no"/>'
+            f'<attribute name="LCSC_PART" value="{lcsc}" constant="no"/>'
+            f'<attribute name="VALUE" value="{value}" constant="no"/>'
+            f'</technology></technologies></device>'
+        )
+
+    def deviceset(name, pkgs):
+        return (
+            f'<deviceset name="{name}" prefix="R" uservalue="yes">'
+            f'<gates><gate name="G$1" symbol="RESISTOR" x="0" y="0"/></gates><devices>'
+            + "".join(device(p, name, f"C{rng.randint(1000, 999999)}") for p in pkgs)
+            + "</devices></deviceset>"
+        )
+
+    lines.append(deviceset("DEVICE_NAME", packages[:max(1, min(len(packages), 8))]))
+    for j in range(n_devicesets):
+        lines.append(deviceset(f"{j + 1}K", rng.sample(packages, min(devices_per_set, len(packages)))))
+    lines += ["</devicesets>", "</library>", "</drawing>", "</eagle>"]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
@@ -0,0 +1,245 @@
+# core/schematic_scan.py
+
+import json
+import os
+import xml.etree.ElementTree as ET
+
+from core.compressed_io import library_name, open_library
+from core.library_index import LibraryIndex
+from core.parts_index import PartsIndex
+from core.xml_handler import XMLHandler
+
+SCHEMATIC_EXTENSIONS = (".sch", ".sch.gz", ".sch.zst")
+
+# One row per part of a schematic that has a package (supply symbols and frames have none):
+PART_COLUMNS = ("part", "library", "deviceset", "device", "technology", "value", "lcsc")
+
+# Statuses of a checked part, in report order. "ok" rows are only kept on request.
+STATUSES = ("missing", "stale", "not in library", "unknown library", "ok")
+
+
+def scan_schematic(path):
+    """
+    Stream one Eagle schematic with iterparse and return (path, parts): one tuple per
+    placed part in PART_COLUMNS order. 'lcsc' is the part's own LCSC_PART attribute if
+    it has one, else the one in the schematic's embedded copy of the library. Sheets,
+    packages and symbols are released as soon as they have been read. Runs in worker
+    processes.
+    """
+    embedded = {}       # { (library, deviceset, device) : (has package, { technology : lcsc }) }
+    parts = []
+    library = None
+    with open_library(path) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "library":
+                    library = elem.get("name", "")
+                continue
+            if elem.tag == "deviceset" and library is not None:
+                for dev in elem.iterfind("devices/device"):
+                    techs = {
+                        tech.get("name", ""): next(
+                            (a.get("value", "") for a in tech.iterfind("attribute") if a.get("name") == "LCSC_PART"), ""
+                        )
+                        for tech in dev.iterfind("technologies/technology")
+                    }
+                    embedded[(library, elem.get("name", ""), dev.get("name", ""))] = (bool(dev.get("package")), techs)
+                elem.clear()
+            elif elem.tag == "library":
+                library = None
+                elem.clear()
+            elif elem.tag == "part":
+                key = (elem.get("library", ""), elem.get("deviceset", ""), elem.get("device", ""))
+                has_package, techs = embedded.get(key, (True, {}))
+                if has_package:
+                    tech = elem.get("technology", "")
+                    override = next(
+                        (a.get("value", "") for a in elem.iterfind("attribute") if a.get("name") == "LCSC_PART"), None
+                    )
+                    lcsc = techs.get(tech, "") if override is None else override
+                    parts.append((elem.get("name", ""),) + key + (tech, elem.get("value", ""), lcsc))
+                elem.clear()
+            elif elem.tag in ("package", "symbol", "sheet"):
+                elem.clear()
+    return path, parts
+
+
+class SchematicScanner:
+    """
+    Checks the parts of Eagle schematics against the current libraries, before ordering:
+
+      scanner = SchematicScanner.for_directory("~/parts-repo")
+      report = scanner.scan(["project/"])
+      SchematicScanner.save_report(report, "lcsc-report.json")
+
+      • schematics are streamed with iterparse (scan_schematic), in a process pool when
+        there are several
+      • each part's (library, deviceset, device, technology) is resolved through the
+        library's LibraryIndex; libraries are matched by name (a part's @library is the
+        .lbr file name without extension, see compressed_io.library_name) and parsed
+        once each
+      • status per part:
+            missing          the library has no LCSC_PART for it (a gap to fill)
+            stale            the schematic carries a different (or no) LCSC_PART than the
+                             library now has: update the library in the schematic
+            not in library   the library no longer has that deviceset/device/technology
+            unknown library  not one of the scanned libraries, and no LCSC_PART in the schematic
+            ok               (kept only with keep_ok=True)
+
+    The report is a JSON‐able dict that the GUI's “Schematic Report…” opens to fill
+    the gaps of the loaded library.
+    """
+
+    def __init__(self, libraries):
+        """
+        libraries: { library name : .lbr path }; names are matched case‐insensitively.
+        """
+        self.libraries = {name.lower(): path for name, path in libraries.items()}
+        self._trees = {}
+
+    @classmethod
+    def for_paths(cls, paths):
+        return cls({library_name(p): os.path.abspath(p) for p in paths})
+
+    @classmethod
+    def for_directory(cls, root):
+        return cls.for_paths(PartsIndex.find_libraries(root))
+
+    @staticmethod
+    def find_schematics(paths):
+        """
+        Expand files and directories (searched recursively) into the .sch files they hold.
+        """
+        found = []
+        for path in paths:
+            if os.path.isdir(path):
+                for dirpath, _, filenames in os.walk(path):
+                    found.extend(
+                        os.path.abspath(os.path.join(dirpath, fn))
+                        for fn in sorted(filenames) if fn.lower().endswith(SCHEMATIC_EXTENSIONS)
+                    )
+            else:
+                found.append(os.path.abspath(path))
+        return found
+
+    def _index(self, library):
+        """
+        The LibraryIndex of the library called 'library', or None if it isn't known.
+        """
+        key = library.lower()
+        if key not in self._trees:
+            path = self.libraries.get(key)
+            self._trees[key] = None if path is None else XMLHandler.parse_library(path)
+        tree = self._trees[key]
+        return None if tree is None else LibraryIndex.for_tree(tree)
+
+    def check(self, part):
+        """
+        (status, library LCSC_PART) for one scan_schematic row.
+        """
+        _name, library, ds_name, device, tech_name, _value, sch_lcsc = part
+        index = self._index(library)
+        if index is None:
+            return ("ok" if sch_lcsc else "unknown library"), ""
+        tech = index.technology(ds_name, device, tech_name)
+        if tech is None:
+            return "not in library", ""
+        lib_lcsc = next(
+            (a.get("value", "") for a in tech.iterfind("attribute") if a.get("name") == "LCSC_PART"), ""
+        ).strip()
+        if not lib_lcsc:
+            return "missing", ""
+        if lib_lcsc != sch_lcsc.strip():
+            return "stale", lib_lcsc
+        return "ok", lib_lcsc
+
+    def scan(self, paths, workers=None, keep_ok=False):
+        """
+        Scan every schematic under 'paths'. Returns the report:
+          { "libraries": { name : path },
+            "issues":    [ { schematic, part, library, deviceset, device, technology,
+                             value, sch_lcsc, lib_lcsc, status }, … ],
+            "failed":    [ [schematic, error], … ],
+            "counts":    { status : number of parts } }
+        """
+        files = self.find_schematics(paths)
+        results, failed = [], []
+        if len(files) > 1 and workers != 1:
+            # Imported here: concurrent.futures/multiprocessing cost ~25 ms at startup
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {path: pool.submit(scan_schematic, path) for path in files}
+                for path, future in futures.items():
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        failed.append([path, str(e)])
+        else:
+            for path in files:
+                try:
+                    results.append(scan_schematic(path))
+                except Exception as e:
+                    failed.append([path, str(e)])
+
+        issues = []
+        counts = dict.fromkeys(STATUSES, 0)
+        for path, parts in results:
+            for part in parts:
+                status, lib_lcsc = self.check(part)
+                counts[status] += 1
+                if status == "ok" and not keep_ok:
+                    continue
+                row = dict(zip(PART_COLUMNS, part))
+                row["sch_lcsc"] = row.pop("lcsc")
+                row.update(schematic=path, lib_lcsc=lib_lcsc, status=status)
+                issues.append(row)
+        issues.sort(key=lambda r: (STATUSES.index(r["status"]), r["library"].lower(),
+                                   r["deviceset"], r["device"], r["technology"], r["schematic"], r["part"]))
+        return {"libraries": self.libraries, "issues": issues, "failed": failed, "counts": counts}
+
+    # ─── Report files ───
+
+    @staticmethod
+    def save_report(report, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    @staticmethod
+    def load_report(path):
+        """
+        Read a report written by save_report; raises RuntimeError if it isn't one.
+        """
+        with open(path, encoding="utf-8") as f:
+            try:
+                report = json.load(f)
+            except ValueError as e:
+                raise RuntimeError(f"Not a schematic report: {e}")
+        if not isinstance(report, dict) or "issues" not in report:
+            raise RuntimeError("Not a schematic report (no 'issues').")
+        return report
+
+    @staticmethod
+    def gaps(report, library_path):
+        """
+        The entries of a report that concern the library at 'library_path' and can be
+        fixed there ("missing" and "stale"), one per (deviceset, device, technology):
+        [ { deviceset, device, technology, value, lib_lcsc, sch_lcsc, status, parts }, … ]
+        where 'parts' lists "PART (schematic file name)". sch_lcsc is the first non‐empty
+        LCSC_PART any schematic had for it.
+        """
+        name = library_name(library_path).lower()
+        merged = {}
+        for row in report["issues"]:
+            if row["library"].lower() != name or row["status"] not in ("missing", "stale"):
+                continue
+            key = (row["deviceset"], row["device"], row["technology"])
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {
+                    "deviceset": row["deviceset"], "device": row["device"], "technology": row["technology"],
+                    "value": row["value"], "lib_lcsc": row["lib_lcsc"], "sch_lcsc": "",
+                    "status": row["status"], "parts": [],
+                }
+            entry["sch_lcsc"] = entry["sch_lcsc"] or row["sch_lcsc"].strip()
+            entry["parts"].append(f"{row['part']} ({os.path.basename(row['schematic'])})")
+        return list(merged.values())
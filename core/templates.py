@@ -0,0 +1,53 @@
+# core/templates.py
+
+from config import DEFAULT_TEMPLATE, TEMPLATE_PREFIX
+
+
+def is_template_name(name):
+    """
+    True for the names of template devicesets: DEFAULT_TEMPLATE ("DEVICE_NAME") itself and
+    anything starting with TEMPLATE_PREFIX ("TEMPLATE_LED", "TEMPLATE_SOT23", …),
+    case‐insensitively.
+    """
+    upper = (name or "").upper()
+    return upper == DEFAULT_TEMPLATE.upper() or upper.startswith(TEMPLATE_PREFIX.upper())
+
+
+class DeviceTemplate:
+    """
+    A template <deviceset>, compiled once for reuse by every create/merge:
+
+      • name:          the deviceset's name
+      • deviceset:     the <deviceset> Element itself
+      • gates:         its <gates> Element (a prototype: copy it, don't modify it), or None
+      • gate_symbols:  { gate_name : symbol_name }
+      • devices:       { package_name : <device>Element } prototypes, as XMLHandler's
+                       template_dev_map (a device is listed under @package, or @name if it
+                       has none)
+
+    Get them through LibraryIndex.template()/compiled_template(), which keep one compiled
+    copy per template until the deviceset is changed (LibraryIndex.deviceset_changed).
+    """
+
+    __slots__ = ("name", "deviceset", "gates", "gate_symbols", "devices")
+
+    def __init__(self, ds):
+        self.name = ds.get("name", "")
+        self.deviceset = ds
+        self.gates = ds.find("gates")
+        self.gate_symbols = {}
+        if self.gates is not None:
+            for gate in self.gates.findall("gate"):
+                if gate.get("name"):
+                    self.gate_symbols[gate.get("name")] = gate.get("symbol")
+        self.devices = {}
+        for dev in ds.iterfind("devices/device"):
+            pkg = dev.get("package") or dev.get("name")
+            if pkg:
+                self.devices[pkg] = dev
+
+    def symbols(self):
+        """
+        The distinct symbols of the template's gates, in gate order.
+        """
+        return list(dict.fromkeys(sym for sym in self.gate_symbols.values() if sym))
@@ -0,0 +1,91 @@
+# core/transaction.py
+
+import threading
+
+from core.library_index import LibraryIndex
+
+_local = threading.local()
+
+
+class TreeTransaction:
+    """
+    All‐or‐nothing edits of a parsed library, without copying the tree up front:
+
+        with TreeTransaction(tree):          # or XMLHandler.transaction(tree)
+            XMLHandler.add_or_merge_deviceset(tree, …)
+            ValueSeries.generate(tree, …)
+
+    If the block raises, every element changed inside it is put back as it was and the
+    exception propagates; otherwise the changes stay.
+
+      • Undo information is element‐level: the editing code calls
+        TreeTransaction.record(elem) before changing an element that may already be in the
+        tree. The first record() of an element saves a shallow snapshot: its attributes, text,
+        tail and the list of its children. Rolling back restores those snapshots in place.
+        New elements need no record(): they disappear with their parent's child list.
+      • The cost is proportional to the elements actually touched, so a batch of thousands
+        of operations can be committed or aborted as a unit.
+      • Transactions nest: an inner one that succeeds hands its snapshots to the outer one
+        (which keeps the older snapshot of elements both touched); one that fails rolls
+        back only its own changes.
+      • After a rollback the tree's LibraryIndex is invalidated (its tables may hold
+        elements that are gone again).
+
+    Transactions are per thread; record() outside of any transaction does nothing.
+    Code that edits the tree behind XMLHandler's back must call record() too, or its
+    changes survive a rollback.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.saved = {}   # { Element : (attributes, text, tail, children) before the first change }
+
+    @staticmethod
+    def _stack():
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        return stack
+
+    @staticmethod
+    def record(*elems):
+        """
+        Save the state of each element before it is changed, if a transaction is active.
+        """
+        stack = getattr(_local, "stack", None)
+        if not stack:
+            return
+        saved = stack[-1].saved
+        for elem in elems:
+            if elem is not None and elem not in saved:
+                saved[elem] = (dict(elem.attrib), elem.text, elem.tail, list(elem))
+
+    def __enter__(self):
+        self._stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stack = self._stack()
+        stack.pop()
+        if exc_type is not None:
+            self.rollback()
+        elif stack:
+            outer = stack[-1].saved
+            for elem, state in self.saved.items():
+                outer.setdefault(elem, state)
+        self.saved = {}
+        return False
+
+    def rollback(self):
+        """
+        Undo every recorded change (also usable inside the block to abort explicitly,
+        after which the transaction starts over from the restored state).
+        """
+        for elem, (attrib, text, tail, children) in self.saved.items():
+            elem.attrib.clear()
+            elem.attrib.update(attrib)
+            elem.text = text
+            elem.tail = tail
+            elem[:] = children
+        self.saved = {}
+        LibraryIndex.for_tree(self.tree).invalidate()
@@ -0,0 +1,236 @@
+# core/value_series.py
+
+import re
+from decimal import Decimal
+
+from core.library_index import LibraryIndex
+from core.transaction import TreeTransaction
+from core.xml_handler import XMLHandler
+
+
+def _computed_series(n):
+    """
+    E48/E96/E192 mantissas: 10^(i/n) rounded to three significant digits.
+    """
+    return [Decimal(str(round(10 ** (i / n), 2))) for i in range(n)]
+
+
+_E192 = _computed_series(192)
+_E192[_E192.index(Decimal("9.19"))] = Decimal("9.20")   # the one standard value that isn't rounded
+
+_E24 = [Decimal(v) for v in (
+    "1.0", "1.1", "1.2", "1.3", "1.5", "1.6", "1.8", "2.0", "2.2", "2.4", "2.7", "3.0",
+    "3.3", "3.6", "3.9", "4.3", "4.7", "5.1", "5.6", "6.2", "6.8", "7.5", "8.2", "9.1",
+)]
+
+
+class ValueSeries:
+    """
+    Bulk creation of one deviceset per standard value (E6…E192) for resistors or
+    capacitors, e.g. every E96 value from 10R to 1M in 0402/0603/0805:
+
+      tree = XMLHandler.parse_library(path)
+      ValueSeries.generate(tree, "E96", "10", "1M", ["R0402", "R0603", "R0805"],
+                           desc_template="RES {si}Ω 1% {package}")
+      XMLHandler.save_library(tree, path)
+
+    Everything happens on the in‐memory tree; the caller saves once at the end.
+
+    Values are named with the IEC 60062 “RKM” code ({value}: 4K7, 100R, 4n7, 1u) and are
+    also available in SI notation ({si}: 4.7k, 100, 4.7n, 1u). Templates may use
+    {value}, {si}, {package} and {series}.
+    """
+
+    SERIES = {
+        "E6":   _E24[::4],
+        "E12":  _E24[::2],
+        "E24":  _E24,
+        "E48":  _computed_series(48),
+        "E96":  _computed_series(96),
+        "E192": _E192,
+    }
+
+    # kind : [(RKM letter, SI prefix, multiplier), …] in ascending order; the first
+    # entry's multiplier is the smallest unit a value is expressed in.
+    UNITS = {
+        "resistor":  [("R", "", Decimal(1)), ("K", "k", Decimal(10) ** 3),
+                      ("M", "M", Decimal(10) ** 6), ("G", "G", Decimal(10) ** 9)],
+        "capacitor": [("p", "p", Decimal(10) ** -12), ("n", "n", Decimal(10) ** -9),
+                      ("u", "u", Decimal(10) ** -6), ("m", "m", Decimal(10) ** -3)],
+    }
+
+    DEFAULT_PREFIX = {"resistor": "R", "capacitor": "C"}
+
+    @staticmethod
+    def parse(text, kind="resistor"):
+        """
+        Parse a value such as "4K7", "4.7k", "100", "1M", "100n", "4u7F" or "10Ω"
+        into a Decimal in base units (ohm or farad). Raises RuntimeError if it can't.
+        """
+        units = ValueSeries.UNITS[kind]
+        s = text.strip().replace(",", ".").replace("µ", "u")
+        s = re.sub(r"(?i)(ohms?|Ω|f)$", "", s) if kind == "resistor" else re.sub(r"[Ff]$", "", s)
+        m = re.fullmatch(r"(\d*)(?:\.(\d+))?([A-Za-z])?(\d*)", s)
+        if not m or not (m.group(1) or m.group(2) or m.group(4)):
+            raise RuntimeError(f"Cannot parse value '{text}'.")
+        whole, frac, letter, tail = m.groups()
+        if frac and tail:
+            raise RuntimeError(f"Cannot parse value '{text}'.")
+
+        multiplier = Decimal(1) if kind == "resistor" else units[0][2]
+        if letter:
+            for rkm, si, mult in units:
+                if letter in (rkm, si) or (kind == "resistor" and letter.upper() == rkm):
+                    multiplier = mult
+                    break
+            else:
+                raise RuntimeError(f"Unknown unit letter '{letter}' in '{text}'.")
+        digits = f"{whole or '0'}.{frac or tail or '0'}"
+        return Decimal(digits) * multiplier
+
+    @staticmethod
+    def _split(value, kind):
+        """
+        Return (mantissa, RKM letter, SI prefix) with 1 <= mantissa < 1000 where possible.
+        """
+        units = ValueSeries.UNITS[kind]
+        chosen = units[0]
+        for unit in units:
+            if value >= unit[2]:
+                chosen = unit
+        return (value / chosen[2]).normalize(), chosen[0], chosen[1]
+
+    @staticmethod
+    def rkm(value, kind="resistor"):
+        """
+        IEC 60062 code for a value in base units: 4700 → "4K7", 100 → "100R", 4.7e‐9 → "4n7".
+        """
+        mantissa, letter, _ = ValueSeries._split(value, kind)
+        text = format(mantissa, "f")
+        if "." in text:
+            whole, frac = text.split(".")
+            return f"{'' if whole == '0' else whole}{letter}{frac}"
+        return f"{text}{letter}"
+
+    @staticmethod
+    def si(value, kind="resistor"):
+        """
+        SI notation for a value in base units: 4700 → "4.7k", 4.7e‐9 → "4.7n".
+        """
+        mantissa, _, prefix = ValueSeries._split(value, kind)
+        return f"{format(mantissa, 'f')}{prefix}"
+
+    @staticmethod
+    def values(series, start, stop):
+        """
+        Return every value of 'series' (e.g. "E24") between start and stop (Decimals in base
+        units, inclusive), in ascending order.
+        """
+        mantissas = ValueSeries.SERIES[series]
+        if start <= 0 or stop < start:
+            raise RuntimeError("The value range must be positive and ascending.")
+        exp = start.adjusted()
+        result = []
+        while True:
+            for mantissa in mantissas:
+                value = mantissa.scaleb(exp)
+                if value > stop:
+                    return result
+                if value >= start:
+                    result.append(value)
+            exp += 1
+
+    @staticmethod
+    def generate(tree, series, start, stop, pkg_names, kind="resistor",
+                 name_template="{value}", value_template="{value}",
+                 desc_template="", lcsc_template="", prefix=None,
+                 symbol_name=None, warnings=None, template=None, technologies=False):
+        """
+        Create (or merge into) one deviceset per value of 'series' between start and stop
+        (strings like "10", "4K7", "100n" or Decimals), each with a device for every package
+        in pkg_names. Templates are formatted with {value}, {si}, {package}, {series}.
+        New devicesets are created from the template deviceset called 'template' (None =
+        the default one, see LibraryIndex.template).
+
+        With technologies=True all values go into ONE deviceset, named by name_template
+        formatted with {series} only (e.g. "R_{series}" → "R_E24"), as one <technology>
+        per value (named like the value, e.g. "4K7") under each package's device — see
+        XMLHandler.set_technologies. Then (1, 0) or (0, 1) is returned.
+
+        Returns (created_count, merged_count). The tree is modified in memory only.
+        """
+        if isinstance(start, str):
+            start = ValueSeries.parse(start, kind)
+        if isinstance(stop, str):
+            stop = ValueSeries.parse(stop, kind)
+        if prefix is None:
+            prefix = ValueSeries.DEFAULT_PREFIX[kind]
+
+        if technologies:
+            return ValueSeries._generate_technologies(
+                tree, series, start, stop, pkg_names, kind, name_template, value_template,
+                desc_template, lcsc_template, prefix, symbol_name, warnings, template
+            )
+
+        template_obj = LibraryIndex.for_tree(tree).template(template)
+        template_ds = template_obj.deviceset
+        template_devs = template_obj.devices
+        ds_parent = tree.getroot().find("./drawing/library/devicesets")
+        existing = {ds.get("name", "").lower(): ds for ds in ds_parent.findall("deviceset")}
+
+        created = merged = 0
+        for value in ValueSeries.values(series, start, stop):
+            fields = {"value": ValueSeries.rkm(value, kind), "si": ValueSeries.si(value, kind),
+                      "series": series}
+            ds_name = name_template.format(package="", **fields)
+            valid_pkgs = {
+                pkg: {
+                    "value": value_template.format(package=pkg, **fields),
+                    "desc": desc_template.format(package=pkg, **fields),
+                    "lcsc": lcsc_template.format(package=pkg, **fields),
+                }
+                for pkg in pkg_names
+            }
+
+            ds = existing.get(ds_name.lower())
+            if ds is not None:
+                XMLHandler.merge_into_deviceset(
+                    ds, list(pkg_names), valid_pkgs, tree,
+                    template_dev_map=template_devs, symbol_name=symbol_name, warnings=warnings
+                )
+                merged += 1
+            else:
+                ds = XMLHandler.create_new_deviceset(
+                    tree, template_ds, ds_name, list(pkg_names), valid_pkgs,
+                    symbol_name=symbol_name, warnings=warnings
+                )
+                existing[ds_name.lower()] = ds
+                created += 1
+            TreeTransaction.record(ds)
+            ds.set("prefix", prefix)
+            ds.set("uservalue", "yes")
+
+        return created, merged
+
+    @staticmethod
+    def _generate_technologies(tree, series, start, stop, pkg_names, kind, name_template,
+                               value_template, desc_template, lcsc_template, prefix,
+                               symbol_name, warnings, template):
+        ds_name = name_template.format(value="", si="", package="", series=series).strip()
+        if not ds_name:
+            raise RuntimeError("Values as technologies need a deviceset name, e.g. 'R_{series}'.")
+        existed = LibraryIndex.for_tree(tree).deviceset(ds_name) is not None
+
+        rows = []
+        for value in ValueSeries.values(series, start, stop):
+            fields = {"value": ValueSeries.rkm(value, kind), "si": ValueSeries.si(value, kind),
+                      "series": series}
+            for pkg in pkg_names:
+                rows.append((pkg, fields["value"], {
+                    "value": value_template.format(package=pkg, **fields),
+                    "desc": desc_template.format(package=pkg, **fields),
+                    "lcsc": lcsc_template.format(package=pkg, **fields),
+                }))
+        XMLHandler.set_technologies(tree, ds_name, prefix, rows, symbol_name=symbol_name,
+                                    warnings=warnings, template=template)
+        return (0, 1) if existed else (1, 0)
@@ -0,0 +1,920 @@
+# core/xml_handler.py
+
+import xml.etree.ElementTree as ET
+import bisect
+import copy
+
+from config import SORT_DEVICESETS, XML_INDENT
+from core.canonical_xml import CanonicalWriter
+from core.compressed_io import open_library
+from core.connect_synth import ConnectSynthesizer
+from core.library_index import REFERENCES, RENAME_KINDS, LibraryIndex, natural_key
+from core.transaction import TreeTransaction
+
+class XMLHandler:
+    """
+    Helpers for reading and writing Eagle‐style library XML (.lbr/.xml), such that:
+
+      • Whenever you add a <device> for package “X”, we scan the entire library
+        (all devicesets) for any existing <device> whose @package or @name equals “X”.
+        Of those, we deep‐copy the one whose <connects> block best fits the target
+        deviceset's gates and symbol pins into the new deviceset. That way every resistor,
+        inductor, capacitor, etc. keeps the exact same pin‐to‐pad wiring the library
+        originally defined.
+
+      • If no existing <device> is found anywhere for package “X”, or none of them has
+        <connects> compatible with the target gates, we create a brand‐new <device> and
+        generate its <connects> by matching symbol pins to package pads (ConnectSynthesizer).
+        If that fails too, the device has no <connects> (you can always hand‐edit it later).
+        Such cases are reported through the optional 'warnings' list.
+
+      • All calls to create/merge will also write (or update) the <attribute name="DESCRIPTION">,
+        <attribute name="LCSC_PART">, and <attribute name="VALUE"> tags under each <technology>.
+
+    Usage is simply:
+      • Load the library:                       tree = XMLHandler.parse_library(path)
+      • Modify (create or merge devicesets)
+      • Save the library:                       XMLHandler.save_library(tree, path)
+    """
+
+    @staticmethod
+    def parse_library(path):
+        """
+        Parse an Eagle .lbr/.xml file from the given filesystem path and return its ElementTree.
+        .lbr.gz/.lbr.zst files are decompressed while parsing (core/compressed_io.py).
+        """
+        with open_library(path) as f:
+            return ET.parse(f)
+
+    @staticmethod
+    def save_library(tree, path, indent=XML_INDENT, sort_devicesets=SORT_DEVICESETS, compression=None):
+        """
+        Overwrite the original file with our modified tree, in canonical form (XML
+        declaration, DOCTYPE, fixed attribute order, one element per line; see
+        core/canonical_xml.py), so saving after a small edit gives a small diff.
+        A .gz/.zst path is written compressed ('compression' overrides the suffix).
+        """
+        CanonicalWriter(indent, sort_devicesets).write_tree(tree, path, compression)
+
+    @staticmethod
+    def transaction(tree):
+        """
+        with XMLHandler.transaction(tree): … — the edits inside the block are undone if it
+        raises (element‐level snapshots, see core/transaction.py), so a failing merge never
+        leaves a half‐modified tree behind.
+        """
+        return TreeTransaction(tree)
+
+    @staticmethod
+    def insert_deviceset(tree, ds_parent, ds):
+        """
+        Add a new <deviceset> to <devicesets>: appended, or with config.SORT_DEVICESETS at
+        its natural‐order place, found by bisecting the <deviceset> children themselves
+        (in natural order once the library was saved sorted; duplicate names included).
+        """
+        TreeTransaction.record(ds_parent)
+        if SORT_DEVICESETS:
+            position = bisect.bisect_left(
+                ds_parent, LibraryIndex.sort_key(ds.get("name", "")),
+                key=lambda child: LibraryIndex.sort_key(child.get("name", "")),
+            )
+            ds_parent.insert(position, ds)
+        else:
+            ds_parent.append(ds)
+
+    @staticmethod
+    def list_packages(tree):
+        """
+        Return all <package name="..."> under <drawing><library><packages> in natural order
+        (R0402 < R0603 < R1206, P2 < P10). If <packages> is missing, returns an empty list.
+        The list is the tree's maintained LibraryIndex.sorted_names: don't modify it.
+        """
+        return LibraryIndex.for_tree(tree).sorted_names("package")
+
+    @staticmethod
+    def list_symbols(tree):
+        """
+        Return all <symbol name="..."> under <drawing><library><symbols> in natural order.
+        If <symbols> is missing, returns an empty list.
+        The list is the tree's maintained LibraryIndex.sorted_names: don't modify it.
+        """
+        return LibraryIndex.for_tree(tree).sorted_names("symbol")
+
+    @staticmethod
+    def find_template_deviceset(tree, name=None):
+        """
+        Return the template <deviceset> called 'name', or for name=None the default one:
+        <deviceset name="DEVICE_NAME"> (config.DEFAULT_TEMPLATE), else the first TEMPLATE_…
+        deviceset, else the very first <deviceset>. See LibraryIndex.template().
+        Raises RuntimeError if <devicesets>, any <deviceset> or the named template is missing.
+        (You can still pass None for template_ds if you choose to skip using a template.)
+        """
+        return LibraryIndex.for_tree(tree).template(name).deviceset
+
+    @staticmethod
+    def extract_template_devices(template_ds):
+        """
+        Given a <deviceset> Element, collect all its <device> children into a dict:
+          { package_name : <device>Element }
+        The values are the template's own <device> Elements, used as read‐only prototypes:
+        merge/create clone them once per device they actually append (see _clone_device),
+        so don't modify them. If <devices> is missing, returns an empty dict.
+        For a deviceset of a loaded tree, LibraryIndex.template(…).devices is the same map,
+        built once and kept.
+        """
+        result = {}
+        devs_parent = template_ds.find("devices")
+        if devs_parent is None:
+            return result
+        for dev in devs_parent.findall("device"):
+            pkg = dev.get("package") or dev.get("name")
+            if pkg:
+                result[pkg] = dev
+        return result
+
+    @staticmethod
+    def get_existing_deviceset(tree, name):
+        """
+        Return the <deviceset> element whose @name matches 'name' case‐insensitively,
+        or None if none found. Searches under <drawing><library><devicesets> (through the
+        tree's LibraryIndex, so repeated lookups don't rescan).
+        """
+        return LibraryIndex.for_tree(tree).deviceset(name)
+
+    @staticmethod
+    def gate_symbol_map(gates_parent):
+        """
+        Return { gate_name : symbol_name } for the <gate> children of a <gates> Element
+        (empty dict if gates_parent is None).
+        """
+        if gates_parent is None:
+            return {}
+        return {
+            gate.get("name"): gate.get("symbol")
+            for gate in gates_parent.findall("gate")
+            if gate.get("name")
+        }
+
+    @staticmethod
+    def _score_connects(dev, gate_symbols, index):
+        """
+        Compare a <device>'s <connect gate=".." pin=".."> set against the target gates.
+
+        Returns the number of distinct (gate, pin) pairs the device wires up, or None if
+        any connect refers to a gate the target doesn't have, or to a pin that the gate's
+        symbol doesn't have (i.e. cloning it would produce a broken netlist). A device
+        without connects is no match either when the gates have pins and its package has
+        pads: its clone would be just as unwired.
+        """
+        pairs = set()
+        for conn in dev.iterfind("connects/connect"):
+            gate_name = conn.get("gate")
+            pin_name = conn.get("pin")
+            if gate_name not in gate_symbols:
+                return None
+            pins = index.symbol_pins(gate_symbols[gate_name])
+            if pins is None or pin_name not in pins:
+                return None
+            pairs.add((gate_name, pin_name))
+        if not pairs and index.package_pads(dev.get("package")) and any(
+            index.symbol_pins(sym) for sym in gate_symbols.values()
+        ):
+            return None
+        return len(pairs)
+
+    @staticmethod
+    def _find_best_device_with_package(tree, pkg_name, gate_symbols, preferred=None):
+        """
+        Search ​the entire library​ for a <device> whose @package or @name equals pkg_name
+        and whose <connects> fit the target gates { gate_name : symbol_name } (see _score_connects).
+
+        Candidates come from the shared LibraryIndex (one per distinct wiring); 'preferred'
+        (e.g. the template's device for that package) is considered first and wins ties.
+        Among compatible candidates the one wiring up the most symbol pins is chosen.
+
+        Returns (device, rejected):
+          - device:   the best compatible <device> itself (a prototype: clone it, don't modify it), or None
+          - rejected: True if candidates existed but none of them were compatible
+        """
+        index = LibraryIndex.for_tree(tree)
+        candidates = index.device_variants(pkg_name)
+        if preferred is not None:
+            candidates = [preferred] + candidates
+
+        best = None
+        best_score = -1
+        for dev in candidates:
+            score = XMLHandler._score_connects(dev, gate_symbols, index)
+            if score is not None and score > best_score:
+                best, best_score = dev, score
+
+        if best is None:
+            return None, bool(candidates)
+        return best, False
+
+    @staticmethod
+    def _copy(elem):
+        """
+        Deep copy of an Element subtree. Calls the C accelerator's __deepcopy__ directly,
+        which skips copy.deepcopy's memo bookkeeping (about a third of the cost for the
+        small subtrees cloned here).
+        """
+        try:
+            return elem.__deepcopy__({})
+        except AttributeError:
+            return copy.deepcopy(elem)
+
+    @staticmethod
+    def _shell(elem, **overrides):
+        """
+        New childless Element with elem's tag, a copy of its attributes (plus overrides)
+        and its text/tail (so the file's indentation is kept).
+        """
+        new = ET.Element(elem.tag, elem.attrib)
+        for key, val in overrides.items():
+            new.set(key, val)
+        new.text = elem.text
+        new.tail = elem.tail
+        return new
+
+    @staticmethod
+    def _tech_attributes(vals):
+        """
+        The <attribute>s written under a device's first <technology>, from a valid_pkgs entry.
+        """
+        return {
+            "DESCRIPTION": vals.get("desc", ""),
+            "LCSC_PART": vals.get("lcsc", ""),
+            "VALUE": vals.get("value", ""),
+        }
+
+    @staticmethod
+    def _clone_device(proto, pkg_name, attributes):
+        """
+        One specialized copy of a prototype <device> for appending as pkg_name:
+          • @name/@package are set on the copy's shell directly
+          • the first <technology> is rebuilt with 'attributes' written in the same pass
+            (existing <attribute>s keep their position; missing ones are appended)
+          • everything else (<connects>, other technologies, …) is deep‐copied once
+        The prototype itself is never modified.
+        """
+        dev = XMLHandler._shell(proto, name=pkg_name, package=pkg_name)
+        has_techs = False
+        for child in proto:
+            if child.tag != "technologies" or has_techs:
+                dev.append(XMLHandler._copy(child))
+                continue
+            has_techs = True
+            new_techs = XMLHandler._shell(child)
+            first_done = False
+            for tech in child:
+                if tech.tag != "technology" or first_done:
+                    new_techs.append(XMLHandler._copy(tech))
+                    continue
+                first_done = True
+                new_techs.append(XMLHandler._specialized_technology(tech, attributes))
+            if not first_done:
+                XMLHandler._write_technology(new_techs, attributes)
+            dev.append(new_techs)
+        if not has_techs:
+            XMLHandler._write_technology(ET.SubElement(dev, "technologies"), attributes)
+        return dev
+
+    @staticmethod
+    def _specialized_technology(proto, attributes, name=None):
+        """
+        Copy of a prototype <technology> with 'attributes' ({ name : value }) written in the
+        same pass (existing <attribute>s keep their position; missing ones are appended),
+        renamed to 'name' unless that is None. The prototype is not modified.
+        """
+        new_tech = XMLHandler._shell(proto) if name is None else XMLHandler._shell(proto, name=name)
+        pending = dict(attributes)
+        for attr in proto:
+            if attr.tag == "attribute" and attr.get("name") in pending:
+                new_tech.append(XMLHandler._shell(attr, value=pending.pop(attr.get("name"))))
+            else:
+                new_tech.append(XMLHandler._copy(attr))
+        for attr_name, value in pending.items():
+            ET.SubElement(new_tech, "attribute", {"name": attr_name, "value": value, "constant": "no"})
+        return new_tech
+
+    @staticmethod
+    def _write_technology(tech_parent, attributes):
+        """
+        Append a new <technology> with the given { name : value } <attribute>s to <technologies>.
+        """
+        TreeTransaction.record(tech_parent)
+        tech = ET.SubElement(tech_parent, "technology")
+        for name, value in attributes.items():
+            XMLHandler._set_or_update_attribute(tech, name, value)
+
+    @staticmethod
+    def _new_device_for_package(tree, pkg_name, gates_parent, attributes, preferred=None, warnings=None):
+        """
+        Build the <device name=pkg_name package=pkg_name> to append to a deviceset whose
+        gates are 'gates_parent', with 'attributes' ({ name : value }) under its first <technology>:
+
+          • clone the best compatible existing device (see _find_best_device_with_package), or
+          • create a blank <device> and generate its <connects> with ConnectSynthesizer, or
+          • leave it without <connects> if neither works.
+
+        Generated or missing <connects> are reported through 'warnings' (if given), except
+        for exact pin/pad name matches. Connects guessed by numeric order are listed pin by
+        pin in the warning; without a 'warnings' list to report them in, they are not
+        generated at all.
+        """
+        gate_symbols = XMLHandler.gate_symbol_map(gates_parent)
+        dev, rejected = XMLHandler._find_best_device_with_package(
+            tree, pkg_name, gate_symbols, preferred=preferred
+        )
+        if dev is not None:
+            # The clone's <connects> are a copy of the prototype's, preserved exactly.
+            return XMLHandler._clone_device(dev, pkg_name, attributes)
+
+        dev = ET.Element("device", {"name": pkg_name, "package": pkg_name})
+        plan = ConnectSynthesizer.plan(tree, gate_symbols, pkg_name) if gate_symbols else None
+        if plan is not None and plan[0] in ConnectSynthesizer.GUESSED and warnings is None:
+            plan = None    # nobody would be told to check the guess
+        if plan is not None:
+            strategy, triples = plan
+            connects = ET.SubElement(dev, "connects")
+            for gate_name, pin_name, pad_name in triples:
+                ET.SubElement(connects, "connect", {"gate": gate_name, "pin": pin_name, "pad": pad_name})
+            if strategy in ConnectSynthesizer.GUESSED:
+                pairs = ", ".join(f"{pin}→{pad}" for _gate, pin, pad in triples)
+                warnings.append(
+                    f"{pkg_name}: pin names don't match the pads; <connects> guessed by {strategy} "
+                    f"({pairs}). Check them against the datasheet."
+                )
+            elif strategy != "exact name" and warnings is not None:
+                warnings.append(f"{pkg_name}: generated <connects> by {strategy}; please verify.")
+        elif (rejected or gate_symbols) and warnings is not None:
+            warnings.append(
+                f"{pkg_name}: no existing device has <connects> matching the deviceset's "
+                f"gates/symbol pins and none could be generated; added without <connects>."
+            )
+        XMLHandler._write_technology(ET.SubElement(dev, "technologies"), attributes)
+        return dev
+
+    @staticmethod
+    def merge_into_deviceset(existing_ds, pkg_names, valid_pkgs, tree, template_dev_map=None, symbol_name=None,
+                             warnings=None):
+        """
+        Merge (add or update) the list of package names (pkg_names) into an existing <deviceset>.
+
+        Arguments:
+          - existing_ds:       the <deviceset> Element to modify
+          - pkg_names:         list of footprint names (strings) chosen by the user
+          - valid_pkgs:        dict { pkg_name: { "value": "...", "desc": "...", "lcsc": "..." } }
+          - tree:              the entire ElementTree of the library (required to find existing connects)
+          - template_dev_map:  optional dict { pkg_name: <device>Element } if you want to copy from a single “template” deviceset
+                               (pass None if you don’t have a template)
+          - symbol_name:       if provided, overrides <gate>@symbol inside <gates>
+          - warnings:          optional list; a message is appended for every new device whose <connects>
+                               had to be generated or left out (see _new_device_for_package)
+
+        Returns:
+          (updated_count, added_count)
+            updated_count = number of existing <device> nodes that got updated (only attributes changed)
+            added_count   = number of brand‐new <device> nodes appended
+        """
+        if tree is None:
+            raise RuntimeError("You must pass the full library tree to merge_into_deviceset().")
+
+        updated_count = 0
+        added_count = 0
+
+        # 1) If symbol_name is provided, update all <gate> elements under <gates>
+        if symbol_name:
+            gates_parent = existing_ds.find("gates")
+            if gates_parent is not None:
+                for gate in gates_parent.findall("gate"):
+                    TreeTransaction.record(gate)
+                    gate.set("symbol", symbol_name)
+
+        # 2) Ensure a <devices> container exists
+        devs_parent = existing_ds.find("devices")
+        if devs_parent is None:
+            TreeTransaction.record(existing_ds)
+            devs_parent = ET.SubElement(existing_ds, "devices")
+
+        # 3) Build a quick map of existing <device name="..."> in this deviceset
+        existing_map = {
+            dev.get("name"): dev
+            for dev in devs_parent.findall("device")
+            if dev.get("name")
+        }
+
+        # 4) For each pkg_name the user wants to add/update:
+        for pkg_name in pkg_names:
+            vals = valid_pkgs.get(pkg_name, {})
+            desc = vals.get("desc", "")
+            lcsc = vals.get("lcsc", "")
+            value = vals.get("value", "")
+
+            # 4a) If a <device name="pkg_name"> already exists in this deviceset, update attributes
+            if pkg_name in existing_map:
+                dev_node = existing_map[pkg_name]
+
+                # ● We do NOT touch <connects> here—whatever was already on that node remains intact.
+
+                # Ensure <technologies><technology> exists
+                tech_parent = dev_node.find("technologies")
+                if tech_parent is None:
+                    TreeTransaction.record(dev_node)
+                    tech_parent = ET.SubElement(dev_node, "technologies")
+                tech = tech_parent.find("technology")
+                if tech is None:
+                    TreeTransaction.record(tech_parent)
+                    tech = ET.SubElement(tech_parent, "technology")
+
+                # Update the three <attribute> tags
+                XMLHandler._set_or_update_attribute(tech, "DESCRIPTION", desc)
+                XMLHandler._set_or_update_attribute(tech, "LCSC_PART", lcsc)
+                XMLHandler._set_or_update_attribute(tech, "VALUE", value)
+
+                updated_count += 1
+                continue
+
+            # 4b) Otherwise, we need to append a new <device> for pkg_name, copying the <connects>
+            #     of the best‐matching existing device (preferring the template's device for that
+            #     package if you provided a template map), or generating them from pin/pad names.
+            preferred = template_dev_map.get(pkg_name) if template_dev_map else None
+            new_dev = XMLHandler._new_device_for_package(
+                tree, pkg_name, existing_ds.find("gates"), XMLHandler._tech_attributes(vals),
+                preferred=preferred, warnings=warnings
+            )
+
+            # 5) Append the new device (DESCRIPTION/LCSC_PART/VALUE already written) to <devices>
+            TreeTransaction.record(devs_parent)
+            devs_parent.append(new_dev)
+            LibraryIndex.for_tree(tree).add_device(new_dev)
+            added_count += 1
+
+        # Recompile it on next use if this deviceset is itself a template
+        LibraryIndex.for_tree(tree).deviceset_changed(existing_ds)
+        return updated_count, added_count
+
+
+    @staticmethod
+    def _require_elements(tree, symbol_name, pkg_names):
+        """
+        Raise RuntimeError if the <symbol> 'symbol_name' (unless None) or any of the
+        <package>s 'pkg_names' isn't in the library: a deviceset referring to it would be
+        broken, so the edit fails (and its transaction rolls back) instead.
+        """
+        index = LibraryIndex.for_tree(tree)
+        if symbol_name and index.symbol_pins(symbol_name) is None:
+            raise RuntimeError(f"Unknown symbol '{symbol_name}'.")
+        missing = [pkg for pkg in pkg_names if index.package_pads(pkg) is None]
+        if missing:
+            raise RuntimeError(f"Unknown package(s): {', '.join(missing)}.")
+
+    @staticmethod
+    def create_new_deviceset(tree, template_ds, new_name, pkg_names, valid_pkgs, symbol_name=None,
+                             warnings=None):
+        """
+        Create a brand‐new <deviceset> under <drawing><library><devicesets> with the given name.
+
+        Arguments:
+          - tree:          the ElementTree of the library
+          - template_ds:   a “template” <deviceset> to copy gates or devices from (optional; can be None)
+          - new_name:      the new deviceset name (string)
+          - pkg_names:     list of package strings to add
+          - valid_pkgs:    dict { pkg_name: { desc, lcsc, value } }
+          - symbol_name:   if provided, overrides <gate>@symbol under <gates>
+          - warnings:      optional list; receives a message for every device whose <connects> had to be
+                           generated or left out (see _new_device_for_package)
+
+        Behavior:
+          1) Creates <deviceset name="new_name"/>.
+          2) Copies <gates> from template_ds if provided (and applies symbol_name if not None).
+          3) For each pkg_name, tries to copy an existing device (by searching entire library) whose <connects>
+             fit the new gates/symbol pins. If found, clones it (including <connects>). If not, makes a
+             new <device> whose <connects> are generated from pin/pad names where possible.
+          4) Always writes DESCRIPTION, LCSC_PART, and VALUE under each <device>.
+
+        Raises RuntimeError if symbol_name or one of pkg_names isn't in the library.
+        """
+        XMLHandler._require_elements(tree, symbol_name, pkg_names)
+        root = tree.getroot()
+        ds_parent = root.find("./drawing/library/devicesets")
+        if ds_parent is None:
+            # If <devicesets> doesn’t exist, create it under <library>
+            lib_node = root.find("./drawing/library")
+            if lib_node is None:
+                raise RuntimeError("Cannot find <library> to attach <devicesets>.")
+            TreeTransaction.record(lib_node)
+            ds_parent = ET.SubElement(lib_node, "devicesets")
+
+        # 1) Create the new <deviceset>
+        new_ds = ET.Element("deviceset", name=new_name)
+        XMLHandler.insert_deviceset(tree, ds_parent, new_ds)
+        # Caller must set new_ds.set("prefix", ...) and new_ds.set("uservalue", "yes").
+
+        # 2) Copy <gates> from template_ds if given (compiled once per template, see LibraryIndex)
+        index = LibraryIndex.for_tree(tree)
+        template = index.compiled_template(template_ds) if template_ds is not None else None
+        if template is not None:
+            if template.gates is not None:
+                new_gates = XMLHandler._copy(template.gates)
+                if symbol_name is not None:
+                    for gate in new_gates.findall("gate"):
+                        gate.set("symbol", symbol_name)
+                new_ds.append(new_gates)
+        else:
+            # No template: user can insert a <gates> block manually later if needed.
+            pass
+
+        # 3) Create empty <devices> container
+        new_devs_parent = ET.SubElement(new_ds, "devices")
+
+        # 4) The template's package → device prototypes
+        template_map = template.devices if template is not None else {}
+
+        # 5) For each pkg_name, try to copy an existing device anywhere in the library; else new blank
+        for pkg_name in pkg_names:
+            vals = valid_pkgs.get(pkg_name, {})
+            dev_elem = XMLHandler._new_device_for_package(
+                tree, pkg_name, new_ds.find("gates"), XMLHandler._tech_attributes(vals),
+                preferred=template_map.get(pkg_name), warnings=warnings
+            )
+
+            new_devs_parent.append(dev_elem)
+            index.add_device(dev_elem)
+
+        index.deviceset_changed(new_ds)
+        return new_ds
+
+    @staticmethod
+    def add_or_merge_deviceset(tree, name, prefix, valid_pkgs, symbol_name=None, warnings=None,
+                               template=None):
+        """
+        What “Add Device” does, as one operation on the tree: merge the packages of
+        valid_pkgs ({ pkg_name: { desc, lcsc, value } }) into the deviceset called 'name'
+        if it exists (case‐insensitively), otherwise create it from the template deviceset
+        called 'template' (None = the default template, see LibraryIndex.template).
+        Sets prefix and uservalue="yes" either way. Returns the deviceset element.
+
+        Depends only on its arguments and the tree, so it can be replayed onto a fresher
+        copy of the library (see core.library_session). Raises RuntimeError if symbol_name
+        or one of the packages isn't in the library.
+        """
+        XMLHandler._require_elements(tree, symbol_name, valid_pkgs)
+        template_obj = LibraryIndex.for_tree(tree).template(template)
+        existing_ds = XMLHandler.get_existing_deviceset(tree, name)
+
+        if existing_ds is not None:
+            XMLHandler.merge_into_deviceset(
+                existing_ds, list(valid_pkgs), valid_pkgs, tree,
+                template_dev_map=template_obj.devices,
+                symbol_name=symbol_name, warnings=warnings
+            )
+            ds = existing_ds
+        else:
+            ds = XMLHandler.create_new_deviceset(
+                tree, template_obj.deviceset, name, list(valid_pkgs), valid_pkgs,
+                symbol_name=symbol_name, warnings=warnings
+            )
+        TreeTransaction.record(ds)
+        ds.set("prefix", prefix)
+        ds.set("uservalue", "yes")
+        return ds
+
+    @staticmethod
+    def set_technologies(tree, name, prefix, rows, symbol_name=None, warnings=None, template=None):
+        """
+        Store value variants as <technology> entries of one deviceset instead of one
+        deviceset per value. rows: [(pkg_name, technology_name, { value, desc, lcsc }), …]
+
+          • the deviceset 'name' is created from 'template' if it doesn't exist (see
+            add_or_merge_deviceset); prefix/uservalue/symbol_name are applied as there
+          • a package without a device gets one (cloned or with generated connects, see
+            _new_device_for_package); its first <technology> becomes the row's technology
+          • an existing (device, technology) gets its DESCRIPTION/LCSC_PART/VALUE updated,
+            a new one is added as a copy of the device's first <technology>
+
+        All rows go through one pass with (device, technology) lookups on the LibraryIndex,
+        so a whole series costs one device clone per package plus one element per value.
+        Returns (added_count, updated_count) of technologies. Raises RuntimeError if
+        symbol_name or a row's package isn't in the library.
+        """
+        XMLHandler._require_elements(tree, symbol_name, dict.fromkeys(pkg for pkg, _tech, _vals in rows))
+        index = LibraryIndex.for_tree(tree)
+        template_obj = index.template(template)
+        ds = index.deviceset(name)
+        if ds is None:
+            ds = XMLHandler.create_new_deviceset(tree, template_obj.deviceset, name, [], {},
+                                                 symbol_name=symbol_name, warnings=warnings)
+        elif symbol_name:
+            XMLHandler.merge_into_deviceset(ds, [], {}, tree, symbol_name=symbol_name)
+        TreeTransaction.record(ds)
+        ds.set("prefix", prefix)
+        ds.set("uservalue", "yes")
+
+        devs_parent = ds.find("devices")
+        if devs_parent is None:
+            devs_parent = ET.SubElement(ds, "devices")
+        TreeTransaction.record(devs_parent)
+        devices = {dev.get("name"): dev for dev in devs_parent.findall("device") if dev.get("name")}
+        techs = index.technologies(ds)
+        added = updated = 0
+
+        for pkg_name, tech_name, vals in rows:
+            attributes = XMLHandler._tech_attributes(vals)
+            tech = techs.get((pkg_name, tech_name))
+            if tech is not None:
+                for attr_name, value in attributes.items():
+                    XMLHandler._set_or_update_attribute(tech, attr_name, value)
+                updated += 1
+                continue
+
+            dev = devices.get(pkg_name)
+            if dev is None:
+                dev = XMLHandler._new_device_for_package(
+                    tree, pkg_name, ds.find("gates"), attributes,
+                    preferred=template_obj.devices.get(pkg_name), warnings=warnings
+                )
+                # The new device's first technology already carries the row's attributes
+                tech = dev.find("technologies/technology")
+                tech.set("name", tech_name)
+                # Other technologies copied from the prototype belong to its values, not ours
+                for other in dev.findall("technologies/technology")[1:]:
+                    dev.find("technologies").remove(other)
+                devs_parent.append(dev)
+                index.add_device(dev)
+                devices[pkg_name] = dev
+            else:
+                TreeTransaction.record(dev)
+                tech_parent = dev.find("technologies")
+                if tech_parent is None:
+                    tech_parent = ET.SubElement(dev, "technologies")
+                TreeTransaction.record(tech_parent)
+                proto = tech_parent.find("technology")
+                if proto is None:
+                    XMLHandler._write_technology(tech_parent, attributes)
+                    tech = tech_parent.find("technology")
+                    tech.set("name", tech_name)
+                else:
+                    tech = XMLHandler._specialized_technology(proto, attributes, name=tech_name)
+                    tech_parent.append(tech)
+            index.add_technology(ds, pkg_name, tech)
+            added += 1
+
+        return added, updated
+
+    @staticmethod
+    def technology_rows(ds):
+        """
+        [(device_name, package, technology_name, { attribute : value }), …] for every
+        <technology> of every <device> in a <deviceset>, in document order.
+        """
+        rows = []
+        for dev in ds.iterfind("devices/device"):
+            for tech in dev.iterfind("technologies/technology"):
+                attrs = {a.get("name"): a.get("value", "") for a in tech.iterfind("attribute")}
+                rows.append((dev.get("name", ""), dev.get("package", ""), tech.get("name", ""), attrs))
+        return rows
+
+    @staticmethod
+    def set_lcsc(tree, fixes):
+        """
+        Set LCSC_PART on existing technologies: fixes = [(deviceset, device, technology, lcsc), …]
+        (e.g. the gaps of a schematic report). Returns (updated_count, [not found, …]).
+        """
+        index = LibraryIndex.for_tree(tree)
+        updated, missing = 0, []
+        for ds_name, device, tech_name, lcsc in fixes:
+            tech = index.technology(ds_name, device, tech_name)
+            if tech is None:
+                missing.append(f"{ds_name}/{device or '-'}/{tech_name or '-'}")
+                continue
+            XMLHandler._set_or_update_attribute(tech, "LCSC_PART", lcsc)
+            updated += 1
+        return updated, missing
+
+    @staticmethod
+    def duplicate_groups(hashes):
+        """
+        Given { name : content hash }, return the groups of names sharing a hash (only groups
+        with two or more members). Names within a group, and the groups themselves, are in
+        natural order.
+        """
+        by_hash = {}
+        for name, digest in hashes.items():
+            by_hash.setdefault(digest, []).append(name)
+        groups = [sorted(names, key=natural_key) for names in by_hash.values() if len(names) > 1]
+        return sorted(groups, key=lambda group: natural_key(group[0]))
+
+    @staticmethod
+    def find_duplicates(tree, kind="package"):
+        """
+        Return groups of geometry‐identical <package>s (kind="package") or <symbol>s
+        (kind="symbol"), as lists of names. See ContentHasher for what counts as identical.
+        """
+        return XMLHandler.duplicate_groups(LibraryIndex.for_tree(tree).content_hashes(kind))
+
+    @staticmethod
+    def merge_duplicates(tree, kind="package", groups=None):
+        """
+        Point every reference to a duplicate at one canonical member of its group:
+        <device package="..."> for packages, <gate symbol="..."> for symbols.
+        The canonical member is the one referenced most often (ties: first in natural order).
+        The duplicates themselves are left in the library.
+
+        'groups' defaults to find_duplicates(tree, kind).
+        Returns { old_name : canonical_name } for every name that was redirected.
+        """
+        if groups is None:
+            groups = XMLHandler.find_duplicates(tree, kind)
+        path, ref_attr = REFERENCES[kind]
+        referrers = list(tree.getroot().iterfind("./drawing/library/devicesets/deviceset/" + path))
+
+        ref_counts = {}
+        for elem in referrers:
+            ref = elem.get(ref_attr)
+            ref_counts[ref] = ref_counts.get(ref, 0) + 1
+
+        mapping = {}
+        for group in groups:
+            canonical = max(group, key=lambda name: (ref_counts.get(name, 0), -group.index(name)))
+            for name in group:
+                if name != canonical:
+                    mapping[name] = canonical
+
+        changed = False
+        for elem in referrers:
+            target = mapping.get(elem.get(ref_attr))
+            if target is not None:
+                TreeTransaction.record(elem)
+                elem.set(ref_attr, target)
+                changed = True
+        if changed:
+            LibraryIndex.for_tree(tree).invalidate()
+        return mapping
+
+    @staticmethod
+    def find_unused(tree, kind="package"):
+        """
+        Names of the <package>s (kind="package") or <symbol>s (kind="symbol") that no
+        <device package="..."> / <gate symbol="..."> refers to, in natural order. Template
+        devicesets count as referrers. Uses the LibraryIndex reference table, so asking
+        again after an edit costs one lookup per name.
+        """
+        return LibraryIndex.for_tree(tree).unreferenced(kind)
+
+    @staticmethod
+    def prune_unused(tree, kind="package", names=None):
+        """
+        Remove unreferenced <package>s/<symbol>s from the library and its LibraryIndex.
+        'names' limits the removal to those names (default: every find_unused name); names
+        that are referenced by now, or gone, are skipped, so the call can be replayed onto
+        a newer version of the file. Returns the removed names.
+        """
+        index = LibraryIndex.for_tree(tree)
+        parent = tree.getroot().find(f"./drawing/library/{kind}s")
+        if parent is None:
+            return []
+        wanted = set(index.unreferenced(kind) if names is None else names)
+        removed = []
+        for elem in parent.findall(kind):
+            name = elem.get("name")
+            if name in wanted and not index.is_referenced(kind, name):
+                TreeTransaction.record(parent)
+                parent.remove(elem)
+                index.element_removed(elem)
+                removed.append(name)
+        return removed
+
+    RENAME_KINDS = RENAME_KINDS
+
+    @staticmethod
+    def rename(tree, kind, old, new):
+        """
+        Rename a <package>, <symbol> or <deviceset> and every reference to it:
+          • package:   <device package="old"> (and the device's @name where it equals the
+                       package name, as devices made by this tool are named)
+          • symbol:    <gate symbol="old">
+          • deviceset: nothing inside the library refers to it
+        The referrers come from the LibraryIndex reverse reference table, so the cost is
+        proportional to the number of references, not to the library size.
+        Raises RuntimeError if 'old' doesn't exist or 'new' is taken, ignoring case (as
+        Eagle and LibraryImporter compare names). Devicesets are looked up ignoring case.
+        Returns (references updated, the element's actual previous name).
+        """
+        if kind not in XMLHandler.RENAME_KINDS:
+            raise RuntimeError(f"Cannot rename a '{kind}' (one of {', '.join(XMLHandler.RENAME_KINDS)}).")
+        if not new or new == old:
+            raise RuntimeError(f"Invalid new name for {kind} '{old}': '{new}'.")
+        index = LibraryIndex.for_tree(tree)
+
+        if kind == "deviceset":
+            elem = index.deviceset(old)
+            if elem is None:
+                raise RuntimeError(f"Deviceset '{old}' not found.")
+            other = index.deviceset(new)
+            if other is not None and other is not elem:
+                raise RuntimeError(f"A deviceset named '{new}' already exists.")
+            old = elem.get("name")
+            TreeTransaction.record(elem)
+            elem.set("name", new)
+            index.renamed(elem, old)
+            return 0, old
+
+        elem = index.element(kind, old)
+        if elem is None:
+            raise RuntimeError(f"{kind.capitalize()} '{old}' not found.")
+        taken = [name for name in index.names_ignoring_case(kind, new) if name != old]
+        if taken:
+            raise RuntimeError(f"A {kind} named '{taken[0]}' already exists.")
+        referrers = index.referrers(kind, old)
+        attr = REFERENCES[kind][1]
+        TreeTransaction.record(elem, *referrers)
+        elem.set("name", new)
+        for ref in referrers:
+            ref.set(attr, new)
+            if kind == "package" and ref.get("name") == old:
+                ref.set("name", new)
+        index.renamed(elem, old, referrers)
+        return len(referrers), old
+
+    @staticmethod
+    def rename_many(tree, renames):
+        """
+        Apply [(kind, old, new), …] in order (see rename; a mapping file is read with
+        core/rename_map.py). Run it inside a transaction (session.apply does) so that one
+        failing rename undoes the whole batch.
+        Returns (references updated, the renames that undo the batch, in order). The undo
+        renames restore the names as they were, not as typed (“1k” renames “1K”).
+        """
+        updated = 0
+        undo = []
+        for kind, old, new in renames:
+            count, previous = XMLHandler.rename(tree, kind, old, new)
+            updated += count
+            undo.append((kind, new, previous))
+        return updated, undo[::-1]
+
+    @staticmethod
+    def validate(tree):
+        """
+        Check every deviceset for references Eagle would reject or that break the netlist:
+          • gates whose symbol doesn't exist
+          • devices whose package doesn't exist, or which have pads but no <connects>
+          • connects naming an unknown gate, a pin the gate's symbol lacks, or a missing pad
+          • technologies without a LCSC_PART value
+        Returns [(deviceset_name, message), …] in document order; empty if all is well.
+        """
+        index = LibraryIndex.for_tree(tree)
+        problems = []
+        for ds in tree.getroot().iterfind("./drawing/library/devicesets/deviceset"):
+            ds_name = ds.get("name", "")
+            gate_symbols = XMLHandler.gate_symbol_map(ds.find("gates"))
+            for gate, sym in gate_symbols.items():
+                if index.symbol_pins(sym) is None:
+                    problems.append((ds_name, f"gate {gate}: symbol '{sym}' not found"))
+
+            for dev in ds.iterfind("devices/device"):
+                label = f"device '{dev.get('name', '')}'"
+                pkg = dev.get("package")
+                pads = index.package_pads(pkg) if pkg else ()
+                if pkg and pads is None:
+                    problems.append((ds_name, f"{label}: package '{pkg}' not found"))
+                    pads = ()
+                connects = dev.findall("connects/connect")
+                if pads and not connects:
+                    problems.append((ds_name, f"{label}: no <connects>"))
+                for c in connects:
+                    gate, pin = c.get("gate"), c.get("pin")
+                    if gate not in gate_symbols:
+                        problems.append((ds_name, f"{label}: connect to unknown gate '{gate}'"))
+                        continue
+                    pins = index.symbol_pins(gate_symbols[gate])
+                    if pins is not None and pin not in pins:
+                        problems.append((ds_name, f"{label}: gate {gate} has no pin '{pin}'"))
+                    for pad in (c.get("pad") or "").split():
+                        if pad not in pads and pkg:
+                            problems.append((ds_name, f"{label}: package '{pkg}' has no pad '{pad}'"))
+                for tech in dev.iterfind("technologies/technology"):
+                    lcsc = next((a.get("value", "") for a in tech.iterfind("attribute")
+                                 if a.get("name") == "LCSC_PART"), "")
+                    if not lcsc.strip():
+                        problems.append((ds_name, f"{label}: no LCSC_PART"))
+        return problems
+
+    @staticmethod
+    def _set_or_update_attribute(tech_element, name, value):
+        """
+        In a <technology> element, find <attribute name="name">. If found, update @value.
+        Otherwise, create a new <attribute> with constant="no".
+        """
+        for attr in tech_element.findall("attribute"):
+            if attr.get("name") == name:
+                TreeTransaction.record(attr)
+                attr.set("value", value)
+                return
+        TreeTransaction.record(tech_element)
+        new_attr = ET.SubElement(tech_element, "attribute")
+        new_attr.set("name", name)
+        new_attr.set("value", value)
+        new_attr.set("constant", "no")
@@ -1,7 +1,14 @@
-import customtkinter as ctk
-from gui.app import EagleLibraryGUI
+import sys
 
 if __name__ == "__main__":
+    # Any arguments → command‐line mode (see cli.py); the GUI stack is never imported.
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main(sys.argv[1:]))
+
+    import customtkinter as ctk
+    from gui.app import EagleLibraryGUI
+
     # Optional: set a default appearance/theme
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("dark-blue")
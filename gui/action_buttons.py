@@ -3,14 +3,24 @@ from config import BUTTON_COLORS
 
 class ActionButtonsFrame(ctk.CTkFrame):
     """
-    The bottom area with two buttons:
+    The bottom area with nine buttons:
       - “Add Device” (green)
+      - “Technologies…”, “Generate Series…”, “Import…”, “Clean Up…”, “Search Libraries…”,
+        “Schematic Report…” and “Memory…” (default color)
       - “Quit” (red)
     """
 
-    def __init__(self, parent, add_command, quit_command):
+    def __init__(self, parent, add_command, technologies_command, series_command, import_command,
+                 cleanup_command, search_command, report_command, memory_command, quit_command):
         super().__init__(parent)
         self.add_command = add_command
+        self.technologies_command = technologies_command
+        self.series_command = series_command
+        self.import_command = import_command
+        self.cleanup_command = cleanup_command
+        self.search_command = search_command
+        self.report_command = report_command
+        self.memory_command = memory_command
         self.quit_command = quit_command
         self._build()
 
@@ -25,6 +35,48 @@ class ActionButtonsFrame(ctk.CTkFrame):
             hover_color=BUTTON_COLORS["add"]["hover"],
         ).pack(side="left", expand=True, padx=(0, 10))
 
+        ctk.CTkButton(
+            self,
+            text="Technologies…",
+            command=self.technologies_command,
+        ).pack(side="left", expand=True, padx=(10, 10))
+
+        ctk.CTkButton(
+            self,
+            text="Generate Series…",
+            command=self.series_command,
+        ).pack(side="left", expand=True, padx=(10, 10))
+
+        ctk.CTkButton(
+            self,
+            text="Import…",
+            command=self.import_command,
+        ).pack(side="left", expand=True, padx=(10, 10))
+
+        ctk.CTkButton(
+            self,
+            text="Clean Up…",
+            command=self.cleanup_command,
+        ).pack(side="left", expand=True, padx=(10, 10))
+
+        ctk.CTkButton(
+            self,
+            text="Search Libraries…",
+            command=self.search_command,
+        ).pack(side="left", expand=True, padx=(10, 10))
+
+        ctk.CTkButton(
+            self,
+            text="Schematic Report…",
+            command=self.report_command,
+        ).pack(side="left", expand=True, padx=(10, 10))
+
+        ctk.CTkButton(
+            self,
+            text="Memory…",
+            command=self.memory_command,
+        ).pack(side="left", expand=True, padx=(10, 10))
+
         ctk.CTkButton(
             self,
             text="Quit",
@@ -1,10 +1,17 @@
 # gui/app.py
 
+import os
 import tkinter as tk
 import customtkinter as ctk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
 
-from xml_handler import XMLHandler
+from core.xml_handler import XMLHandler
+from core.library_catalog import LibraryCatalog
+from core.library_index import LibraryIndex
+from core.library_session import LibrarySession
+from core.preview import ThumbnailCache
+from gui.package_store import PackageStore
+from gui.thumbnail_loader import ThumbnailLoader
 
 from config import (
     WINDOW_WIDTH,
@@ -14,12 +21,17 @@ from config import (
     LEFT_PANEL_HEIGHT,
     RIGHT_PANEL_WIDTH,
     RIGHT_PANEL_HEIGHT,
+    THUMBNAIL_SIZE,
+    THUMBNAIL_MEMORY_ITEMS,
+    THUMBNAIL_CACHE_DIR,
 )
 
 from gui.top_controls    import TopControlsFrame
 from gui.left_panel      import ExistingDevicesPanel
 from gui.right_panel     import PackageSelectionPanel
 from gui.action_buttons  import ActionButtonsFrame
+# The dialogs (and the core modules behind them: sqlite3, decimal, …) are imported when
+# first opened, so the main window comes up without paying for them.
 
 class EagleLibraryGUI(ctk.CTk):
     def __init__(self):
@@ -34,16 +46,24 @@ class EagleLibraryGUI(ctk.CTk):
         self.prefix_var        = tk.StringVar()
         self.value_var         = tk.StringVar()
         self.symbol_var        = tk.StringVar()
-        self.package_data      = {}    # Populated by PackageSelectionPanel
+        self.template_var      = tk.StringVar()    # template deviceset for new devicesets
+        self._symbol_list_cache = None               # ((path, mtime, size), symbol names)
+        self.package_store     = PackageStore()    # right panel: packages, selection, desc/LCSC
         self.deviceset_widgets = {}
+        # Package/symbol previews, rendered on a background thread
+        self.thumbnails = ThumbnailLoader(
+            self, ThumbnailCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_MEMORY_ITEMS), THUMBNAIL_SIZE
+        )
 
-        # Will hold the currently loaded XML tree
+        # Will hold the currently loaded XML tree and the session (lock/journal) it belongs to
         self.current_tree = None
+        self.session      = None
 
         # Build UI sections
         self._build_top_controls()
         self._build_main_frame()
         self._build_action_buttons()
+        self.symbol_var.trace_add("write", self._show_symbol_preview)
 
     def _build_top_controls(self):
         """
@@ -59,7 +79,9 @@ class EagleLibraryGUI(ctk.CTk):
             symbol_var          = self.symbol_var,
             browse_command      = self._browse_file,
             load_command        = self._load_packages,
-            symbol_list_provider= XMLHandler.list_symbols
+            symbol_list_provider= self._list_symbols_in_file,
+            template_var        = self.template_var,
+            template_command    = self._on_template_selected
         )
 
     def _build_main_frame(self):
@@ -108,15 +130,38 @@ class EagleLibraryGUI(ctk.CTk):
             sticky="w"
         )
 
+        # Bulk selection: None / Invert / In Deviceset, and select by name filter
+        bulk_frame = ctk.CTkFrame(right_container, fg_color="transparent")
+        bulk_frame.grid(row=0, column=1, columnspan=3, padx=(5, 5), pady=(0, 5), sticky="we")
+        for text, command in (
+            ("None", self.package_store.select_none),
+            ("Invert", self.package_store.invert_selection),
+            ("In Deviceset", self.package_store.select_present),
+        ):
+            ctk.CTkButton(bulk_frame, text=text, width=70, command=command).pack(side="left", padx=(0, 5))
+
+        # No textvariable: CTkEntry hides its placeholder when one is set
+        self.filter_regex_var = tk.BooleanVar(value=False)
+        self.filter_entry = ctk.CTkEntry(bulk_frame, placeholder_text="Filter packages…")
+        self.filter_entry.pack(side="left", fill="x", expand=True, padx=(10, 5))
+        self.filter_entry.bind("<Return>", lambda _e: self._select_matching())
+        ctk.CTkCheckBox(bulk_frame, text="Regex", width=60, variable=self.filter_regex_var).pack(
+            side="left", padx=(0, 5)
+        )
+        ctk.CTkButton(bulk_frame, text="Select Matching", width=110,
+                      command=self._select_matching).pack(side="left")
+
         # ─── SCROLLABLE PACKAGE ROWS (row=1) ───
         self.right_panel = PackageSelectionPanel(
             right_container,
             width                 = RIGHT_PANEL_WIDTH,
             height                = RIGHT_PANEL_HEIGHT,
-            package_data          = self.package_data,
-            pkg_toggle_callback   = self._on_pkg_toggle,
-            package_list_provider = XMLHandler.list_packages
+            store                 = self.package_store,
+            package_list_provider = XMLHandler.list_packages,
+            thumbnails            = self.thumbnails
         )
+        # Keep “Select All” in step with the selection, whoever changed it
+        self.package_store.subscribe(self._sync_select_all)
         self.right_panel.grid(
             row        = 1,
             column     = 0,
@@ -128,22 +173,44 @@ class EagleLibraryGUI(ctk.CTk):
 
     def _build_action_buttons(self):
         """
-        Bottom row: "Add Device" (left) and "Quit" (right).
+        Bottom row: "Add Device" (left), "Technologies…" / "Generate Series…" / "Import…" /
+        "Clean Up…" / "Search Libraries…" / "Schematic Report…" / "Memory…" (middle) and
+        "Quit" (right).
         """
         self.action_buttons = ActionButtonsFrame(
             self,
-            add_command  = self._on_add_device,
-            quit_command = self.destroy
+            add_command    = self._on_add_device,
+            technologies_command = self._on_technologies,
+            series_command = self._on_generate_series,
+            import_command = self._on_import,
+            cleanup_command = self._on_cleanup,
+            search_command = self._on_search,
+            report_command = self._on_schematic_report,
+            memory_command = self._on_memory,
+            quit_command   = self.destroy
         )
 
     def _browse_file(self):
-        fn = tk.filedialog.askopenfilename(
+        fn = filedialog.askopenfilename(
             title="Select Eagle Library",
-            filetypes=[("Eagle Library", "*.lbr"), ("XML Files", "*.xml"), ("All files", "*.*")],
+            filetypes=[("Eagle Library", "*.lbr *.lbr.gz *.lbr.zst"), ("XML Files", "*.xml"), ("All files", "*.*")],
         )
         if fn:
             self.path_var.set(fn)
 
+    def _list_symbols_in_file(self, path):
+        """
+        Symbol names for the dropdown as soon as a path is entered: only the <symbols>
+        section is parsed (located by a byte scan), not the whole library. The list is
+        kept until the file changes, so retyping or re‐browsing the same path is free.
+        """
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        if self._symbol_list_cache is None or self._symbol_list_cache[0] != key:
+            symbols = LibraryCatalog.load(path, sections=("symbols",)).list_symbols()
+            self._symbol_list_cache = (key, symbols)
+        return self._symbol_list_cache[1]
+
     def _load_packages(self):
         """
         1) Parse the selected library into self.current_tree.
@@ -153,14 +220,17 @@ class EagleLibraryGUI(ctk.CTk):
         """
         lib_path = self.path_var.get().strip()
         try:
-            tree = XMLHandler.parse_library(lib_path)
+            self.session = LibrarySession.open(lib_path)
+            tree = self.session.tree
             self.current_tree = tree
 
             # Populate left panel
             self.left_panel.load_devicesets(tree)
 
+            # Offer the library's template devicesets (default first)
+            self.top_controls.set_templates(LibraryIndex.for_tree(tree).template_names())
+
             # Populate right panel with ALL packages (empty template form)
-            self.select_all_var.set(False)
             self.right_panel.load_all_packages(tree)
 
             # Clear top fields
@@ -188,7 +258,6 @@ class EagleLibraryGUI(ctk.CTk):
             self.prefix_var.set("")
             self.value_var.set("")   # Clear value
             self.symbol_var.set("")
-            self.select_all_var.set(False)
             self.right_panel.load_packages_from_deviceset(None)
             return
 
@@ -202,7 +271,15 @@ class EagleLibraryGUI(ctk.CTk):
         prefix_attr = existing_ds.get("prefix", "")
         self.prefix_var.set(prefix_attr)
 
-        # 2) Read “Symbol” from <gates><gate symbol="…">
+        # 2) Preselect the template whose gates use the same symbols as this deviceset
+        index = LibraryIndex.for_tree(self.current_tree)
+        ds_symbols = XMLHandler.gate_symbol_map(existing_ds.find("gates"))
+        for name in index.template_names():
+            if index.template(name).gate_symbols == ds_symbols:
+                self.template_var.set(name)
+                break
+
+        # 3) Read “Symbol” from <gates><gate symbol="…">
         gates_parent = existing_ds.find("gates")
         if gates_parent is not None:
             gate = gates_parent.find("gate")
@@ -213,7 +290,7 @@ class EagleLibraryGUI(ctk.CTk):
         else:
             self.symbol_var.set("")
 
-        # 3) Read “Value” from the first <device>/<technologies>/<technology>/<attribute name="VALUE">
+        # 4) Read “Value” from the first <device>/<technologies>/<technology>/<attribute name="VALUE">
         #    We assume all devices in this deviceset share the same VALUE, so we grab the first one.
         value_str = ""
         devs_parent = existing_ds.find("devices")
@@ -228,37 +305,67 @@ class EagleLibraryGUI(ctk.CTk):
                             break
         self.value_var.set(value_str)
 
-        # 4) Now load the right panel _with all packages_, pre‐filling DESC+LCSC for the ones that exist
-        self.select_all_var.set(False)
+        # 5) Now load the right panel _with all packages_, pre‐filling DESC+LCSC for the ones that exist
         # Pass self.current_tree into the panel so it can call XMLHandler.list_packages(tree)
         self.right_panel.tree = self.current_tree
         self.right_panel.load_packages_from_deviceset(existing_ds)
 
+    def _on_template_selected(self, name):
+        """
+        A template was picked: use its symbol, which is what new devicesets get by default.
+        """
+        if self.current_tree is None or not name:
+            return
+        symbols = LibraryIndex.for_tree(self.current_tree).template(name).symbols()
+        if symbols:
+            self.symbol_var.set(symbols[0])
+
     def _toggle_select_all(self):
         """
-        When “Select All” is checked, mark every package’s checkbox
-        and enable its Description/LCSC fields. When unchecked, uncheck all.
+        When “Select All” is checked, select every package (the panel enables their
+        Description/LCSC fields); when unchecked, deselect all. One store update.
         """
-        should_select = self.select_all_var.get()
-        for pkg_name, data in self.package_data.items():
-            if data["var"].get() != should_select:
-                data["var"].set(should_select)
-                self._on_pkg_toggle(pkg_name)
+        store = self.package_store
+        store.set_selection(store.order if self.select_all_var.get() else ())
 
-    def _on_pkg_toggle(self, pkg_name):
+    def _show_symbol_preview(self, *_):
         """
-        Enable/disable the DESCRIPTION and LCSC entry whenever its checkbox toggles.
+        Show the chosen symbol's thumbnail next to the Symbol dropdown (once it is rendered).
         """
-        data = self.package_data.get(pkg_name)
-        if not data:
+        name = self.symbol_var.get()
+        self.top_controls.show_symbol_preview(None)
+        if not name or self.current_tree is None:
             return
+        sym_parent = self.current_tree.getroot().find("./drawing/library/symbols")
+        if sym_parent is None:
+            return
+        def show(photo):
+            if self.symbol_var.get() == name:    # still the chosen symbol
+                self.top_controls.show_symbol_preview(photo)
 
-        if data["var"].get():
-            data["desc_entry"].configure(state="normal")
-            data["lcsc_entry"].configure(state="normal")
-        else:
-            data["desc_entry"].configure(state="disabled")
-            data["lcsc_entry"].configure(state="disabled")
+        for sym in sym_parent.findall("symbol"):
+            if sym.get("name") == name:
+                self.thumbnails.request(sym, show)
+                return
+
+    def _select_matching(self):
+        """
+        Select the packages whose name matches the filter box (substring, or a regular
+        expression when “Regex” is checked), replacing the current selection.
+        """
+        pattern = self.filter_entry.get().strip()
+        if not pattern:
+            return
+        try:
+            self.package_store.select_matching(pattern, regex=self.filter_regex_var.get())
+        except RuntimeError as e:
+            messagebox.showerror("Filter", str(e))
+
+    def _sync_select_all(self, diff):
+        store = self.package_store
+        all_selected = bool(store.order) and len(store.selected) == len(store.order)
+        if self.select_all_var.get() != all_selected:
+            self.select_all_var.set(all_selected)
 
     def _on_add_device(self):
         """
@@ -269,7 +376,6 @@ class EagleLibraryGUI(ctk.CTk):
          4) Save and reload left panel.
          5) Clear top fields + right panel.
         """
-        lib_path   = self.path_var.get().strip()
         new_name   = self.device_name_var.get().strip()
         new_prefix = self.prefix_var.get().strip()
         new_value  = self.value_var.get().strip()
@@ -288,16 +394,16 @@ class EagleLibraryGUI(ctk.CTk):
             messagebox.showerror("Error", "You must enter a value for the device.")
             return
 
-        chosen_pkgs = [pkg for pkg, d in self.package_data.items() if d["var"].get()]
-        if not chosen_pkgs:
+        chosen_rows = self.package_store.selected_rows()
+        if not chosen_rows:
             messagebox.showerror("Error", "Select at least one package to update.")
             return
 
         valid_pkgs = {}
         skipped    = []
-        for pkg in chosen_pkgs:
-            desc = self.package_data[pkg]["desc_var"].get().strip()
-            lcsc = self.package_data[pkg]["lcsc_var"].get().strip()
+        for pkg, desc, lcsc in chosen_rows:
+            desc = desc.strip()
+            lcsc = lcsc.strip()
             if desc == "" or lcsc == "":
                 skipped.append(pkg)
             else:
@@ -311,54 +417,220 @@ class EagleLibraryGUI(ctk.CTk):
             return
 
         try:
-            tree          = self.current_tree
-            template_ds   = XMLHandler.find_template_deviceset(tree)
-            template_devs = XMLHandler.extract_template_devices(template_ds)
-            existing_ds   = XMLHandler.get_existing_deviceset(tree, new_name)
-
-            if existing_ds:
-                # Overwrite prefix/uservalue on existing <deviceset>
-                existing_ds.set("prefix", new_prefix)
-                existing_ds.set("uservalue", "yes")
-                # Merge with the given symbol_name
-                updated, added = XMLHandler.merge_into_deviceset(
-                    existing_ds,
-                    list(valid_pkgs.keys()),
-                    template_devs,
-                    valid_pkgs,
-                    symbol_name=new_symbol
-                )
-                XMLHandler.save_library(tree, lib_path)
-
-            else:
-                # Create brand‐new <deviceset> (name, prefix, uservalue="yes")
-                new_ds = XMLHandler.create_new_deviceset(
-                    tree,
-                    template_ds,
-                    new_name,
-                    list(valid_pkgs.keys()),
-                    valid_pkgs,
-                    symbol_name=new_symbol
-                )
-                new_ds.set("prefix", new_prefix)
-                new_ds.set("uservalue", "yes")
-                XMLHandler.save_library(tree, lib_path)
+            warnings = []
+            # Merge into the existing deviceset or create a new one (prefix, uservalue="yes"),
+            # journaled so it can be re‐applied if someone else saved the library meanwhile
+            self.session.apply(
+                f"Add/merge deviceset {new_name}",
+                XMLHandler.add_or_merge_deviceset,
+                new_name,
+                new_prefix,
+                valid_pkgs,
+                symbol_name=new_symbol,
+                warnings=warnings,
+                template=self.template_var.get() or None
+            )
+            if not self._save_session():
+                return
 
             # Reload left panel so changes appear immediately
-            self.left_panel.load_devicesets(tree)
+            self.left_panel.load_devicesets(self.current_tree)
+
+            # Packages whose only candidate <connects> didn't fit the chosen symbol
+            if warnings:
+                messagebox.showwarning("Check connects", "\n".join(warnings))
 
             # Clear everything
             self.device_name_var.set("")
             self.prefix_var.set("")
             self.value_var.set("")
             self.symbol_var.set("")
-            self.select_all_var.set(False)
-            for pkg, data in self.package_data.items():
-                data["var"].set(False)
-                data["desc_var"].set("")
-                data["lcsc_var"].set("")
-                data["desc_entry"].configure(state="disabled")
-                data["lcsc_entry"].configure(state="disabled")
+            self.package_store.reset_values()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add/update device:\n{e}")
+
+    def _save_session(self):
+        """
+        Save the session's changes (under the library's lock file). If another user saved
+        the library since it was loaded, our journaled changes were re‐applied onto their
+        version; say so. Returns False (after showing the error) if saving failed.
+        """
+        try:
+            replayed = self.session.save()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save library:\n{e}")
+            return False
+        self.current_tree = self.session.tree
+        self.right_panel.tree = self.current_tree
+        # The save may have added templates, or brought in a newer file
+        self.top_controls.set_templates(LibraryIndex.for_tree(self.current_tree).template_names())
+        if replayed:
+            messagebox.showinfo(
+                "Library changed on disk",
+                "Someone else saved this library after you loaded it. Your changes were "
+                "re‐applied on top of theirs:\n" + "\n".join(replayed),
+            )
+        return True
+
+    def _on_technologies(self):
+        """
+        Open the TechnologyGridDialog for the deviceset named in the top fields, with a
+        LCSC column per selected package (value variants as technologies of one deviceset).
+        """
+        if self.current_tree is None:
+            messagebox.showerror("Error", "Load a library first.")
+            return
+        ds_name = self.device_name_var.get().strip()
+        prefix  = self.prefix_var.get().strip()
+        if not ds_name:
+            messagebox.showerror("Error", "You must enter a deviceset name (new or existing).")
+            return
+        if not prefix:
+            messagebox.showerror("Error", "You must enter a prefix (e.g. R, C, U).")
+            return
+        packages = [pkg for pkg, _desc, _lcsc in self.package_store.selected_rows()]
+        if not packages:
+            messagebox.showerror("Error", "Select at least one package.")
+            return
+        from gui.technology_dialog import TechnologyGridDialog
+        TechnologyGridDialog(
+            self, self.session, ds_name, prefix,
+            self.symbol_var.get().strip(), self.template_var.get(),
+            packages, on_done=self._on_technologies_done,
+        )
+
+    def _on_technologies_done(self, added, updated, warnings):
+        if not self._save_session():
+            return
+        self.left_panel.load_devicesets(self.current_tree)
+
+        msg = f"{added} technolog{'y' if added == 1 else 'ies'} added, {updated} updated."
+        if warnings:
+            msg += "\n" + "\n".join(warnings[:5])
+        messagebox.showinfo("Technologies", msg)
+
+    def _on_generate_series(self):
+        """
+        Open the SeriesDialog (bulk E‐series devicesets) for the loaded library.
+        """
+        if self.current_tree is None:
+            messagebox.showerror("Error", "Load a library first.")
+            return
+        from gui.series_dialog import SeriesDialog
+        SeriesDialog(self, self.session, on_done=self._on_series_done)
+
+    def _on_series_done(self, created, merged, warnings):
+        """
+        Save once after the whole series was generated, then refresh the left panel.
+        """
+        if not self._save_session():
+            return
+        self.left_panel.load_devicesets(self.current_tree)
+
+        msg = f"{created} deviceset(s) created, {merged} merged."
+        if warnings:
+            msg += f"\n{len(warnings)} device(s) need their connects checked, e.g.:\n" + "\n".join(warnings[:5])
+        messagebox.showinfo("Generate Series", msg)
+
+    def _on_import(self):
+        """
+        Open the ImportDialog for the loaded library; when it finishes, save the
+        library, refresh both panels and summarize what was imported.
+        """
+        if self.current_tree is None:
+            messagebox.showerror("Error", "Load a library first.")
+            return
+        from gui.import_dialog import ImportDialog
+        ImportDialog(self, self.session, on_done=self._on_import_done)
+
+    def _on_import_done(self, report):
+        if not self._save_session():
+            return
+
+        self.left_panel.load_devicesets(self.current_tree)
+        self.right_panel.load_all_packages(self.current_tree)
+
+        lines = [f"{key.capitalize()}: {len(items)}" for key, items in report.items() if items]
+        lines += report["renamed"] + report["missing"] + report["conflict"]
+        messagebox.showinfo("Import", "\n".join(lines) or "Nothing to import.")
+
+    def _on_cleanup(self):
+        """
+        Open the CleanupDialog (unused packages/symbols, renames) for the loaded library.
+        """
+        if self.current_tree is None:
+            messagebox.showerror("Error", "Load a library first.")
+            return
+        from gui.cleanup_dialog import CleanupDialog
+        CleanupDialog(self, self.session, on_done=self._on_cleanup_done)
+
+    def _on_cleanup_done(self, message):
+        if not self._save_session():
+            return
+        self.left_panel.load_devicesets(self.current_tree)
+        self.right_panel.load_all_packages(self.current_tree)
+        messagebox.showinfo("Clean Up", message)
+
+    def _on_search(self):
+        """
+        Open the cross‐library SearchDialog, starting in the loaded library's folder.
+        """
+        lib_path = self.path_var.get().strip()
+        start_dir = os.path.dirname(lib_path) if lib_path else ""
+        from gui.search_dialog import SearchDialog
+        SearchDialog(self, start_dir, on_open=self._open_search_result)
+
+    def _on_schematic_report(self):
+        """
+        Open a schematic scan report (JSON from “eagle_editor.py scan-schematics”) in the
+        SchematicReportDialog, to fill the loaded library's LCSC gaps it lists.
+        """
+        if self.current_tree is None:
+            messagebox.showerror("Error", "Load a library first.")
+            return
+        fn = filedialog.askopenfilename(
+            title="Open Schematic Report",
+            filetypes=[("JSON", "*.json"), ("All files", "*.*")],
+        )
+        if not fn:
+            return
+        from core.schematic_scan import SchematicScanner
+        try:
+            report = SchematicScanner.load_report(fn)
+        except (OSError, RuntimeError) as e:
+            messagebox.showerror("Error", f"Failed to open report:\n{e}")
+            return
+        if not SchematicScanner.gaps(report, self.session.path):
+            messagebox.showinfo("Schematic Report", "The report lists no gaps in this library.")
+            return
+        from gui.schematic_report_dialog import SchematicReportDialog
+        SchematicReportDialog(self, self.session, report, fn, on_done=self._on_schematic_report_done)
+
+    def _on_schematic_report_done(self, updated, not_found):
+        if not self._save_session():
+            return
+        msg = f"{updated} LCSC Part#(s) set."
+        if not_found:
+            msg += "\nNo longer in the library:\n" + "\n".join(not_found[:5])
+        messagebox.showinfo("Schematic Report", msg)
+
+    def _on_memory(self):
+        """
+        Open the MemoryDialog: memory of the loaded library by section, its indexes and
+        the widgets, plus a per‐load‐mode profile of the library file.
+        """
+        from gui.memory_dialog import MemoryDialog
+        path = self.session.path if self.current_tree is not None else None
+        MemoryDialog(self, self.current_tree, path, thumbnails=self.thumbnails)
+
+    def _open_search_result(self, lib_path, ds_name):
+        """
+        Load the library a search hit lives in and select its deviceset on the left.
+        """
+        self.path_var.set(lib_path)
+        self._load_packages()
+        entry = self.left_panel.deviceset_widgets.get(ds_name)
+        if self.current_tree is not None and entry is not None:
+            entry["var"].set(True)
+            self.left_panel._on_deviceset_toggle(ds_name)
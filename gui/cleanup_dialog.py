@@ -0,0 +1,222 @@
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+
+from config import BUTTON_COLORS
+from core.library_index import LibraryIndex
+from core.xml_handler import XMLHandler
+
+class CleanupDialog(ctk.CTkToplevel):
+    """
+    Library housekeeping, in two tabs:
+
+      • Unused: one checkbox per package and per symbol no deviceset refers to
+        (XMLHandler.find_unused, answered from the library's reference index), all
+        checked to start with; “Prune Selected” removes the checked ones in one
+        transaction (XMLHandler.prune_unused)
+      • Rename: a list of (kind, old, new) renames, typed in or loaded from a mapping
+        file (core/rename_map.py); “Apply Renames” renames them together with every
+        device/gate referring to them (XMLHandler.rename_many), and “Undo Last Renames”
+        applies the reverse list
+
+    Every change is journaled through the session; on_done saves it.
+    """
+
+    KINDS = (("package", "Unused Packages"), ("symbol", "Unused Symbols"))
+
+    def __init__(self, parent, session, on_done):
+        """
+        on_done - callback(message) after a prune (the dialog closes) or a batch of
+                  renames (the dialog stays open for undo)
+        """
+        super().__init__(parent)
+        self.title("Clean Up Library")
+        self.geometry("680x540")
+        self.transient(parent)
+
+        self.session = session
+        self.on_done = on_done
+        self.vars    = {kind: {} for kind, _ in self.KINDS}    # { kind : { name : BooleanVar } }
+        self.renames = []    # [(kind, old, new), …] waiting to be applied
+        self.undo    = []    # the renames that revert the last applied batch
+
+        tabs = ctk.CTkTabview(self)
+        tabs.pack(fill="both", expand=True, padx=15, pady=(10, 5))
+        self._build_unused(tabs.add("Unused"))
+        self._build_rename(tabs.add("Rename"))
+
+        ctk.CTkButton(
+            self,
+            text="Close",
+            command=self.destroy,
+            fg_color=BUTTON_COLORS["quit"]["fg"],
+            hover_color=BUTTON_COLORS["quit"]["hover"],
+            width=100,
+        ).pack(side="right", padx=15, pady=(5, 15))
+        self.grab_set()
+
+    # ─── Unused ───
+
+    def _build_unused(self, tab):
+        columns = ctk.CTkFrame(tab)
+        columns.pack(fill="both", expand=True)
+        for c, (kind, title) in enumerate(self.KINDS):
+            names = XMLHandler.find_unused(self.session.tree, kind)
+            ctk.CTkLabel(columns, text=f"{title} ({len(names)})", font=ctk.CTkFont(weight="bold")).grid(
+                row=0, column=c, sticky="w", padx=(5, 5), pady=(0, 4)
+            )
+            frame = ctk.CTkScrollableFrame(columns)
+            frame.grid(row=1, column=c, sticky="nsew", padx=(5, 5))
+            columns.grid_columnconfigure(c, weight=1)
+            for name in names:
+                var = tk.BooleanVar(value=True)
+                ctk.CTkCheckBox(frame, text=name, variable=var).pack(anchor="w", pady=(1, 1))
+                self.vars[kind][name] = var
+        columns.grid_rowconfigure(1, weight=1)
+
+        ctk.CTkButton(
+            tab,
+            text="Prune Selected",
+            command=self._on_prune,
+            fg_color=BUTTON_COLORS["add"]["fg"],
+            hover_color=BUTTON_COLORS["add"]["hover"],
+            width=130,
+        ).pack(pady=(8, 0))
+
+    def _on_prune(self):
+        selected = {
+            kind: [name for name, var in names.items() if var.get()]
+            for kind, names in self.vars.items()
+        }
+        if not any(selected.values()):
+            messagebox.showerror("Error", "Nothing selected.", parent=self)
+            return
+        removed = {}
+        try:
+            with self.session.transaction():
+                for kind, names in selected.items():
+                    if names:
+                        removed[kind] = self.session.apply(
+                            f"Prune {len(names)} unused {kind}(s)", XMLHandler.prune_unused, kind, names
+                        )
+        except (RuntimeError, KeyError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to prune:\n{e}", parent=self)
+            return
+        self.destroy()
+        self.on_done(f"Removed {len(removed.get('package', []))} package(s) and "
+                     f"{len(removed.get('symbol', []))} symbol(s).")
+
+    # ─── Rename ───
+
+    def _build_rename(self, tab):
+        row = ctk.CTkFrame(tab)
+        row.pack(fill="x")
+        self.kind_var = tk.StringVar(value=XMLHandler.RENAME_KINDS[0])
+        self.old_var  = tk.StringVar()
+        self.new_var  = tk.StringVar()
+        ctk.CTkOptionMenu(row, values=list(XMLHandler.RENAME_KINDS), variable=self.kind_var,
+                          command=self._on_kind_changed, width=110).pack(side="left", padx=(0, 5))
+        self.old_box = ctk.CTkComboBox(row, variable=self.old_var, width=180)
+        self.old_box.pack(side="left", padx=(5, 5))
+        ctk.CTkLabel(row, text="→").pack(side="left")
+        ctk.CTkEntry(row, textvariable=self.new_var, width=180).pack(side="left", padx=(5, 5))
+        ctk.CTkButton(row, text="Add", command=self._on_add_rename, width=60).pack(side="left", padx=(5, 0))
+        self._on_kind_changed(self.kind_var.get())
+
+        self.rename_text = ctk.CTkTextbox(tab, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        self.rename_text.pack(fill="both", expand=True, pady=(8, 8))
+        self._show_renames()
+
+        buttons = ctk.CTkFrame(tab)
+        buttons.pack(fill="x")
+        ctk.CTkButton(buttons, text="Load Mapping…", command=self._on_load_map, width=120).pack(
+            side="left", padx=(0, 5)
+        )
+        ctk.CTkButton(buttons, text="Clear", command=self._on_clear_renames, width=70).pack(
+            side="left", padx=(5, 5)
+        )
+        ctk.CTkButton(
+            buttons,
+            text="Apply Renames",
+            command=self._on_apply_renames,
+            fg_color=BUTTON_COLORS["add"]["fg"],
+            hover_color=BUTTON_COLORS["add"]["hover"],
+            width=130,
+        ).pack(side="left", expand=True, padx=(5, 5))
+        self.undo_btn = ctk.CTkButton(buttons, text="Undo Last Renames", command=self._on_undo,
+                                      state="disabled", width=150)
+        self.undo_btn.pack(side="right", padx=(5, 0))
+
+    def _on_kind_changed(self, kind):
+        names = LibraryIndex.for_tree(self.session.tree).sorted_names(kind)
+        self.old_box.configure(values=list(names))
+        self.old_var.set("")
+
+    def _show_renames(self):
+        lines = [f"{kind:<10} {old}  →  {new}" for kind, old, new in self.renames]
+        self.rename_text.configure(state="normal")
+        self.rename_text.delete("1.0", "end")
+        self.rename_text.insert("1.0", "\n".join(lines) or "No renames yet: add some above or load a mapping file "
+                                                          "(CSV rows kind,old,new).")
+        self.rename_text.configure(state="disabled")
+
+    def _on_add_rename(self):
+        old, new = self.old_var.get().strip(), self.new_var.get().strip()
+        if not old or not new:
+            messagebox.showerror("Error", "Enter the old and the new name.", parent=self)
+            return
+        self.renames.append((self.kind_var.get(), old, new))
+        self.new_var.set("")
+        self._show_renames()
+
+    def _on_load_map(self):
+        fn = filedialog.askopenfilename(
+            parent=self, title="Load Rename Mapping",
+            filetypes=[("CSV", "*.csv"), ("All files", "*.*")],
+        )
+        if not fn:
+            return
+        from core.rename_map import read_rename_map
+        try:
+            self.renames += read_rename_map(fn)
+        except (OSError, RuntimeError) as e:
+            messagebox.showerror("Error", f"Failed to read mapping:\n{e}", parent=self)
+            return
+        self._show_renames()
+
+    def _on_clear_renames(self):
+        self.renames = []
+        self._show_renames()
+
+    def _apply(self, renames, label):
+        """
+        Apply a batch of renames through the session; returns the undo list, or None
+        (after showing the error) if the batch failed and was rolled back.
+        """
+        try:
+            updated, undo = self.session.apply(label, XMLHandler.rename_many, renames)
+        except (RuntimeError, KeyError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to rename (nothing was changed):\n{e}", parent=self)
+            return None
+        self.on_done(f"{label}: {updated} reference(s) updated.")
+        return undo
+
+    def _on_apply_renames(self):
+        if not self.renames:
+            messagebox.showerror("Error", "Add at least one rename.", parent=self)
+            return
+        undo = self._apply(self.renames, f"Rename {len(self.renames)} name(s)")
+        if undo is None:
+            return
+        self.undo = undo
+        self.renames = []
+        self._show_renames()
+        self._on_kind_changed(self.kind_var.get())
+        self.undo_btn.configure(state="normal")
+
+    def _on_undo(self):
+        if self._apply(self.undo, f"Undo {len(self.undo)} rename(s)") is None:
+            return
+        self.undo = []
+        self._on_kind_changed(self.kind_var.get())
+        self.undo_btn.configure(state="disabled")
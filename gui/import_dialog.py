@@ -0,0 +1,141 @@
+import os
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+
+from config import BUTTON_COLORS
+from core.library_import import LibraryImporter
+from core.xml_handler import XMLHandler
+
+class ImportDialog(ctk.CTkToplevel):
+    """
+    Modal window for importing devicesets from another library:
+      • Row 0: source library path + Browse
+      • Row 1: scrollable list of the source's devicesets, one checkbox each (+ “Select All”)
+      • Row 2: collision policy (skip / rename / replace) + Import / Cancel
+    The actual work is done by LibraryImporter.import_devicesets(); on success the
+    report is handed to on_done(report) and the dialog closes.
+    """
+
+    def __init__(self, parent, session, on_done):
+        """
+        session  - the LibrarySession of the loaded (destination) library; the import is
+                   applied (and journaled) through it
+        on_done  - callback(report) after a successful import
+        """
+        super().__init__(parent)
+        self.title("Import from Library")
+        self.geometry("460x520")
+        self.transient(parent)
+
+        self.session     = session
+        self.on_done     = on_done
+        self.src_tree    = None
+        self.src_var     = tk.StringVar()
+        self.policy_var  = tk.StringVar(value=LibraryImporter.POLICIES[0])
+        self.all_var     = tk.BooleanVar(value=False)
+        self.ds_vars     = {}    # { ds_name: BooleanVar }
+
+        self._build()
+        self.grab_set()
+
+    def _build(self):
+        # ─── Row 0: source path ───
+        top = ctk.CTkFrame(self)
+        top.pack(fill="x", padx=15, pady=(15, 5))
+        ctk.CTkLabel(top, text="Source Library:").grid(row=0, column=0, columnspan=2, sticky="w")
+        ctk.CTkEntry(top, textvariable=self.src_var, width=300).grid(
+            row=1, column=0, padx=(0, 5), pady=(5, 5), sticky="w"
+        )
+        ctk.CTkButton(top, text="Browse", command=self._browse, width=80).grid(
+            row=1, column=1, padx=(5, 0), pady=(5, 5)
+        )
+
+        # ─── Row 1: devicesets of the source ───
+        ctk.CTkCheckBox(
+            self, text="Select All", variable=self.all_var, command=self._toggle_all
+        ).pack(anchor="w", padx=20, pady=(5, 0))
+        self.ds_frame = ctk.CTkScrollableFrame(self, height=300)
+        self.ds_frame.pack(fill="both", expand=True, padx=15, pady=(5, 5))
+
+        # ─── Row 2: policy + buttons ───
+        bottom = ctk.CTkFrame(self)
+        bottom.pack(fill="x", padx=15, pady=(5, 15))
+        ctk.CTkLabel(bottom, text="On name collision:").pack(side="left", padx=(0, 5))
+        ctk.CTkOptionMenu(
+            bottom, values=list(LibraryImporter.POLICIES), variable=self.policy_var, width=100
+        ).pack(side="left")
+        ctk.CTkButton(
+            bottom,
+            text="Cancel",
+            command=self.destroy,
+            fg_color=BUTTON_COLORS["quit"]["fg"],
+            hover_color=BUTTON_COLORS["quit"]["hover"],
+            width=80,
+        ).pack(side="right", padx=(5, 0))
+        ctk.CTkButton(
+            bottom,
+            text="Import",
+            command=self._on_import,
+            fg_color=BUTTON_COLORS["add"]["fg"],
+            hover_color=BUTTON_COLORS["add"]["hover"],
+            width=80,
+        ).pack(side="right")
+
+    def _browse(self):
+        fn = filedialog.askopenfilename(
+            parent=self,
+            title="Select Library to Import From",
+            filetypes=[("Eagle Library", "*.lbr *.lbr.gz *.lbr.zst"), ("XML Files", "*.xml"), ("All files", "*.*")],
+        )
+        if fn:
+            self.src_var.set(fn)
+            self._load_source(fn)
+
+    def _load_source(self, path):
+        """
+        Parse the source library and list its devicesets.
+        """
+        for child in self.ds_frame.winfo_children():
+            child.destroy()
+        self.ds_vars.clear()
+        self.all_var.set(False)
+        self.src_tree = None
+
+        if not os.path.isfile(path):
+            return
+        try:
+            self.src_tree = XMLHandler.parse_library(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load library:\n{e}", parent=self)
+            return
+
+        for ds_name in LibraryImporter.list_devicesets(self.src_tree):
+            var = tk.BooleanVar(value=False)
+            ctk.CTkCheckBox(self.ds_frame, text=ds_name, variable=var).pack(anchor="w", pady=(1, 1))
+            self.ds_vars[ds_name] = var
+
+    def _toggle_all(self):
+        should_select = self.all_var.get()
+        for var in self.ds_vars.values():
+            var.set(should_select)
+
+    def _on_import(self):
+        if self.src_tree is None:
+            messagebox.showerror("Error", "Choose a library to import from.", parent=self)
+            return
+        chosen = [name for name, var in self.ds_vars.items() if var.get()]
+        if not chosen:
+            messagebox.showerror("Error", "Select at least one deviceset to import.", parent=self)
+            return
+        try:
+            report = self.session.apply(
+                f"Import {len(chosen)} deviceset(s) from {os.path.basename(self.src_var.get())}",
+                LibraryImporter.import_devicesets,
+                self.src_tree, ds_names=chosen, policy=self.policy_var.get()
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to import:\n{e}", parent=self)
+            return
+        self.destroy()
+        self.on_done(report)
@@ -1,7 +1,7 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
-from xml_handler import XMLHandler
+from core.xml_handler import XMLHandler
 
 class ExistingDevicesPanel(ctk.CTkScrollableFrame):
     """
@@ -0,0 +1,160 @@
+import json
+import threading
+import tracemalloc
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+
+from config import BUTTON_COLORS
+from core.library_index import LibraryIndex
+from core.memory_report import MemoryReport
+
+class MemoryDialog(ctk.CTkToplevel):
+    """
+    Memory view of the running application (see core/memory_report.py):
+
+      • “loaded”: the library as the window holds it now: <packages>/<symbols>/<devicesets>
+        with element counts and bytes per element, and the LibraryIndex tables built so far
+      • widgets: how many Tk widgets exist and how many thumbnails are kept; with allocation
+        tracing on, what gui/ and customtkinter allocated
+      • “Profile Load Modes”: loads the library file again as tree / indexed / catalog under
+        tracemalloc (in a worker thread), to compare the modes on this library
+      • “Save JSON…”: the rows shown, for “eagle_editor.py memory --compare”
+    """
+
+    def __init__(self, parent, tree, path, thumbnails=None):
+        """
+        tree       - the loaded library's ElementTree (or None)
+        path       - its file, for profiling the load modes
+        thumbnails - the application's ThumbnailLoader, if any
+        """
+        super().__init__(parent)
+        self.title("Memory Report")
+        self.geometry("820x560")
+        self.transient(parent)
+
+        self.parent     = parent
+        self.tree       = tree
+        self.path       = path
+        self.thumbnails = thumbnails
+        self.rows       = []
+        self.mode_rows  = []
+
+        self._build()
+        self._refresh()
+
+    def _build(self):
+        buttons = ctk.CTkFrame(self)
+        buttons.pack(fill="x", padx=15, pady=(15, 5))
+        ctk.CTkButton(buttons, text="Refresh", command=self._refresh, width=90).pack(side="left", padx=(0, 5))
+        self.trace_btn = ctk.CTkButton(buttons, text="", command=self._toggle_tracing, width=170)
+        self.trace_btn.pack(side="left", padx=(5, 5))
+        self.profile_btn = ctk.CTkButton(
+            buttons,
+            text="Profile Load Modes",
+            command=self._start_profile,
+            fg_color=BUTTON_COLORS["load"]["fg"],
+            hover_color=BUTTON_COLORS["load"]["hover"],
+            width=150,
+        )
+        self.profile_btn.pack(side="left", padx=(5, 5))
+        ctk.CTkButton(buttons, text="Save JSON…", command=self._save_json, width=100).pack(side="left", padx=(5, 5))
+        ctk.CTkButton(
+            buttons,
+            text="Close",
+            command=self.destroy,
+            fg_color=BUTTON_COLORS["quit"]["fg"],
+            hover_color=BUTTON_COLORS["quit"]["hover"],
+            width=80,
+        ).pack(side="right")
+
+        self.text = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        self.text.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+
+    # ─── Current state ───
+
+    def _widget_count(self):
+        count = 0
+        stack = [self.parent]
+        while stack:
+            widget = stack.pop()
+            count += 1
+            stack.extend(widget.winfo_children())
+        return count
+
+    def _refresh(self):
+        self.trace_btn.configure(text="Stop Allocation Tracing" if tracemalloc.is_tracing()
+                                 else "Start Allocation Tracing")
+        rows = []
+        if self.tree is not None:
+            rows += MemoryReport.tree_sections(self.tree, "loaded")
+            rows += MemoryReport.index_tables(LibraryIndex.for_tree(self.tree), "loaded")
+        rows.append(MemoryReport.row("loaded", "widgets", self._widget_count(), None))
+        if self.thumbnails is not None:
+            rows.append(MemoryReport.row("loaded", "thumbnails", self.thumbnails.photo_count(), None))
+        self.rows = rows
+
+        lines = []
+        rss = MemoryReport.rss_bytes()
+        if rss is not None:
+            lines.append(f"Process RSS: {MemoryReport.format_bytes(rss)}")
+        if tracemalloc.is_tracing():
+            traced, peak = tracemalloc.get_traced_memory()
+            lines.append(f"Traced: {MemoryReport.format_bytes(traced)} (peak {MemoryReport.format_bytes(peak)})")
+            for source, size, blocks in MemoryReport.allocations_by_source(tracemalloc.take_snapshot()):
+                lines.append(f"  {source:<16} {MemoryReport.format_bytes(size):>10}  {blocks} blocks")
+        else:
+            lines.append("Allocation tracing is off (start it, or run with PYTHONTRACEMALLOC=1, "
+                         "to see what gui/ and customtkinter allocate).")
+        lines += ["", MemoryReport.format_table(self.rows)]
+        if self.mode_rows:
+            lines += ["", MemoryReport.format_table(self.mode_rows)]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state="disabled")
+
+    def _toggle_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        else:
+            tracemalloc.start()
+        self._refresh()
+
+    # ─── Load modes ───
+
+    def _start_profile(self):
+        if not self.path:
+            messagebox.showerror("Error", "Load a library first.", parent=self)
+            return
+        self.profile_btn.configure(state="disabled", text="Profiling…")
+        outcome = {}
+
+        def work():
+            try:
+                outcome["rows"] = MemoryReport.profile(self.path)
+            except Exception as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        self._poll_profile(worker, outcome)
+
+    def _poll_profile(self, worker, outcome):
+        if worker.is_alive():
+            self.after(100, self._poll_profile, worker, outcome)
+            return
+        self.profile_btn.configure(state="normal", text="Profile Load Modes")
+        if "error" in outcome:
+            messagebox.showerror("Error", f"Failed to profile:\n{outcome['error']}", parent=self)
+            return
+        self.mode_rows = outcome["rows"]
+        self._refresh()
+
+    def _save_json(self):
+        fn = filedialog.asksaveasfilename(
+            parent=self, title="Save Memory Report", defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("All files", "*.*")],
+        )
+        if fn:
+            with open(fn, "w", encoding="utf-8") as f:
+                json.dump(self.rows + self.mode_rows, f, indent=2)
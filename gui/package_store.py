@@ -0,0 +1,175 @@
+import re
+from contextlib import contextmanager
+
+FIELDS = ("desc", "lcsc")
+
+
+class PackageStore:
+    """
+    The right panel's state, independent of Tk: which packages are listed (in display
+    order), which are selected, and each one's Description / LCSC Part#.
+
+      • Reads are plain Python (no Tk variable .get()), so the app can collect the chosen
+        packages without touching widgets.
+      • Every change notifies subscribers with a diff:
+            { "reset":    True if the whole list was replaced (ignore the rest),
+              "selected": set of packages whose selection changed,
+              "fields":   set of packages whose desc/lcsc changed }
+        so views update only the rows that changed.
+      • Inside “with store.batch():” notifications are merged and sent once at the end;
+        bulk operations cost O(changed rows) for the views.
+    """
+
+    def __init__(self):
+        self.order = []        # package names in display order
+        self.position = {}     # { pkg_name : index in order }
+        self.values = {}       # { pkg_name : { "desc": str, "lcsc": str } }
+        self.selected = set()
+        self.present = set()   # packages that already have a device in the shown deviceset
+        self._subscribers = []
+        self._pending = None   # diff being collected inside batch()
+        self._depth = 0
+
+    # ─── Notifications ───
+
+    def subscribe(self, callback):
+        """
+        callback(diff) after every change (or once per batch). Returns an unsubscribe function.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    @contextmanager
+    def batch(self):
+        if self._depth == 0:
+            self._pending = {"reset": False, "selected": set(), "fields": set()}
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                diff, self._pending = self._pending, None
+                if diff["reset"] or diff["selected"] or diff["fields"]:
+                    for callback in list(self._subscribers):
+                        callback(diff)
+
+    def _changed(self, key, pkgs=()):
+        with self.batch():
+            if key == "reset":
+                self._pending["reset"] = True
+            else:
+                self._pending[key].update(pkgs)
+
+    # ─── Loading ───
+
+    def load(self, pkg_names, prefill=None):
+        """
+        Replace the list with pkg_names (nothing selected). prefill: optional
+        { pkg_name : { "desc", "lcsc" } } for the packages of the deviceset being shown;
+        those are also what select_present() selects.
+        """
+        prefill = prefill or {}
+        self.order = list(pkg_names)
+        self.position = {pkg: i for i, pkg in enumerate(self.order)}
+        self.values = {
+            pkg: {field: prefill.get(pkg, {}).get(field, "") for field in FIELDS}
+            for pkg in self.order
+        }
+        self.selected = set()
+        self.present = set(prefill) & self.values.keys()
+        self._changed("reset")
+
+    def clear(self):
+        self.load([])
+
+    # ─── Selection ───
+
+    def is_selected(self, pkg):
+        return pkg in self.selected
+
+    def set_selected(self, pkg, selected=True):
+        if pkg not in self.values or (pkg in self.selected) == selected:
+            return
+        if selected:
+            self.selected.add(pkg)
+        else:
+            self.selected.discard(pkg)
+        self._changed("selected", (pkg,))
+
+    def set_selection(self, pkgs):
+        """
+        Make exactly 'pkgs' (restricted to listed packages) the selection, in one step.
+        """
+        new = set(pkgs) & self.values.keys()
+        changed = new ^ self.selected
+        if changed:
+            self.selected = new
+            self._changed("selected", changed)
+
+    # Bulk operations: each one is a single set_selection(), i.e. one notification.
+
+    def select_all(self):
+        self.set_selection(self.order)
+
+    def select_none(self):
+        self.set_selection(())
+
+    def invert_selection(self):
+        self.set_selection(self.values.keys() - self.selected)
+
+    def select_present(self):
+        """
+        Select exactly the packages that are already in the shown deviceset.
+        """
+        self.set_selection(self.present)
+
+    def select_matching(self, pattern, regex=False, add=False):
+        """
+        Select the packages whose name contains 'pattern' (case‐insensitive), or matches
+        it as a regular expression (re.search, case‐insensitive) if regex=True. With
+        add=True the matches are added to the current selection instead of replacing it.
+        Returns the number of matches; raises RuntimeError for an invalid expression.
+        """
+        if regex:
+            try:
+                matcher = re.compile(pattern, re.IGNORECASE).search
+            except re.error as e:
+                raise RuntimeError(f"Invalid regular expression: {e}")
+        else:
+            needle = pattern.lower()
+            matcher = lambda name: needle in name.lower()
+        matches = {pkg for pkg in self.order if matcher(pkg)}
+        self.set_selection(matches | self.selected if add else matches)
+        return len(matches)
+
+    # ─── Fields ───
+
+    def get(self, pkg, field):
+        return self.values[pkg][field]
+
+    def set_field(self, pkg, field, value):
+        row = self.values.get(pkg)
+        if row is None or row[field] == value:
+            return
+        row[field] = value
+        self._changed("fields", (pkg,))
+
+    def reset_values(self):
+        """
+        Deselect everything and blank all descriptions/LCSC numbers (after a save).
+        """
+        with self.batch():
+            self.set_selection(())
+            blank = [pkg for pkg, row in self.values.items() if row["desc"] or row["lcsc"]]
+            for pkg in blank:
+                self.values[pkg] = {field: "" for field in FIELDS}
+            if blank:
+                self._changed("fields", blank)
+
+    def selected_rows(self):
+        """
+        [(pkg_name, desc, lcsc), …] of the selected packages, in display order.
+        """
+        return [(pkg, self.values[pkg]["desc"], self.values[pkg]["lcsc"])
+                for pkg in sorted(self.selected, key=self.position.__getitem__)]
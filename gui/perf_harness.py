@@ -0,0 +1,256 @@
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from tkinter import messagebox
+
+from core.sample_library import write_sample_library
+
+# (packages, devicesets) of the generated libraries, smallest first
+DEFAULT_SIZES = ((50, 20), (200, 100), (1000, 400))
+
+# A slowdown counts as a regression only if it is above the tolerance AND this many ms,
+# so sub‐millisecond jitter never fails a comparison.
+NOISE_FLOOR_MS = 5.0
+
+
+def start_virtual_display():
+    """
+    On Linux/BSD without $DISPLAY, start Xvfb on a free display number and point $DISPLAY
+    at it. Returns the Xvfb process (caller terminates it), or None if a display already
+    exists (Windows, macOS, or $DISPLAY set). Raises RuntimeError if no display is possible.
+    """
+    if sys.platform.startswith(("win", "darwin")) or os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("No display available: set DISPLAY or install Xvfb.")
+    for n in range(99, 130):
+        if os.path.exists(f"/tmp/.X{n}-lock") or os.path.exists(f"/tmp/.X11-unix/X{n}"):
+            continue
+        proc = subprocess.Popen(
+            [xvfb, f":{n}", "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        for _ in range(50):
+            if proc.poll() is not None or os.path.exists(f"/tmp/.X11-unix/X{n}"):
+                break
+            time.sleep(0.1)
+        if proc.poll() is None:
+            os.environ["DISPLAY"] = f":{n}"
+            return proc
+    raise RuntimeError("Could not start Xvfb.")
+
+
+def _widget_names(widget, names):
+    """
+    Add the Tk path names of 'widget' and all its descendants to 'names'.
+    """
+    names.add(str(widget))
+    for child in widget.winfo_children():
+        _widget_names(child, names)
+    return names
+
+
+def _rss_mb():
+    """
+    Resident set size of this process in MB (Linux only; None elsewhere).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class GuiHarness:
+    """
+    Drives a real EagleLibraryGUI through the operations users repeat (load a library,
+    select a deviceset, Select All / Invert / Select Matching, Add Device) and records, per operation:
+
+      • ms        wall time until Tk has processed the resulting events and idle tasks
+                  (geometry + redraw), i.e. until the change is on screen
+      • widgets   widgets alive afterwards
+      • created   widgets created by the operation (Tk path names not seen before), which
+                  exposes rebuild‐everything regressions even when the total stays flat
+      • rss_mb    process RSS afterwards (Linux)
+      • alloc_kb  Python memory still allocated by the operation (with track_memory; note
+                  that tracemalloc itself slows everything down)
+
+    Message boxes are replaced by recorders while the harness runs, so nothing blocks.
+    """
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.results = []
+        self.messages = []
+
+    # ─── Message boxes ───
+
+    def _patch_messageboxes(self):
+        self._saved = {}
+        for name in ("showinfo", "showwarning", "showerror"):
+            self._saved[name] = getattr(messagebox, name)
+            setattr(messagebox, name, lambda title, msg, _kind=name, **kw: self.messages.append((_kind, title, msg)))
+
+    def _restore_messageboxes(self):
+        for name, func in self._saved.items():
+            setattr(messagebox, name, func)
+
+    # ─── Measuring ───
+
+    def measure(self, app, size, op, func):
+        gc.collect()
+        before_names = _widget_names(app, set())
+        if self.track_memory:
+            alloc_before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        func()
+        app.update()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        after_names = _widget_names(app, set())
+        rss = _rss_mb()
+        row = {
+            "size": size,
+            "op": op,
+            "ms": round(elapsed, 2),
+            "widgets": len(after_names),
+            "created": len(after_names - before_names),
+            "rss_mb": None if rss is None else round(rss, 1),
+        }
+        if self.track_memory:
+            row["alloc_kb"] = round((tracemalloc.get_traced_memory()[0] - alloc_before) / 1024, 1)
+        self.results.append(row)
+        return row
+
+    def run_size(self, n_packages, n_devicesets, workdir):
+        """
+        Generate one library and time the operations on a fresh application window.
+        """
+        import customtkinter as ctk
+        from gui.app import EagleLibraryGUI
+
+        size = f"{n_packages}x{n_devicesets}"
+        path = os.path.join(workdir, f"bench_{size}.lbr")
+        write_sample_library(path, n_packages, n_devicesets)
+
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("dark-blue")
+        app = EagleLibraryGUI()
+        app.update()
+        try:
+            self.measure(app, size, "enter path", lambda: app.path_var.set(path))
+            self.measure(app, size, "load library", app._load_packages)
+
+            ds_names = list(app.left_panel.deviceset_widgets)
+            target = ds_names[len(ds_names) // 2]
+
+            def select_deviceset(name=target):
+                app.left_panel.deviceset_widgets[name]["var"].set(True)
+                app.left_panel._on_deviceset_toggle(name)
+
+            self.measure(app, size, "select deviceset", select_deviceset)
+            self.measure(app, size, "select next deviceset",
+                         lambda: select_deviceset(ds_names[len(ds_names) // 2 + 1]))
+
+            def select_all():
+                app.select_all_var.set(True)
+                app._toggle_select_all()
+
+            self.measure(app, size, "select all", select_all)
+            self.measure(app, size, "invert selection", app.package_store.invert_selection)
+            self.measure(app, size, "select matching",
+                         lambda: app.package_store.select_matching(r"[02468]$", regex=True))
+
+            def add_device():
+                app.device_name_var.set("BENCH")
+                app.prefix_var.set("R")
+                app.value_var.set("BENCH")
+                app.symbol_var.set("RESISTOR")
+                store = app.package_store
+                with store.batch():
+                    for pkg in store.selected:
+                        store.set_field(pkg, "desc", f"Bench {pkg}")
+                        store.set_field(pkg, "lcsc", "C1")
+                app._on_add_device()
+
+            self.measure(app, size, "add device", add_device)
+        finally:
+            app.destroy()
+
+    def run(self, sizes=DEFAULT_SIZES):
+        display = start_virtual_display()
+        self._patch_messageboxes()
+        if self.track_memory:
+            tracemalloc.start()
+        try:
+            with tempfile.TemporaryDirectory() as workdir:
+                for n_packages, n_devicesets in sizes:
+                    self.run_size(n_packages, n_devicesets, workdir)
+        finally:
+            if self.track_memory:
+                tracemalloc.stop()
+            self._restore_messageboxes()
+            if display is not None:
+                display.terminate()
+                display.wait()
+        return self.results
+
+
+def format_table(results):
+    columns = ["size", "op", "ms", "widgets", "created", "rss_mb"]
+    if results and "alloc_kb" in results[0]:
+        columns.append("alloc_kb")
+    rows = [columns] + [["" if r.get(c) is None else str(r[c]) for c in columns] for r in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return "\n".join("  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return a message for every (size, op) that got slower than baseline by more than
+    'tolerance' (0.5 = 50 %) and NOISE_FLOOR_MS, or now creates more widgets.
+    """
+    before = {(r["size"], r["op"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        b = before.get((r["size"], r["op"]))
+        if b is None:
+            continue
+        if r["ms"] > b["ms"] * (1 + tolerance) and r["ms"] - b["ms"] > NOISE_FLOOR_MS:
+            regressions.append(f"{r['size']} {r['op']}: {b['ms']} → {r['ms']} ms")
+        if r["created"] > b["created"]:
+            regressions.append(f"{r['size']} {r['op']}: creates {r['created']} widgets (was {b['created']})")
+    return regressions
+
+
+def main(sizes=DEFAULT_SIZES, json_path=None, baseline_path=None, tolerance=0.5, track_memory=False):
+    """
+    Run the harness, print the table, optionally save results as JSON and compare with a
+    baseline JSON from an earlier run. Returns 1 if anything regressed, else 0.
+    """
+    harness = GuiHarness(track_memory=track_memory)
+    results = harness.run(sizes)
+    print(format_table(results))
+    errors = [m for m in harness.messages if m[0] == "showerror"]
+    for _, title, msg in errors:
+        print(f"error dialog: {title}: {msg}")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), tolerance)
+        for line in regressions:
+            print(f"regression: {line}")
+        if regressions:
+            return 1
+    return 1 if errors else 0
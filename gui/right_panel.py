@@ -1,132 +1,99 @@
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import messagebox
-from xml_handler import XMLHandler
+from core.library_index import natural_key
 
 class PackageSelectionPanel(ctk.CTkScrollableFrame):
     """
     A scrollable frame containing:
-      • Row 0: header labels (“Select” | “Package” | “Description” | “LCSC Part#”)
-      • Row 1…N: one package‐row each: [Checkbox] [pkg name] [desc entry] [lcsc entry]
+      • Row 0: header labels (“Select” | “Preview” | “Package” | “Description” | “LCSC Part#”)
+      • Row 1…N: one package‐row each: [Checkbox] [footprint] [pkg name] [desc entry] [lcsc entry]
+
+    The panel is a view of a PackageStore (gui/package_store.py): the load_* methods fill
+    the store, and the panel redraws from the store's change notifications — all rows on
+    a reset, otherwise only the rows in the diff. Clicks and typing are written back to
+    the store, so nobody else needs to read the Tk variables.
+
+    Of the rows in a diff, only those scrolled into view (plus a small margin) are
+    repainted right away; the others are remembered as dirty and repainted when scrolling
+    brings them into view. A bulk selection over thousands of packages therefore costs one
+    store update and a screenful of widget changes.
+
+    Footprint thumbnails follow the same rule: they are requested from the ThumbnailLoader
+    only for rows on screen, and filled in as the background thread delivers them.
     """
 
-    def __init__(self, parent, width, height, package_data, pkg_toggle_callback,
-                 package_list_provider):
+    # Rows above/below the viewport that are repainted along with the visible ones
+    VISIBLE_MARGIN = 2
+
+    def __init__(self, parent, width, height, store, package_list_provider, thumbnails=None):
         """
+        store:                 the PackageStore this panel shows and edits
         package_list_provider: callable(tree) -> list of all package names
+        thumbnails:            optional ThumbnailLoader (gui/thumbnail_loader.py) for the
+                               Preview column
         """
         super().__init__(parent, width=width, height=height)
-        self.package_data        = package_data
-        self.pkg_toggle_callback = pkg_toggle_callback
+        self.store               = store
         self.pkgs_provider       = package_list_provider
+        self.tree                = None
+        # { pkg_name: { "var", "desc_var", "lcsc_var", "desc_entry", "lcsc_entry", "thumb" } }
+        self.rows                = {}
+        # Packages whose row lags behind the store because it was off screen
+        self._dirty              = set()
+        self.thumbnails          = thumbnails
+        self._blank              = thumbnails.blank() if thumbnails is not None else None
+        self._package_elems      = {}      # { pkg_name : <package> Element } of self.tree
+        self._thumbs_requested   = set()
 
         # Configure columns:
-        # col 0 = 40px (checkbox), col 1 = 80px (pkg),
-        # col 2 = weight=3 (description), col 3 = weight=1 (LCSC)
+        # col 0 = 40px (checkbox), col 1 = thumbnail, col 2 = 80px (pkg),
+        # col 3 = weight=3 (description), col 4 = weight=1 (LCSC)
         self.grid_columnconfigure(0, weight=0, minsize=40)
-        self.grid_columnconfigure(1, weight=0, minsize=80)
-        self.grid_columnconfigure(2, weight=3, minsize=150)
-        self.grid_columnconfigure(3, weight=1, minsize=100)
+        self.grid_columnconfigure(1, weight=0)
+        self.grid_columnconfigure(2, weight=0, minsize=80)
+        self.grid_columnconfigure(3, weight=3, minsize=150)
+        self.grid_columnconfigure(4, weight=1, minsize=100)
 
         # Draw header at row=0
         ctk.CTkLabel(self, text="Select").grid(
             row=0, column=0, sticky="w", padx=(5,5), pady=(5,2)
         )
+        if thumbnails is not None:
+            ctk.CTkLabel(self, text="Preview").grid(
+                row=0, column=1, sticky="w", padx=(5,5), pady=(5,2)
+            )
         ctk.CTkLabel(self, text="Package").grid(
-            row=0, column=1, sticky="w", padx=(5,5), pady=(5,2)
+            row=0, column=2, sticky="w", padx=(5,5), pady=(5,2)
         )
         ctk.CTkLabel(self, text="Description").grid(
-            row=0, column=2, sticky="w", padx=(5,5), pady=(5,2)
+            row=0, column=3, sticky="w", padx=(5,5), pady=(5,2)
         )
         ctk.CTkLabel(self, text="LCSC Part#").grid(
-            row=0, column=3, sticky="w", padx=(5,5), pady=(5,2)
+            row=0, column=4, sticky="w", padx=(5,5), pady=(5,2)
         )
 
+        self.store.subscribe(self._on_store_change)
+        # Repaint dirty rows as they scroll into view
+        self._parent_canvas.configure(yscrollcommand=self._on_yscroll)
+
+    # ─── Filling the store ───
+
     def load_all_packages(self, tree):
         """
-        1) Clears rows > 0.
-        2) Uses package_list_provider(tree) to get ALL package names under <packages>.
-        3) Builds one grid row per package under row=1:
-           [Checkbox] [pkg name] [desc Entry] [lcsc Entry]
+        Show ALL package names under <packages> (via package_list_provider), none selected
+        and with empty Description/LCSC fields.
         """
-        # Clear any existing rows (row > 0)
-        for child in self.winfo_children():
-            info = child.grid_info()
-            r = info.get("row", None)
-            if r is not None and r > 0:
-                child.destroy()
-        self.package_data.clear()
-
-        packages = []
-        if tree is not None:
-            packages = self.pkgs_provider(tree)
-
-        row = 1
-        for pkg_name in packages:
-            bool_var = tk.BooleanVar(value=False)
-            desc_var = tk.StringVar()
-            lcsc_var = tk.StringVar()
-
-            # COLUMN 0: Checkbox
-            ctk.CTkCheckBox(
-                self,
-                text="",
-                variable=bool_var,
-                command=lambda p=pkg_name: self.pkg_toggle_callback(p)
-            ).grid(row=row, column=0, padx=(5,5), pady=(2,2), sticky="w")
-
-            # COLUMN 1: Package label
-            ctk.CTkLabel(self, text=pkg_name, anchor="w").grid(
-                row=row, column=1, padx=(5,5), pady=(2,2), sticky="w"
-            )
-
-            # COLUMN 2: Description entry (disabled by default)
-            desc_entry = ctk.CTkEntry(self, textvariable=desc_var)
-            desc_entry.grid(row=row, column=2, padx=(5,5), pady=(2,2), sticky="we")
-            desc_entry.configure(state="disabled")
-
-            # COLUMN 3: LCSC Part# entry (disabled by default)
-            lcsc_entry = ctk.CTkEntry(self, textvariable=lcsc_var)
-            lcsc_entry.grid(row=row, column=3, padx=(5,5), pady=(2,2), sticky="we")
-            lcsc_entry.configure(state="disabled")
-
-            # Store references
-            self.package_data[pkg_name] = {
-                "var": bool_var,
-                "desc_var": desc_var,
-                "lcsc_var": lcsc_var,
-                "desc_entry": desc_entry,
-                "lcsc_entry": lcsc_entry,
-            }
-            row += 1
-
-        # If no packages were found, do nothing special.
-        # (Optional: show info if row == 1)
-        # if row == 1:
-        #     messagebox.showinfo("Info", "No packages found in library.")
+        self.tree = tree
+        self.store.load(self.pkgs_provider(tree) if tree is not None else [])
 
     def load_packages_from_deviceset(self, ds_element):
         """
         Show _all_ packages in the right panel, but pre‐fill DESCRIPTION and LCSC only
         for those packages that already appear under ds_element/devices.
-
-        Steps:
-          1) Clear rows > 0.
-          2) Get a list of _all_ package names (via XMLHandler.list_packages).
-          3) Build one row per package (same as load_all_packages), but if that
-             package name already exists as <device> in ds_element, fill in its
-             DESCRIPTION / LCSC from the XML.
+        If ds_element is None, the panel is emptied.
         """
-        # Clear old rows
-        for child in self.winfo_children():
-            info = child.grid_info()
-            r = info.get("row", None)
-            if r is not None and r > 0:
-                child.destroy()
-        self.package_data.clear()
-
-        # If no deviceset selected, do nothing
         if ds_element is None:
+            self.store.clear()
             return
 
         # 1) Build a quick lookup of packages already in this deviceset:
@@ -145,65 +112,162 @@ class PackageSelectionPanel(ctk.CTkScrollableFrame):
                             existing_desc = attr.get("value", "")
                         elif attr.get("name") == "LCSC_PART":
                             existing_lcsc = attr.get("value", "")
-                existing_map[pkg_name] = {
-                    "DESCRIPTION": existing_desc,
-                    "LCSC_PART": existing_lcsc
-                }
-
-        # 2) Get a sorted list of all packages in the library
-        #    (We need the tree. We can grab it from the first <device> or pass it in—
-        #     but the easiest is to call self.pkgs_provider on the original tree.)
-        #    The calling code always did: package_list_provider = XMLHandler.list_packages
-        packages = []
-        try:
-            # self.master is the parent frame, but your app stored the tree in a variable.
-            # In practice, you can store the tree in this widget when load_all_packages was called.
-            # For now, we assume `self.tree` was set by load_all_packages; if not, pass it in.
+                existing_map[pkg_name] = {"desc": existing_desc, "lcsc": existing_lcsc}
+
+        # 2) All packages of the library (self.tree is set by the app / load_all_packages);
+        #    without a tree, fall back to the deviceset's own packages.
+        if self.tree is not None:
             packages = self.pkgs_provider(self.tree)
-        except Exception:
-            # Fallback: if we didn’t preserve the tree in this widget, just show existing_map keys
-            packages = sorted(existing_map.keys(), key=lambda s: s.lower())
+        else:
+            packages = sorted(existing_map.keys(), key=lambda s: (natural_key(s), s))
+
+        self.store.load(packages, prefill=existing_map)
+
+    # ─── Store → widgets ───
+
+    def _on_store_change(self, diff):
+        if diff["reset"]:
+            self._dirty = set()
+            self._rebuild_rows()
+            return
+        self._dirty |= diff["selected"] | diff["fields"]
+        self._flush_visible()
+
+    def _on_yscroll(self, first, last):
+        self._scrollbar.set(first, last)
+        if self._dirty:
+            self._flush_visible(float(first), float(last))
+        self._request_thumbnails(float(first), float(last))
+
+    def _visible_range(self, first=None, last=None):
+        """
+        (start, stop) positions in store.order of the rows currently on screen, widened
+        by VISIBLE_MARGIN. Rows are equally tall, so the canvas' view fractions map
+        linearly onto positions.
+        """
+        if first is None:
+            first, last = self._parent_canvas.yview()
+        count = len(self.store.order)
+        start = int(first * count) - self.VISIBLE_MARGIN
+        stop = int(last * count + 0.999) + self.VISIBLE_MARGIN
+        return max(0, start), min(count, stop)
+
+    def _flush_visible(self, first=None, last=None):
+        """
+        Repaint the dirty rows that are on screen; the rest stay dirty.
+        """
+        start, stop = self._visible_range(first, last)
+        position = self.store.position
+        visible = [pkg for pkg in self._dirty if start <= position.get(pkg, -1) < stop]
+        for pkg_name in visible:
+            self._refresh_row(pkg_name)
+        self._dirty.difference_update(visible)
+
+    def _rebuild_rows(self):
+        """
+        Destroy all package rows and create one per package in the store.
+        """
+        for child in self.winfo_children():
+            info = child.grid_info()
+            r = info.get("row", None)
+            if r is not None and r > 0:
+                child.destroy()
+        self.rows = {}
 
-        row = 1
-        for pkg_name in packages:
-            bool_var = tk.BooleanVar(value=False)
-            # Pre‐fill DESCRIPTION / LCSC from existing_map, or blank if not found
-            existing_desc = existing_map.get(pkg_name, {}).get("DESCRIPTION", "")
-            existing_lcsc = existing_map.get(pkg_name, {}).get("LCSC_PART", "")
+        self._thumbs_requested = set()
+        self._package_elems = {}
+        if self.thumbnails is not None and self.tree is not None:
+            pk_parent = self.tree.getroot().find("./drawing/library/packages")
+            if pk_parent is not None:
+                self._package_elems = {pkg.get("name"): pkg for pkg in pk_parent.findall("package")}
+        thumb_bg = self._parent_canvas.cget("bg")
 
-            desc_var = tk.StringVar(value=existing_desc)
-            lcsc_var = tk.StringVar(value=existing_lcsc)
+        for row, pkg_name in enumerate(self.store.order, start=1):
+            bool_var = tk.BooleanVar(value=self.store.is_selected(pkg_name))
+            desc_var = tk.StringVar(value=self.store.get(pkg_name, "desc"))
+            lcsc_var = tk.StringVar(value=self.store.get(pkg_name, "lcsc"))
+            state = "normal" if bool_var.get() else "disabled"
 
             # COLUMN 0: Checkbox
             ctk.CTkCheckBox(
                 self,
                 text="",
                 variable=bool_var,
-                command=lambda p=pkg_name: self.pkg_toggle_callback(p)
+                command=lambda p=pkg_name, v=bool_var: self.store.set_selected(p, v.get())
             ).grid(row=row, column=0, padx=(5,5), pady=(2,2), sticky="w")
 
-            # COLUMN 1: Package label
+            # COLUMN 1: Footprint thumbnail (blank until rendered, see _request_thumbnails)
+            thumb = None
+            if self.thumbnails is not None:
+                thumb = tk.Label(self, image=self._blank, bg=thumb_bg, borderwidth=0)
+                thumb.grid(row=row, column=1, padx=(5,5), pady=(2,2), sticky="w")
+
+            # COLUMN 2: Package label
             ctk.CTkLabel(self, text=pkg_name, anchor="w").grid(
-                row=row, column=1, padx=(5,5), pady=(2,2), sticky="w"
+                row=row, column=2, padx=(5,5), pady=(2,2), sticky="w"
             )
 
-            # COLUMN 2: Description entry
+            # COLUMN 3: Description entry (enabled only while the package is selected)
             desc_entry = ctk.CTkEntry(self, textvariable=desc_var)
-            desc_entry.grid(row=row, column=2, padx=(5,5), pady=(2,2), sticky="we")
-            # Disable by default; only enable when user checks the box
-            desc_entry.configure(state="disabled")
+            desc_entry.grid(row=row, column=3, padx=(5,5), pady=(2,2), sticky="we")
+            desc_entry.configure(state=state)
 
-            # COLUMN 3: LCSC Part# entry
+            # COLUMN 4: LCSC Part# entry
             lcsc_entry = ctk.CTkEntry(self, textvariable=lcsc_var)
-            lcsc_entry.grid(row=row, column=3, padx=(5,5), pady=(2,2), sticky="we")
-            lcsc_entry.configure(state="disabled")
+            lcsc_entry.grid(row=row, column=4, padx=(5,5), pady=(2,2), sticky="we")
+            lcsc_entry.configure(state=state)
 
-            self.package_data[pkg_name] = {
+            # Typing goes straight into the store
+            desc_var.trace_add("write", lambda *_, p=pkg_name, v=desc_var: self.store.set_field(p, "desc", v.get()))
+            lcsc_var.trace_add("write", lambda *_, p=pkg_name, v=lcsc_var: self.store.set_field(p, "lcsc", v.get()))
+
+            self.rows[pkg_name] = {
                 "var": bool_var,
                 "desc_var": desc_var,
                 "lcsc_var": lcsc_var,
                 "desc_entry": desc_entry,
                 "lcsc_entry": lcsc_entry,
+                "thumb": thumb,
             }
+        self._request_thumbnails()
+
+    def _request_thumbnails(self, first=None, last=None):
+        """
+        Ask the loader for the thumbnails of the rows on screen that don't have one yet.
+        """
+        if self.thumbnails is None or not self._package_elems:
+            return
+        start, stop = self._visible_range(first, last)
+        for pkg_name in self.store.order[start:stop]:
+            elem = self._package_elems.get(pkg_name)
+            if elem is None or pkg_name in self._thumbs_requested:
+                continue
+            self._thumbs_requested.add(pkg_name)
+            thumb = self.rows[pkg_name]["thumb"]
+            self.thumbnails.request(elem, lambda photo, w=thumb: self._show_thumbnail(w, photo))
 
-            row += 1
+    @staticmethod
+    def _show_thumbnail(label, photo):
+        if not label.winfo_exists():
+            return    # the rows were rebuilt meanwhile
+        label.configure(image=photo)
+        label.image = photo    # keep the PhotoImage alive as long as the label shows it
+
+    def _refresh_row(self, pkg_name):
+        """
+        Bring one row's widgets in line with the store, touching only what differs.
+        """
+        widgets = self.rows.get(pkg_name)
+        if widgets is None:
+            return
+        selected = self.store.is_selected(pkg_name)
+        if widgets["var"].get() != selected:
+            widgets["var"].set(selected)
+        state = "normal" if selected else "disabled"
+        if widgets["desc_entry"].cget("state") != state:
+            widgets["desc_entry"].configure(state=state)
+            widgets["lcsc_entry"].configure(state=state)
+        for field in ("desc", "lcsc"):
+            value = self.store.get(pkg_name, field)
+            if widgets[field + "_var"].get() != value:
+                widgets[field + "_var"].set(value)
@@ -0,0 +1,105 @@
+import os
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import messagebox
+
+from config import BUTTON_COLORS
+from core.schematic_scan import SchematicScanner
+from core.xml_handler import XMLHandler
+
+class SchematicReportDialog(ctk.CTkToplevel):
+    """
+    Fill the LCSC gaps a schematic scan found in the loaded library
+    (“eagle_editor.py scan-schematics … --json REPORT”):
+
+      • one row per (deviceset, device, technology) that is “missing” (no LCSC_PART in the
+        library) or “stale” (the schematics carry another one), with the parts using it
+      • the LCSC Part# entry is prefilled with the library's value, or else with the one
+        the schematics carry
+
+    “Apply” writes every changed, non‐empty entry in one XMLHandler.set_lcsc pass,
+    journaled through the session.
+    """
+
+    COLUMNS = ("Deviceset", "Device", "Technology", "Value", "Status", "Used by", "LCSC Part#")
+
+    def __init__(self, parent, session, report, report_path, on_done):
+        """
+        report      - a report dict (SchematicScanner.load_report)
+        report_path - its file, for the title
+        on_done     - callback(updated_count, not_found) after applying
+        """
+        super().__init__(parent)
+        self.title(f"Schematic Report – {os.path.basename(report_path)}")
+        self.geometry("980x520")
+        self.transient(parent)
+
+        self.session = session
+        self.gaps    = SchematicScanner.gaps(report, session.path)
+        self.on_done = on_done
+        self.vars    = []    # one StringVar per gap
+
+        self._build()
+        self.grab_set()
+
+    def _build(self):
+        ctk.CTkLabel(
+            self,
+            text=f"{len(self.gaps)} gap(s) in {os.path.basename(self.session.path)}",
+            anchor="w",
+        ).pack(fill="x", padx=15, pady=(15, 0))
+
+        grid = ctk.CTkScrollableFrame(self)
+        grid.pack(fill="both", expand=True, padx=15, pady=(5, 5))
+        for c, text in enumerate(self.COLUMNS):
+            ctk.CTkLabel(grid, text=text, font=ctk.CTkFont(weight="bold")).grid(
+                row=0, column=c, sticky="w", padx=(3, 3), pady=(2, 4)
+            )
+        for r, gap in enumerate(self.gaps, start=1):
+            used_by = ", ".join(gap["parts"][:3]) + (f" +{len(gap['parts']) - 3}" if len(gap["parts"]) > 3 else "")
+            cells = (gap["deviceset"], gap["device"] or "-", gap["technology"] or "-",
+                     gap["value"], gap["status"], used_by)
+            for c, text in enumerate(cells):
+                ctk.CTkLabel(grid, text=text, anchor="w").grid(row=r, column=c, sticky="w", padx=(3, 3), pady=(1, 1))
+            var = tk.StringVar(value=gap["lib_lcsc"] or gap["sch_lcsc"])
+            ctk.CTkEntry(grid, textvariable=var, width=110).grid(row=r, column=len(cells), padx=(3, 3), pady=(1, 1))
+            self.vars.append(var)
+
+        buttons = ctk.CTkFrame(self)
+        buttons.pack(fill="x", padx=15, pady=(5, 15))
+        ctk.CTkButton(
+            buttons,
+            text="Apply",
+            command=self._on_apply,
+            fg_color=BUTTON_COLORS["add"]["fg"],
+            hover_color=BUTTON_COLORS["add"]["hover"],
+            width=100,
+        ).pack(side="left", expand=True, padx=(0, 5))
+        ctk.CTkButton(
+            buttons,
+            text="Cancel",
+            command=self.destroy,
+            fg_color=BUTTON_COLORS["quit"]["fg"],
+            hover_color=BUTTON_COLORS["quit"]["hover"],
+            width=100,
+        ).pack(side="right", padx=(5, 0))
+
+    def _on_apply(self):
+        fixes = []
+        for gap, var in zip(self.gaps, self.vars):
+            lcsc = var.get().strip()
+            if lcsc and lcsc != gap["lib_lcsc"]:
+                fixes.append((gap["deviceset"], gap["device"], gap["technology"], lcsc))
+        if not fixes:
+            messagebox.showerror("Error", "No LCSC Part# was filled in or changed.", parent=self)
+            return
+        try:
+            updated, not_found = self.session.apply(
+                f"Fill {len(fixes)} LCSC Part#(s) from schematic report",
+                XMLHandler.set_lcsc, fixes,
+            )
+        except (RuntimeError, KeyError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to set LCSC Part#s:\n{e}", parent=self)
+            return
+        self.destroy()
+        self.on_done(updated, not_found)
@@ -0,0 +1,160 @@
+import os
+import threading
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+
+from config import BUTTON_COLORS
+from core.parts_index import PartsIndex
+
+class SearchDialog(ctk.CTkToplevel):
+    """
+    Window for searching the cross‐library parts index (see parts_index.PartsIndex):
+      • Row 0: parts directory + Browse + “Update Index” (runs in a background thread)
+      • Row 1: search entry; results refresh as you type
+      • Row 2: scrollable result rows: Library | Deviceset | Package | LCSC Part# | Value | Description | [Open]
+    “Open” hands (library_path, deviceset_name) to on_open.
+    """
+
+    MAX_RESULTS = 200
+    SEARCH_DELAY_MS = 150
+
+    def __init__(self, parent, start_dir, on_open):
+        """
+        start_dir - initial parts directory (e.g. the folder of the loaded library)
+        on_open   - callback(library_path, deviceset_name)
+        """
+        super().__init__(parent)
+        self.title("Search Libraries")
+        self.geometry("900x560")
+        self.transient(parent)
+
+        self.on_open     = on_open
+        self.index       = PartsIndex()
+        self.dir_var     = tk.StringVar(value=start_dir or "")
+        self.query_var   = tk.StringVar()
+        self.status_var  = tk.StringVar()
+        self._pending    = None    # after() id of the debounced search
+
+        self._build()
+        self._show_count()
+        self.query_var.trace_add("write", self._on_query_change)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _build(self):
+        # ─── Row 0: directory + update ───
+        top = ctk.CTkFrame(self)
+        top.pack(fill="x", padx=15, pady=(15, 5))
+        ctk.CTkLabel(top, text="Parts Directory:").grid(row=0, column=0, columnspan=3, sticky="w")
+        ctk.CTkEntry(top, textvariable=self.dir_var, width=420).grid(
+            row=1, column=0, padx=(0, 5), pady=(5, 5), sticky="w"
+        )
+        ctk.CTkButton(top, text="Browse", command=self._browse, width=80).grid(
+            row=1, column=1, padx=(5, 5), pady=(5, 5)
+        )
+        self.update_btn = ctk.CTkButton(
+            top,
+            text="Update Index",
+            command=self._start_update,
+            fg_color=BUTTON_COLORS["load"]["fg"],
+            hover_color=BUTTON_COLORS["load"]["hover"],
+        )
+        self.update_btn.grid(row=1, column=2, padx=(5, 0), pady=(5, 5))
+        ctk.CTkLabel(top, textvariable=self.status_var, anchor="w").grid(
+            row=2, column=0, columnspan=3, sticky="w"
+        )
+
+        # ─── Row 1: query ───
+        ctk.CTkLabel(self, text="Search (LCSC#, package, value, description…):").pack(
+            anchor="w", padx=15, pady=(5, 0)
+        )
+        ctk.CTkEntry(self, textvariable=self.query_var).pack(fill="x", padx=15, pady=(5, 5))
+
+        # ─── Row 2: results ───
+        self.results = ctk.CTkScrollableFrame(self)
+        self.results.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+        self.results.grid_columnconfigure(5, weight=1)
+
+    def _browse(self):
+        fn = filedialog.askdirectory(parent=self, title="Select Parts Directory")
+        if fn:
+            self.dir_var.set(fn)
+
+    def _show_count(self):
+        libs, rows = self.index.count()
+        self.status_var.set(f"{libs} libraries, {rows} parts indexed.")
+
+    def _start_update(self):
+        """
+        Rescan the directory in a worker thread (which itself fans out to a process pool),
+        so the window stays responsive on large part repositories.
+        """
+        root = self.dir_var.get().strip()
+        if not os.path.isdir(root):
+            messagebox.showerror("Error", "Choose a directory to index.", parent=self)
+            return
+        self.update_btn.configure(state="disabled")
+        self.status_var.set("Indexing…")
+        outcome = {}
+
+        def work():
+            # SQLite connections can't cross threads, so the worker uses its own.
+            index = PartsIndex(self.index.db_path)
+            try:
+                outcome["result"] = index.update(root)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                index.close()
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        self._poll_update(worker, outcome)
+
+    def _poll_update(self, worker, outcome):
+        if worker.is_alive():
+            self.after(100, self._poll_update, worker, outcome)
+            return
+        self.update_btn.configure(state="normal")
+        if "error" in outcome:
+            self.status_var.set("")
+            messagebox.showerror("Error", f"Failed to update index:\n{outcome['error']}", parent=self)
+            return
+        rescanned, removed, failed = outcome["result"]
+        self._show_count()
+        if failed:
+            messagebox.showwarning(
+                "Index", "Could not read:\n" + "\n".join(path for path, _ in failed), parent=self
+            )
+        self._run_search()
+
+    def _on_query_change(self, *_):
+        # Debounce: search once typing pauses
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._pending = None
+        for child in self.results.winfo_children():
+            child.destroy()
+
+        rows = self.index.search(self.query_var.get(), limit=self.MAX_RESULTS)
+        for r, (library, deviceset, device, technology, package, lcsc, value, description) in enumerate(rows):
+            cells = (os.path.basename(library), deviceset, package, lcsc, value, description)
+            for c, text in enumerate(cells):
+                ctk.CTkLabel(self.results, text=text, anchor="w").grid(
+                    row=r, column=c, padx=(5, 5), pady=(1, 1), sticky="w"
+                )
+            ctk.CTkButton(
+                self.results,
+                text="Open",
+                width=50,
+                command=lambda lib=library, ds=deviceset: self.on_open(lib, ds),
+            ).grid(row=r, column=len(cells), padx=(5, 5), pady=(1, 1))
+
+    def _on_close(self):
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self.index.close()
+        self.destroy()
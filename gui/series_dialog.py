@@ -0,0 +1,164 @@
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import messagebox
+
+from config import BUTTON_COLORS
+from core.library_index import LibraryIndex
+from core.value_series import ValueSeries
+from core.xml_handler import XMLHandler
+
+class SeriesDialog(ctk.CTkToplevel):
+    """
+    Generator mode: one deviceset per standard value (E6…E192) in a range, each with a
+    device for every checked package, created in a single in‐memory pass
+    (ValueSeries.generate). The caller saves the library once via on_done.
+
+      • Left:  series / kind / range / prefix / symbol / template deviceset / name,
+               description & LCSC templates
+      • Right: scrollable package checkboxes (+ “Select All”)
+    """
+
+    def __init__(self, parent, session, on_done):
+        """
+        session  - the LibrarySession of the loaded library; the series is applied (and
+                   journaled) through it, in memory
+        on_done  - callback(created_count, merged_count, warnings) after generating
+        """
+        super().__init__(parent)
+        self.title("Generate Value Series")
+        self.geometry("760x520")
+        self.transient(parent)
+
+        self.session  = session
+        self.tree     = session.tree
+        self.on_done  = on_done
+        self.vars     = {
+            "series":      tk.StringVar(value="E24"),
+            "kind":        tk.StringVar(value="resistor"),
+            "start":       tk.StringVar(value="10"),
+            "stop":        tk.StringVar(value="1M"),
+            "prefix":      tk.StringVar(value="R"),
+            "symbol":      tk.StringVar(),
+            "template":    tk.StringVar(),
+            "name":        tk.StringVar(value="{value}"),
+            "description": tk.StringVar(value="RES {si}Ω {package}"),
+            "lcsc":        tk.StringVar(),
+        }
+        self.all_var  = tk.BooleanVar(value=False)
+        # One deviceset with a <technology> per value, instead of a deviceset per value
+        self.tech_var = tk.BooleanVar(value=False)
+        self.pkg_vars = {}    # { pkg_name: BooleanVar }
+
+        self._build()
+        self.grab_set()
+
+    def _build(self):
+        form = ctk.CTkFrame(self)
+        form.pack(side="left", fill="y", padx=(15, 5), pady=15)
+
+        rows = [
+            ("Series:", ctk.CTkOptionMenu(form, values=list(ValueSeries.SERIES), variable=self.vars["series"])),
+            ("Kind:", ctk.CTkOptionMenu(form, values=list(ValueSeries.UNITS), variable=self.vars["kind"],
+                                        command=self._on_kind_change)),
+            ("From:", ctk.CTkEntry(form, textvariable=self.vars["start"])),
+            ("To:", ctk.CTkEntry(form, textvariable=self.vars["stop"])),
+            ("Prefix:", ctk.CTkEntry(form, textvariable=self.vars["prefix"])),
+            ("Symbol:", ctk.CTkOptionMenu(form, values=[""] + XMLHandler.list_symbols(self.tree),
+                                          variable=self.vars["symbol"])),
+            ("Template deviceset:", ctk.CTkOptionMenu(
+                form, values=[""] + LibraryIndex.for_tree(self.tree).template_names(),
+                variable=self.vars["template"])),
+            ("Name template:", ctk.CTkEntry(form, textvariable=self.vars["name"])),
+            ("Values as:", ctk.CTkCheckBox(form, text="technologies of one deviceset",
+                                           variable=self.tech_var)),
+            ("Description template:", ctk.CTkEntry(form, textvariable=self.vars["description"], width=220)),
+            ("LCSC template:", ctk.CTkEntry(form, textvariable=self.vars["lcsc"])),
+        ]
+        for r, (label, widget) in enumerate(rows):
+            ctk.CTkLabel(form, text=label).grid(row=r, column=0, sticky="w", padx=(5, 5), pady=(4, 4))
+            widget.grid(row=r, column=1, sticky="we", padx=(5, 5), pady=(4, 4))
+        ctk.CTkLabel(
+            form, text="Templates may use {value} (4K7), {si} (4.7k), {package}, {series}. "
+                       "With technologies, the name may only use {series} (e.g. R_{series}).",
+            wraplength=320, justify="left",
+        ).grid(row=len(rows), column=0, columnspan=2, sticky="w", padx=(5, 5), pady=(8, 8))
+
+        buttons = ctk.CTkFrame(form)
+        buttons.grid(row=len(rows) + 1, column=0, columnspan=2, sticky="we", pady=(10, 5))
+        ctk.CTkButton(
+            buttons,
+            text="Generate",
+            command=self._on_generate,
+            fg_color=BUTTON_COLORS["add"]["fg"],
+            hover_color=BUTTON_COLORS["add"]["hover"],
+            width=100,
+        ).pack(side="left", expand=True, padx=(0, 5))
+        ctk.CTkButton(
+            buttons,
+            text="Cancel",
+            command=self.destroy,
+            fg_color=BUTTON_COLORS["quit"]["fg"],
+            hover_color=BUTTON_COLORS["quit"]["hover"],
+            width=100,
+        ).pack(side="right", expand=True, padx=(5, 0))
+
+        # ─── Packages ───
+        right = ctk.CTkFrame(self)
+        right.pack(side="left", fill="both", expand=True, padx=(5, 15), pady=15)
+        ctk.CTkCheckBox(
+            right, text="Select All", variable=self.all_var, command=self._toggle_all
+        ).pack(anchor="w", padx=5, pady=(5, 0))
+        pkg_frame = ctk.CTkScrollableFrame(right)
+        pkg_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        for pkg_name in XMLHandler.list_packages(self.tree):
+            var = tk.BooleanVar(value=False)
+            ctk.CTkCheckBox(pkg_frame, text=pkg_name, variable=var).pack(anchor="w", pady=(1, 1))
+            self.pkg_vars[pkg_name] = var
+
+    def _on_kind_change(self, kind):
+        self.vars["prefix"].set(ValueSeries.DEFAULT_PREFIX[kind])
+        if kind == "capacitor":
+            self.vars["start"].set("1n")
+            self.vars["stop"].set("10u")
+            self.vars["description"].set("CAP {si}F {package}")
+        else:
+            self.vars["start"].set("10")
+            self.vars["stop"].set("1M")
+            self.vars["description"].set("RES {si}Ω {package}")
+
+    def _toggle_all(self):
+        should_select = self.all_var.get()
+        for var in self.pkg_vars.values():
+            var.set(should_select)
+
+    def _on_generate(self):
+        chosen = [pkg for pkg, var in self.pkg_vars.items() if var.get()]
+        if not chosen:
+            messagebox.showerror("Error", "Select at least one package.", parent=self)
+            return
+        v = {key: var.get().strip() for key, var in self.vars.items()}
+        if not v["prefix"]:
+            messagebox.showerror("Error", "You must enter a prefix (e.g. R, C).", parent=self)
+            return
+
+        warnings = []
+        try:
+            created, merged = self.session.apply(
+                f"Generate {v['series']} series {v['start']}–{v['stop']}",
+                ValueSeries.generate,
+                v["series"], v["start"], v["stop"], chosen,
+                kind=v["kind"],
+                name_template=v["name"] or "{value}",
+                desc_template=v["description"],
+                lcsc_template=v["lcsc"],
+                prefix=v["prefix"],
+                symbol_name=v["symbol"] or None,
+                warnings=warnings,
+                template=v["template"] or None,
+                technologies=self.tech_var.get(),
+            )
+        except (RuntimeError, KeyError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to generate series:\n{e}", parent=self)
+            return
+        self.destroy()
+        self.on_done(created, merged, warnings)
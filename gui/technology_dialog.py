@@ -0,0 +1,142 @@
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import messagebox
+
+from config import BUTTON_COLORS
+from core.library_index import LibraryIndex
+from core.xml_handler import XMLHandler
+
+class TechnologyGridDialog(ctk.CTkToplevel):
+    """
+    Edit the value variants of one deviceset as <technology> entries, in a grid:
+
+      • one row per technology: Technology name, Value, Description template
+        ({package} is replaced per package)
+      • one LCSC Part# column per chosen package
+
+    “Apply” writes every filled cell in one XMLHandler.set_technologies pass, journaled
+    through the session; cells with an empty LCSC Part# are skipped. Existing technologies
+    of the deviceset are shown prefilled.
+    """
+
+    def __init__(self, parent, session, ds_name, prefix, symbol, template, packages, on_done):
+        """
+        packages - the package names that get a column (the right panel's selection)
+        on_done  - callback(added_count, updated_count, warnings) after applying
+        """
+        super().__init__(parent)
+        self.title(f"Technologies of {ds_name}")
+        self.geometry("900x480")
+        self.transient(parent)
+
+        self.session  = session
+        self.tree     = session.tree
+        self.ds_name  = ds_name
+        self.prefix   = prefix
+        self.symbol   = symbol
+        self.template = template
+        self.packages = list(packages)
+        self.on_done  = on_done
+        self.rows     = []    # [ { "tech", "value", "desc": StringVar, "lcsc": { pkg : StringVar } } ]
+
+        self._build()
+        self._prefill()
+        self.grab_set()
+
+    def _build(self):
+        self.grid_frame = ctk.CTkScrollableFrame(self, orientation="horizontal")
+        self.grid_frame.pack(fill="both", expand=True, padx=15, pady=(15, 5))
+
+        headers = ["Technology", "Value", "Description ({package})"] + self.packages
+        for c, text in enumerate(headers):
+            ctk.CTkLabel(self.grid_frame, text=text, font=ctk.CTkFont(weight="bold")).grid(
+                row=0, column=c, sticky="w", padx=(3, 3), pady=(2, 4)
+            )
+
+        buttons = ctk.CTkFrame(self)
+        buttons.pack(fill="x", padx=15, pady=(5, 15))
+        ctk.CTkButton(buttons, text="Add Row", command=self._add_row, width=100).pack(
+            side="left", padx=(0, 5)
+        )
+        ctk.CTkButton(
+            buttons,
+            text="Apply",
+            command=self._on_apply,
+            fg_color=BUTTON_COLORS["add"]["fg"],
+            hover_color=BUTTON_COLORS["add"]["hover"],
+            width=100,
+        ).pack(side="left", expand=True, padx=(5, 5))
+        ctk.CTkButton(
+            buttons,
+            text="Cancel",
+            command=self.destroy,
+            fg_color=BUTTON_COLORS["quit"]["fg"],
+            hover_color=BUTTON_COLORS["quit"]["hover"],
+            width=100,
+        ).pack(side="right", padx=(5, 0))
+
+    def _add_row(self, tech="", value="", desc="", lcsc=None):
+        lcsc = lcsc or {}
+        row = {
+            "tech":  tk.StringVar(value=tech),
+            "value": tk.StringVar(value=value),
+            "desc":  tk.StringVar(value=desc),
+            "lcsc":  {pkg: tk.StringVar(value=lcsc.get(pkg, "")) for pkg in self.packages},
+        }
+        r = len(self.rows) + 1
+        ctk.CTkEntry(self.grid_frame, textvariable=row["tech"], width=90).grid(row=r, column=0, padx=(3, 3), pady=(1, 1))
+        ctk.CTkEntry(self.grid_frame, textvariable=row["value"], width=90).grid(row=r, column=1, padx=(3, 3), pady=(1, 1))
+        ctk.CTkEntry(self.grid_frame, textvariable=row["desc"], width=200).grid(row=r, column=2, padx=(3, 3), pady=(1, 1))
+        for c, pkg in enumerate(self.packages, start=3):
+            ctk.CTkEntry(self.grid_frame, textvariable=row["lcsc"][pkg], width=90).grid(
+                row=r, column=c, padx=(3, 3), pady=(1, 1)
+            )
+        self.rows.append(row)
+
+    def _prefill(self):
+        """
+        One row per existing technology of the deviceset (grouped by technology name), or
+        a single empty row for a new deviceset.
+        """
+        ds = LibraryIndex.for_tree(self.tree).deviceset(self.ds_name)
+        grouped = {}
+        for _dev, pkg, tech, attrs in ([] if ds is None else XMLHandler.technology_rows(ds)):
+            entry = grouped.setdefault(tech, {"value": attrs.get("VALUE", ""), "desc": "", "lcsc": {}})
+            entry["lcsc"][pkg] = attrs.get("LCSC_PART", "")
+            # Turn the first package's description back into a template
+            if not entry["desc"] and pkg:
+                entry["desc"] = attrs.get("DESCRIPTION", "").replace(pkg, "{package}")
+        for tech, entry in grouped.items():
+            self._add_row(tech, entry["value"], entry["desc"], entry["lcsc"])
+        if not self.rows:
+            self._add_row()
+
+    def _on_apply(self):
+        rows = []
+        for row in self.rows:
+            tech  = row["tech"].get().strip()
+            value = row["value"].get().strip()
+            desc  = row["desc"].get().strip()
+            for pkg, var in row["lcsc"].items():
+                lcsc = var.get().strip()
+                if lcsc:
+                    rows.append((pkg, tech, {"value": value, "desc": desc.replace("{package}", pkg), "lcsc": lcsc}))
+        if not rows:
+            messagebox.showerror("Error", "Fill in at least one LCSC Part#.", parent=self)
+            return
+
+        warnings = []
+        try:
+            added, updated = self.session.apply(
+                f"Set technologies of {self.ds_name}",
+                XMLHandler.set_technologies,
+                self.ds_name, self.prefix, rows,
+                symbol_name=self.symbol or None,
+                warnings=warnings,
+                template=self.template or None,
+            )
+        except (RuntimeError, KeyError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to set technologies:\n{e}", parent=self)
+            return
+        self.destroy()
+        self.on_done(added, updated, warnings)
@@ -0,0 +1,127 @@
+import base64
+import queue
+import threading
+import tkinter as tk
+import weakref
+from collections import OrderedDict
+
+
+class ThumbnailLoader:
+    """
+    Renders package/symbol thumbnails (core/preview.py) on a background thread and hands
+    them to the Tk thread as PhotoImages:
+
+        loader.request(package_elem, lambda photo: label.configure(image=photo))
+
+      • Rendering and the disk cache run on one worker thread; Tk is only touched from
+        the main thread, which polls the results every POLL_MS while work is pending.
+      • Each Element is rendered at most once: repeated requests while it is queued just
+        add callbacks, and later requests are answered from the finished results. Identical
+        geometry is rendered once too, since ThumbnailCache keys by content hash.
+      • Requests are served newest first, so after fast scrolling the rows now on screen
+        come before the ones scrolled past.
+
+    The worker only reads the Elements it is given. Edits replace <package>/<symbol>
+    elements rather than modifying them, so reading one from the worker is safe.
+    """
+
+    POLL_MS = 30
+    # PhotoImages kept for reuse; labels hold their own reference, so eviction is harmless
+    PHOTO_LIMIT = 1024
+
+    def __init__(self, widget, cache, size):
+        """
+        widget: any widget of the application (for after() and as the images' master)
+        cache:  a core.preview.ThumbnailCache
+        size:   (width, height) of the thumbnails in pixels
+        """
+        self.widget = widget
+        self.cache = cache
+        self.width, self.height = size
+        self._requests = queue.LifoQueue()
+        self._results = queue.Queue()
+        self._waiting = {}                            # { Element : [callbacks] }
+        self._done = weakref.WeakKeyDictionary()      # { Element : cache key }
+        self._photos = OrderedDict()                  # { cache key : PhotoImage }
+        self._worker = None
+        self._polling = False
+
+    def blank(self):
+        """
+        A transparent PhotoImage of thumbnail size, as placeholder until the real one arrives.
+        """
+        return tk.PhotoImage(master=self.widget, width=self.width, height=self.height)
+
+    def photo_count(self):
+        """
+        Number of PhotoImages currently kept for reuse (at most PHOTO_LIMIT).
+        """
+        return len(self._photos)
+
+    def request(self, elem, callback):
+        """
+        Call callback(photo) on the Tk thread once elem's thumbnail is ready (immediately if
+        it already is). Nothing is called if rendering fails.
+        """
+        key = self._done.get(elem)
+        if key is not None:
+            photo = self._photo(key)
+            if photo is not None:
+                callback(photo)
+                return
+        if elem in self._waiting:
+            self._waiting[elem].append(callback)
+            return
+        self._waiting[elem] = [callback]
+        self._requests.put(elem)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name="thumbnails", daemon=True)
+            self._worker.start()
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._poll)
+
+    def _work(self):
+        while True:
+            elem = self._requests.get()
+            try:
+                key, data = self.cache.thumbnail(elem, self.width, self.height)
+            except Exception:
+                key, data = None, None
+            self._results.put((elem, key, data))
+
+    def _photo(self, key, data=None):
+        """
+        The PhotoImage for a cache key, created from 'data' (or the cache) if needed.
+        """
+        photo = self._photos.get(key)
+        if photo is None:
+            data = data or self.cache.get(key)
+            if data is None:
+                return None
+            photo = tk.PhotoImage(master=self.widget, format="png",
+                                  data=base64.b64encode(data).decode("ascii"))
+            self._photos[key] = photo
+            while len(self._photos) > self.PHOTO_LIMIT:
+                self._photos.popitem(last=False)
+        else:
+            self._photos.move_to_end(key)
+        return photo
+
+    def _poll(self):
+        try:
+            while True:
+                elem, key, data = self._results.get_nowait()
+                callbacks = self._waiting.pop(elem, [])
+                if key is None:
+                    continue
+                self._done[elem] = key
+                photo = self._photo(key, data)
+                for callback in callbacks:
+                    callback(photo)
+        except queue.Empty:
+            pass
+        if self._waiting:
+            self.widget.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
@@ -1,17 +1,16 @@
 import os
 import tkinter as tk
 import customtkinter as ctk
-import xml.etree.ElementTree as ET                   # ← add this line
 from config import BUTTON_COLORS
 
 class TopControlsFrame(ctk.CTkFrame):
     """
     The top‐row area containing:
-      - Library path entry + Browse button + Load button
+      - Library path entry + Browse button + Load button + Template dropdown
       - New deviceset name entry
       - Prefix entry
       - Global Value entry
-      - Symbol dropdown (combobox)
+      - Symbol dropdown (combobox) + a preview of the chosen symbol
     """
 
     def __init__(self,
@@ -23,10 +22,15 @@ class TopControlsFrame(ctk.CTkFrame):
                  symbol_var,
                  browse_command,
                  load_command,
-                 symbol_list_provider):
+                 symbol_list_provider,
+                 template_var,
+                 template_command):
         """
         symbol_var:          a StringVar() where the chosen symbol will be stored
-        symbol_list_provider: a callable that returns the list of symbols (strings)
+        symbol_list_provider: a callable(path) that returns the list of symbols (strings)
+                              in that library
+        template_var:        a StringVar() holding the template deviceset for new devicesets
+        template_command:    callable(name) when the user picks a template
         """
         super().__init__(parent)
         self.path_var         = path_var
@@ -37,6 +41,8 @@ class TopControlsFrame(ctk.CTkFrame):
         self.browse_command   = browse_command
         self.load_command     = load_command
         self.symbol_provider  = symbol_list_provider
+        self.template_var     = template_var
+        self.template_command = template_command
 
         self._build()
         self.path_var.trace_add("write", self._on_path_change)
@@ -66,6 +72,21 @@ class TopControlsFrame(ctk.CTkFrame):
         )
         self.load_btn.grid(row=1, column=2, padx=(5, 5), pady=(5, 5))
 
+        # Template deviceset that new devicesets are created from (filled after loading)
+        ctk.CTkLabel(self, text="Template:").grid(
+            row=1, column=6, sticky="w", pady=(5, 5)
+        )
+        self.template_menu = ctk.CTkOptionMenu(
+            self,
+            values=[],
+            variable=self.template_var,
+            command=self.template_command,
+            width=140
+        )
+        self.template_menu.grid(
+            row=1, column=7, padx=(5, 0), pady=(5, 5), sticky="w"
+        )
+
         # ─── Row 2: DeviceSet Name, Prefix, Value, Symbol ───
         ctk.CTkLabel(self, text="Device Set Name:").grid(
             row=2, column=0, sticky="w", pady=(10, 0)
@@ -102,19 +123,40 @@ class TopControlsFrame(ctk.CTkFrame):
             row=2, column=7, padx=(5, 0), pady=(10, 0), sticky="w"
         )
 
+        # Thumbnail of the chosen symbol, filled in by the app (see show_symbol_preview)
+        self.symbol_preview = tk.Label(
+            self, borderwidth=0, bg=self._apply_appearance_mode(self.cget("fg_color"))
+        )
+        self.symbol_preview.grid(row=2, column=8, padx=(10, 0), pady=(10, 0), sticky="w")
+
+    def set_templates(self, names):
+        """
+        Offer 'names' in the Template dropdown. The current choice is kept if it is still
+        offered, otherwise the first name (the default template) is selected.
+        """
+        self.template_menu.configure(values=names)
+        if self.template_var.get() not in names:
+            self.template_var.set(names[0] if names else "")
+
+    def show_symbol_preview(self, photo):
+        """
+        Show a PhotoImage next to the Symbol dropdown (None clears it).
+        """
+        self.symbol_preview.configure(image=photo if photo is not None else "")
+        self.symbol_preview.image = photo
+
     def _on_path_change(self, *_):
         """
         Whenever path_var changes:
          - If it's a real file, enable the Load button.
-         - Attempt to parse the file immediately to populate the Symbol dropdown.
+         - Read the file's symbol names immediately to populate the Symbol dropdown.
          - If parsing fails, clear the dropdown.
         """
         path = self.path_var.get().strip()
         if os.path.isfile(path):
             self.load_btn.configure(state="normal")
             try:
-                tree = ET.parse(path)
-                symbols = self.symbol_provider(tree)
+                symbols = self.symbol_provider(path)
                 self.symbol_menu.configure(values=symbols)
                 self.symbol_var.set("")  # clear any prior selection
             except Exception:
@@ -0,0 +1,438 @@
+# server.py
+
+import hmac
+import inspect
+import json
+import os
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import SERVER_HOST, SERVER_MAX_BODY, SERVER_PORT, SERVER_TOKEN_FILE
+from core.library_index import LibraryIndex
+from core.library_session import LibrarySession
+from core.xml_handler import XMLHandler
+
+# JSON‐RPC 2.0 error codes
+PARSE_ERROR      = -32700
+INVALID_REQUEST  = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS   = -32602
+SERVER_ERROR     = -32000
+
+TOKEN_HEADER = "X-Library-Token"
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+class LibraryService:
+    """
+    Keeps parsed libraries (LibrarySession + LibraryIndex) resident and answers JSON‐RPC 2.0
+    requests against them. Every method takes the library 'path' first; the library is
+    loaded on first use and reloaded when it changed on disk and has no unsaved changes.
+
+      Queries:  list_packages, list_symbols, list_devicesets, list_templates, get_deviceset,
+                query, validate
+      Writes:   add_or_merge_deviceset, set_technologies, save (under the library lock,
+                see LibrarySession)
+      Other:    close, ping
+
+    All requests go through one lock, so writes are serialized in this process and never
+    interleave with reads. Query results are cached per library until its next write.
+    handle() accepts a single request or a batch (a JSON array), as the spec describes.
+    """
+
+    METHODS = (
+        "ping", "close", "list_packages", "list_symbols", "list_devicesets", "list_templates",
+        "get_deviceset", "query", "validate", "add_or_merge_deviceset", "set_technologies", "save",
+    )
+
+    def __init__(self):
+        self.sessions = {}    # { abs path : LibrarySession }
+        self.cache = {}       # { abs path : { key : result } }, dropped on every write
+        self.lock = threading.RLock()
+
+    # ─── Dispatch ───
+
+    def handle(self, payload):
+        """
+        Answer one decoded JSON‐RPC payload. Returns the response object (a list for a
+        batch), or None when there is nothing to send back (only notifications).
+        """
+        if isinstance(payload, list):
+            if not payload:
+                return self._error(None, INVALID_REQUEST, "Empty batch")
+            responses = [r for r in (self._handle_one(req) for req in payload) if r is not None]
+            return responses or None
+        return self._handle_one(payload)
+
+    def handle_text(self, text):
+        """
+        Same as handle(), from and to JSON text ("" when there is no response).
+        """
+        try:
+            payload = json.loads(text)
+        except ValueError as e:
+            response = self._error(None, PARSE_ERROR, f"Parse error: {e}")
+        else:
+            response = self.handle(payload)
+        return "" if response is None else json.dumps(response)
+
+    def _handle_one(self, req):
+        if not isinstance(req, dict) or req.get("jsonrpc") != "2.0" or not isinstance(req.get("method"), str):
+            return self._error(req.get("id") if isinstance(req, dict) else None, INVALID_REQUEST, "Invalid request")
+        response = self._call(req)
+        # A notification (no "id") is executed but never answered, not even with an error
+        return response if "id" in req else None
+
+    def _call(self, req):
+        req_id = req.get("id")
+        method = req["method"]
+        params = req.get("params", [])
+        if method not in self.METHODS:
+            return self._error(req_id, METHOD_NOT_FOUND, f"Unknown method '{method}'")
+        if not isinstance(params, (list, dict)):
+            return self._error(req_id, INVALID_PARAMS, "params must be an array or object")
+
+        func = getattr(self, "rpc_" + method)
+        # Check the params against the signature up front, so a TypeError raised inside a
+        # method is reported as the server error it is
+        try:
+            bound = inspect.signature(func).bind(*params) if isinstance(params, list) \
+                else inspect.signature(func).bind(**params)
+        except TypeError as e:
+            return self._error(req_id, INVALID_PARAMS, str(e))
+        try:
+            with self.lock:
+                result = func(*bound.args, **bound.kwargs)
+        except Exception as e:
+            return self._error(req_id, SERVER_ERROR, f"{type(e).__name__}: {e}")
+        return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+    @staticmethod
+    def _error(req_id, code, message):
+        return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+    # ─── Sessions ───
+
+    def _session(self, path):
+        key = os.path.abspath(path)
+        session = self.sessions.get(key)
+        if session is not None and not session.journal and session.changed_on_disk():
+            session = None    # someone saved it; nothing of ours to keep
+        if session is None:
+            session = LibrarySession.open(key)
+            self.sessions[key] = session
+            self.cache.pop(key, None)
+        return session
+
+    def _cached(self, path, key, compute):
+        session = self._session(path)
+        cache = self.cache.setdefault(session.path, {})
+        if key not in cache:
+            cache[key] = compute(session.tree)
+        return cache[key]
+
+    # ─── Methods ───
+
+    def rpc_ping(self):
+        return "pong"
+
+    def rpc_close(self, path):
+        """
+        Forget a library (unsaved changes are dropped). Returns whether it was open.
+        """
+        key = os.path.abspath(path)
+        self.cache.pop(key, None)
+        return self.sessions.pop(key, None) is not None
+
+    def rpc_list_packages(self, path):
+        return self._cached(path, "packages", XMLHandler.list_packages)
+
+    def rpc_list_symbols(self, path):
+        return self._cached(path, "symbols", XMLHandler.list_symbols)
+
+    def rpc_list_devicesets(self, path):
+        return self._cached(path, "devicesets", lambda tree: [
+            ds.get("name", "") for ds in tree.getroot().iterfind("./drawing/library/devicesets/deviceset")
+        ])
+
+    def rpc_list_templates(self, path):
+        """
+        [{ name, gates: {gate: symbol}, packages: [...] }] of the template devicesets,
+        the default one first.
+        """
+        index = LibraryIndex.for_tree(self._session(path).tree)
+        return [
+            {"name": name, "gates": dict(tpl.gate_symbols), "packages": list(tpl.devices)}
+            for name, tpl in ((name, index.template(name)) for name in index.template_names())
+        ]
+
+    def rpc_get_deviceset(self, path, name):
+        """
+        { name, prefix, gates: {gate: symbol}, devices: [{name, package, technologies:
+        {technology: {attribute: value}}}] }, or None if there is no such deviceset.
+        """
+        ds = XMLHandler.get_existing_deviceset(self._session(path).tree, name)
+        if ds is None:
+            return None
+        return {
+            "name": ds.get("name", ""),
+            "prefix": ds.get("prefix", ""),
+            "gates": XMLHandler.gate_symbol_map(ds.find("gates")),
+            "devices": [
+                {
+                    "name": dev.get("name", ""),
+                    "package": dev.get("package", ""),
+                    "technologies": {
+                        tech.get("name", ""): {a.get("name"): a.get("value", "") for a in tech.iterfind("attribute")}
+                        for tech in dev.iterfind("technologies/technology")
+                    },
+                }
+                for dev in ds.iterfind("devices/device")
+            ],
+        }
+
+    @staticmethod
+    def _device_rows(tree):
+        rows = []
+        for ds in tree.getroot().iterfind("./drawing/library/devicesets/deviceset"):
+            for device, package, technology, attrs in XMLHandler.technology_rows(ds):
+                row = [ds.get("name", ""), device, technology, package,
+                       attrs.get("LCSC_PART", ""), attrs.get("VALUE", ""), attrs.get("DESCRIPTION", "")]
+                rows.append((" ".join(row).lower(), row))
+        return rows
+
+    def rpc_query(self, path, text, limit=100):
+        """
+        Technologies whose deviceset, device, technology, package, LCSC_PART, VALUE or
+        DESCRIPTION contain every whitespace‐separated term of 'text' (case‐insensitive), as
+        [deviceset, device, technology, package, lcsc, value, description] rows.
+        """
+        terms = text.lower().split()
+        result = []
+        for haystack, row in self._cached(path, "device_rows", self._device_rows):
+            if all(term in haystack for term in terms):
+                result.append(row)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def rpc_validate(self, path):
+        return [list(problem) for problem in XMLHandler.validate(self._session(path).tree)]
+
+    def rpc_add_or_merge_deviceset(self, path, name, prefix, packages, symbol=None, template=None):
+        """
+        packages: { package_name : { "value", "desc", "lcsc" } }; template: template deviceset
+        for a new deviceset (default: DEVICE_NAME). Applied in memory and journaled; call
+        save to write it. Returns the connect warnings.
+        """
+        session = self._session(path)
+        warnings = []
+        session.apply(f"Add/merge deviceset {name}", XMLHandler.add_or_merge_deviceset,
+                      name, prefix, packages, symbol_name=symbol, warnings=warnings, template=template)
+        self.cache.pop(session.path, None)
+        return warnings
+
+    def rpc_set_technologies(self, path, name, prefix, rows, symbol=None, template=None):
+        """
+        rows: [[package, technology, { "value", "desc", "lcsc" }], …] — value variants as
+        technologies of one deviceset (see XMLHandler.set_technologies). Applied in memory
+        and journaled. Returns { added, updated, warnings }.
+        """
+        session = self._session(path)
+        warnings = []
+        added, updated = session.apply(
+            f"Set technologies of {name}", XMLHandler.set_technologies,
+            name, prefix, [tuple(row) for row in rows], symbol_name=symbol, warnings=warnings,
+            template=template,
+        )
+        self.cache.pop(session.path, None)
+        return {"added": added, "updated": updated, "warnings": warnings}
+
+    def rpc_save(self, path):
+        """
+        Save pending changes. Returns the changes that had to be re‐applied onto a newer
+        version of the file (see LibrarySession.save).
+        """
+        session = self._session(path)
+        replayed = session.save()
+        self.cache.pop(session.path, None)
+        return replayed
+
+
+class _RPCRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST “/” only, and only from a local client that knows the server's token. Browsers
+    can't be used to reach it: a page can't set the token header without a CORS preflight
+    (which is never answered), cross‐origin requests carry an Origin header, and a DNS‐
+    rebound name doesn't pass the loopback Host check.
+    """
+
+    protocol_version = "HTTP/1.1"    # keep‐alive: clients reuse one connection
+    disable_nagle_algorithm = True   # headers and body are separate writes; don't wait 40 ms for an ACK
+
+    def _refusal(self):
+        """
+        (HTTP status, reason) if the request must be refused, else None.
+        """
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return 415, "Content-Type must be application/json"
+        if "Origin" in self.headers:
+            return 403, "Cross-origin requests are not accepted"
+        host = self.headers.get("Host", "")
+        host = host[1:host.find("]")] if host.startswith("[") else host.rsplit(":", 1)[0]
+        if host.lower() not in _LOOPBACK_HOSTS:
+            return 403, "Host must be a loopback address"
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), self.server.token):
+            return 403, f"Missing or wrong {TOKEN_HEADER}"
+        return None
+
+    def _reply(self, status, data=b"", content_type="application/json"):
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _refuse(self, status, reason):
+        self.close_connection = True    # the body may not have been read
+        self._reply(status, reason.encode("utf-8"), "text/plain; charset=utf-8")
+
+    def do_POST(self):
+        length = self.headers.get("Content-Length", "")
+        if not (length.isascii() and length.isdigit()):
+            self._refuse(400 if length else 411, "Content-Length must be a non-negative integer")
+            return
+        if int(length) > SERVER_MAX_BODY:
+            self._refuse(413, f"Request body larger than {SERVER_MAX_BODY} bytes")
+            return
+        payload = self.rfile.read(int(length))    # read it anyway, to keep the connection usable
+        refusal = self._refusal()
+        if refusal is not None:
+            self._refuse(*refusal)
+            return
+        try:
+            text = payload.decode("utf-8")
+        except UnicodeDecodeError:
+            self._refuse(400, "Request body must be UTF-8")
+            return
+        body = self.server.service.handle_text(text)
+        if body:
+            self._reply(200, body.encode("utf-8"))
+        else:
+            self._reply(204)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_server(host=SERVER_HOST, port=SERVER_PORT, service=None, token=None):
+    """
+    Create (but don't start) the HTTP JSON‐RPC server; POST requests to “/”.
+    Use port=0 to pick a free port (see server.server_address). Requests must send
+    'token' (default: a new random one, see server.token) in the X-Library-Token header.
+    """
+    server = ThreadingHTTPServer((host, port), _RPCRequestHandler)
+    server.service = service or LibraryService()
+    server.token = token or secrets.token_urlsafe(32)
+    return server
+
+
+def write_token(token, path=SERVER_TOKEN_FILE):
+    """
+    Store the running server's token where LibraryClient looks for it, readable only by
+    the current user.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+
+
+def read_token(path=SERVER_TOKEN_FILE):
+    """
+    The token written by the running server, or "" if there is none.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+class RPCError(RuntimeError):
+    def __init__(self, error):
+        super().__init__(f"{error.get('message')} (code {error.get('code')})")
+        self.code = error.get("code")
+
+
+class LibraryClient:
+    """
+    Client for LibraryService. Talks HTTP to a running “eagle_editor.py serve”, or, given
+    service=LibraryService(), calls it in‐process (same protocol, no socket):
+
+      client = LibraryClient()                           # http://127.0.0.1:SERVER_PORT
+                                                         # (token from SERVER_TOKEN_FILE)
+      client.call("list_packages", path)
+      client.batch([("get_deviceset", [path, "10K"]), ("query", [path, "0603 10k"])])
+    """
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, service=None, token=None):
+        self.host = host
+        self.port = port
+        self.service = service
+        self.token = token
+        self.conn = None
+        self._next_id = 0
+
+    def _send(self, payload):
+        if self.service is not None:
+            return json.loads(self.service.handle_text(json.dumps(payload)) or "null")
+        import http.client
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port)
+        if self.token is None:
+            self.token = read_token()
+        body = json.dumps(payload).encode("utf-8")
+        self.conn.request("POST", "/", body, {"Content-Type": "application/json", TOKEN_HEADER: self.token})
+        response = self.conn.getresponse()
+        data = response.read()
+        if response.status >= 400:
+            self.close()
+            raise RPCError({"code": response.status, "message": data.decode("utf-8", "replace")})
+        return json.loads(data) if data else None
+
+    def _request(self, method, params):
+        self._next_id += 1
+        return {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+
+    @staticmethod
+    def _result(response):
+        if "error" in response:
+            raise RPCError(response["error"])
+        return response["result"]
+
+    def call(self, method, *args, **kwargs):
+        """
+        Call one method with positional or keyword parameters (JSON‐RPC allows one kind).
+        """
+        if args and kwargs:
+            raise RuntimeError("Pass either positional or keyword parameters, not both.")
+        return self._result(self._send(self._request(method, kwargs or list(args))))
+
+    def batch(self, calls):
+        """
+        Send [(method, params), …] in one round trip; returns the results in order.
+        Raises RPCError for the first call that failed.
+        """
+        if not calls:
+            return []
+        requests = [self._request(method, params) for method, params in calls]
+        by_id = {r["id"]: r for r in self._send(requests)}
+        return [self._result(by_id[req["id"]]) for req in requests]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,27 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.sample_library import write_sample_library
+from core.xml_handler import XMLHandler
+
+
+@pytest.fixture
+def sample_path(tmp_path):
+    """
+    A small synthetic library on disk (see core/sample_library.py): packages P0000…P0007,
+    the RESISTOR/CAPACITOR symbols, DEVICE_NAME and devicesets 1K…4K.
+    """
+    path = tmp_path / "library.lbr"
+    write_sample_library(str(path), n_packages=8, n_devicesets=4)
+    return str(path)
+
+
+@pytest.fixture
+def sample_tree(sample_path):
+    return XMLHandler.parse_library(sample_path)
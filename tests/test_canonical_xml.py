@@ -0,0 +1,44 @@
+# tests/test_canonical_xml.py
+
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from core.canonical_xml import CanonicalWriter
+from core.xml_handler import XMLHandler
+
+
+def test_round_trip_is_stable(sample_path, tmp_path):
+    first, second = str(tmp_path / "first.lbr"), str(tmp_path / "second.lbr")
+    XMLHandler.save_library(XMLHandler.parse_library(sample_path), first)
+    XMLHandler.save_library(XMLHandler.parse_library(first), second)
+    assert open(first, "rb").read() == open(second, "rb").read()
+    text = open(first, encoding="utf-8").read()
+    assert text.startswith('<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE eagle SYSTEM "eagle.dtd">')
+
+
+def test_streaming_normalize_matches_write_tree(sample_path, tmp_path):
+    written = str(tmp_path / "written.lbr")
+    XMLHandler.save_library(XMLHandler.parse_library(sample_path), written)
+    out = io.StringIO()
+    CanonicalWriter().normalize(sample_path, out)
+    assert out.getvalue() == open(written, encoding="utf-8").read()
+
+
+def test_attribute_order_follows_the_dtd(tmp_path):
+    path = str(tmp_path / "one.lbr")
+    root = ET.Element("eagle", version="9.6.2")
+    lib = ET.SubElement(ET.SubElement(root, "drawing"), "library")
+    ET.SubElement(ET.SubElement(lib, "devicesets"), "deviceset", uservalue="yes", prefix="R", name="1K")
+    CanonicalWriter().write_tree(ET.ElementTree(root), path)
+    assert '<deviceset name="1K" prefix="R" uservalue="yes"' in open(path, encoding="utf-8").read()
+
+
+def test_failed_write_keeps_the_previous_file(sample_path, monkeypatch):
+    before = open(sample_path, "rb").read()
+    tree = XMLHandler.parse_library(sample_path)
+    monkeypatch.setattr(CanonicalWriter, "_write_element", lambda *args: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        XMLHandler.save_library(tree, sample_path)
+    assert open(sample_path, "rb").read() == before
@@ -0,0 +1,78 @@
+# tests/test_compressed_io.py
+
+import gzip
+import importlib.util
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from core.compressed_io import compression_of, library_name, open_library
+from core.library_catalog import LibraryCatalog
+from core.xml_handler import XMLHandler
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("path, compression, name", [
+    ("/libs/passives.lbr", None, "passives"),
+    ("/libs/passives.lbr.gz", "gzip", "passives"),
+    ("/libs/Passives.LBR.ZST", "zstd", "Passives"),
+    ("board.sch.gz", "gzip", "board.sch"),
+    ("notes.txt", None, "notes.txt"),
+])
+def test_compression_and_library_name(path, compression, name):
+    assert compression_of(path) == compression
+    assert library_name(path) == name
+
+
+def test_gzip_round_trip_is_byte_identical_and_deterministic(sample_tree, tmp_path):
+    plain, packed = str(tmp_path / "lib.lbr"), str(tmp_path / "lib.lbr.gz")
+    XMLHandler.save_library(sample_tree, plain)
+    XMLHandler.save_library(sample_tree, packed)
+    assert gzip.decompress(_read(packed)) == _read(plain)
+
+    first = _read(packed)
+    XMLHandler.save_library(XMLHandler.parse_library(packed), packed)
+    assert _read(packed) == first    # no name or time stamp in the gzip header
+    with open_library(packed) as f:
+        assert f.read() == _read(plain)
+
+
+def test_catalog_reads_gzip_like_plain(sample_tree, tmp_path):
+    plain, packed = str(tmp_path / "lib.lbr"), str(tmp_path / "lib.lbr.gz")
+    XMLHandler.save_library(sample_tree, plain)
+    XMLHandler.save_library(sample_tree, packed)
+    a, b = LibraryCatalog.load(plain, workers=1), LibraryCatalog.load(packed)
+    assert (a.packages, a.symbols, a.devicesets) == (b.packages, b.symbols, b.devicesets)
+
+
+def test_compression_override_and_bad_mode(sample_tree, tmp_path):
+    path = str(tmp_path / "lib.lbr")
+    XMLHandler.save_library(sample_tree, path, compression="gzip")
+    assert _read(path)[:2] == b"\x1f\x8b"
+    with open_library(path, compression="gzip") as f:
+        assert ET.parse(f).getroot().find("./drawing/library/packages") is not None
+    with pytest.raises(ValueError):
+        open_library(path, "r")
+
+
+def test_zstd_without_a_codec_raises(sample_tree, tmp_path, monkeypatch):
+    for module in ("compression", "compression.zstd", "zstandard"):
+        monkeypatch.setitem(sys.modules, module, None)
+    with pytest.raises(RuntimeError, match="zstandard"):
+        XMLHandler.save_library(sample_tree, str(tmp_path / "lib.lbr.zst"))
+    assert not (tmp_path / "lib.lbr.zst").exists() and not (tmp_path / "lib.lbr.zst.tmp").exists()
+
+
+@pytest.mark.skipif(importlib.util.find_spec("zstandard") is None and sys.version_info < (3, 14),
+                    reason="needs zstandard or Python 3.14+")
+def test_zstd_round_trip(sample_tree, tmp_path):
+    plain, packed = str(tmp_path / "lib.lbr"), str(tmp_path / "lib.lbr.zst")
+    XMLHandler.save_library(sample_tree, plain)
+    XMLHandler.save_library(sample_tree, packed)
+    with open_library(packed) as f:
+        assert f.read() == _read(plain)
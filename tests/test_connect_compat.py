@@ -0,0 +1,52 @@
+# tests/test_connect_compat.py
+
+import xml.etree.ElementTree as ET
+
+from core.library_index import LibraryIndex
+from core.xml_handler import XMLHandler
+
+PACKAGE = {"value": "1u", "desc": "CAP 1u", "lcsc": "C15849"}
+
+
+def _set_connect_pins(tree, package, pins):
+    """
+    Rewire every device of 'package' to the given pins (gate G$1).
+    """
+    for dev in tree.getroot().iterfind(f".//devices/device[@package='{package}']"):
+        for connect, pin in zip(dev.iterfind("connects/connect"), pins):
+            connect.set("pin", pin)
+    LibraryIndex.for_tree(tree).invalidate()
+
+
+def _add_symbol(tree, name, pins):
+    sym = ET.SubElement(tree.getroot().find("./drawing/library/symbols"), "symbol", name=name)
+    for pin in pins:
+        ET.SubElement(sym, "pin", name=pin)
+    LibraryIndex.for_tree(tree).add_symbol(sym)
+
+
+def test_compatible_device_is_cloned(sample_tree):
+    ds = XMLHandler.add_or_merge_deviceset(sample_tree, "1u", "C", {"P0003": PACKAGE}, symbol_name="CAPACITOR")
+    connects = ds.findall("devices/device/connects/connect")
+    assert [(c.get("pin"), c.get("pad")) for c in connects] == [("1", "1"), ("2", "2")]
+
+
+def test_incompatible_connects_are_not_cloned(sample_tree):
+    # Every existing P0003 device wires pins the new symbol doesn't have
+    _set_connect_pins(sample_tree, "P0003", ["X", "Y"])
+    _add_symbol(sample_tree, "POLCAP", ["+", "-"])
+    warnings = []
+    ds = XMLHandler.add_or_merge_deviceset(sample_tree, "1u", "C", {"P0003": PACKAGE},
+                                           symbol_name="POLCAP", warnings=warnings)
+    # Generated from the rule table (+ → 1, - → 2) instead of copying pins X/Y
+    connects = ds.findall("devices/device/connects/connect")
+    assert [(c.get("pin"), c.get("pad")) for c in connects] == [("+", "1"), ("-", "2")]
+    assert warnings and "rule table" in warnings[0]
+
+
+def test_device_without_connects_is_no_match(sample_tree):
+    index = LibraryIndex.for_tree(sample_tree)
+    dev = index.device_variants("P0003")[0]
+    empty = ET.Element("device", name="P0003", package="P0003")
+    assert XMLHandler._score_connects(dev, {"G$1": "RESISTOR"}, index) == 2
+    assert XMLHandler._score_connects(empty, {"G$1": "RESISTOR"}, index) is None
@@ -0,0 +1,49 @@
+# tests/test_connect_synth.py
+
+import xml.etree.ElementTree as ET
+
+from core.connect_synth import ConnectSynthesizer
+from core.library_index import LibraryIndex
+from core.xml_handler import XMLHandler
+
+PACKAGE = {"value": "LED", "desc": "LED red", "lcsc": "C2286"}
+
+
+def _add(tree, kind, name, terminals):
+    """
+    Add a <package> with those <smd> pads, or a <symbol> with those pins.
+    """
+    elem = ET.SubElement(tree.getroot().find(f"./drawing/library/{kind}s"), kind, name=name)
+    for terminal in terminals:
+        ET.SubElement(elem, "smd" if kind == "package" else "pin", name=terminal)
+    index = LibraryIndex.for_tree(tree)
+    index.add_package(elem) if kind == "package" else index.add_symbol(elem)
+
+
+def test_strategies(sample_tree):
+    _add(sample_tree, "symbol", "LED", ["A", "K"])
+    _add(sample_tree, "package", "NUMBERED", ["2", "1"])
+    _add(sample_tree, "package", "LETTERED", ["P2", "P1"])
+    _add(sample_tree, "package", "THREE", ["X", "Y", "Z"])
+
+    assert ConnectSynthesizer.plan(sample_tree, {"G$1": "RESISTOR"}, "NUMBERED") == (
+        "exact name", [("G$1", "1", "1"), ("G$1", "2", "2")])
+    assert ConnectSynthesizer.plan(sample_tree, {"G$1": "LED"}, "NUMBERED") == (
+        "rule table", [("G$1", "A", "1"), ("G$1", "K", "2")])
+    assert ConnectSynthesizer.plan(sample_tree, {"G$1": "RESISTOR"}, "LETTERED") == (
+        "numeric order", [("G$1", "1", "P1"), ("G$1", "2", "P2")])
+    assert ConnectSynthesizer.plan(sample_tree, {"G$1": "RESISTOR"}, "THREE") is None
+
+
+def test_numeric_guess_is_reported_pin_by_pin(sample_tree):
+    _add(sample_tree, "package", "LETTERED", ["P2", "P1"])
+    warnings = []
+    ds = XMLHandler.add_or_merge_deviceset(sample_tree, "LED1", "D", {"LETTERED": PACKAGE}, warnings=warnings)
+    assert len(ds.findall("devices/device/connects/connect")) == 2
+    assert len(warnings) == 1 and "1→P1, 2→P2" in warnings[0]
+
+
+def test_numeric_guess_is_not_used_silently(sample_tree):
+    _add(sample_tree, "package", "LETTERED", ["P2", "P1"])
+    ds = XMLHandler.add_or_merge_deviceset(sample_tree, "LED1", "D", {"LETTERED": PACKAGE})
+    assert ds.findall("devices/device/connects/connect") == []
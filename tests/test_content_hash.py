@@ -0,0 +1,36 @@
+# tests/test_content_hash.py
+
+import xml.etree.ElementTree as ET
+
+from core.content_hash import ContentHasher
+from core.library_index import LibraryIndex
+from core.sample_library import write_sample_library
+from core.xml_handler import XMLHandler
+
+
+def _hash(xml):
+    return ContentHasher.element_hash(ET.fromstring(xml))
+
+
+def test_hash_ignores_name_description_order_and_number_format():
+    a = _hash('<package name="A"><description>x</description>'
+              '<smd name="1" x="-0.80" y="0" dx="0.6" dy="0.7" layer="1"/><wire x1="0" y1="0" x2="1" y2="0" width="0.1" layer="21"/></package>')
+    b = _hash('<package name="B">'
+              '<wire layer="21" width="0.1" x1="0" y1="0" x2="1" y2="0"/>\n  <smd x="-0.8" name="1" y="0" dx="0.6" dy="0.7" layer="1"/></package>')
+    c = _hash('<package name="C"><smd name="1" x="-0.9" y="0" dx="0.6" dy="0.7" layer="1"/>'
+              '<wire x1="0" y1="0" x2="1" y2="0" width="0.1" layer="21"/></package>')
+    assert a == b != c
+
+
+def test_duplicates_and_merge(tmp_path):
+    path = str(tmp_path / "dups.lbr")
+    write_sample_library(path, n_packages=14, n_devicesets=6)    # P0012/P0013 repeat P0000/P0001
+    tree = XMLHandler.parse_library(path)
+    assert [["P0000", "P0012"], ["P0001", "P0013"]] == XMLHandler.find_duplicates(tree, "package")
+    assert ContentHasher.hash_file(path)["package"] == LibraryIndex.for_tree(tree).content_hashes("package")
+
+    mapping = XMLHandler.merge_duplicates(tree, "package")
+    assert set(mapping) | set(mapping.values()) == {"P0000", "P0012", "P0001", "P0013"}
+    used = {dev.get("package") for dev in tree.getroot().iter("device")}
+    assert not used & set(mapping)
+    assert XMLHandler.validate(tree) == []
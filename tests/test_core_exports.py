@@ -0,0 +1,31 @@
+# tests/test_core_exports.py
+
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+import core
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_core_loads_no_submodules():
+    code = "import sys, core; print(sorted(m for m in sys.modules if m.startswith('core.')))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize("name", core.__all__)
+def test_every_export_resolves_to_its_module(name):
+    value = getattr(core, name)
+    assert value is getattr(importlib.import_module(core._EXPORTS[name]), name)
+    assert name in dir(core)
+
+
+def test_unknown_name_raises_attribute_error():
+    with pytest.raises(AttributeError, match="no attribute 'Nope'"):
+        core.Nope
+    assert not hasattr(core, "Nope")
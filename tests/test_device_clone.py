@@ -0,0 +1,46 @@
+# tests/test_device_clone.py
+
+import copy
+import xml.etree.ElementTree as ET
+
+import core.xml_handler
+from core.library_index import LibraryIndex
+from core.xml_handler import XMLHandler
+
+ATTRIBUTES = {"DESCRIPTION": "RES 47K", "LCSC_PART": "C1234", "VALUE": "47K"}
+
+
+def _device(tree, ds_name="1K"):
+    return XMLHandler.get_existing_deviceset(tree, ds_name).find("devices/device")
+
+
+def test_clone_is_specialized_and_leaves_the_prototype_alone(sample_tree):
+    proto = _device(sample_tree)
+    before = ET.tostring(proto)
+    clone = XMLHandler._clone_device(proto, "P0007", ATTRIBUTES)
+
+    assert ET.tostring(proto) == before
+    assert (clone.get("name"), clone.get("package")) == ("P0007", "P0007")
+    tech = clone.find("technologies/technology")
+    assert {a.get("name"): a.get("value") for a in tech.iter("attribute")} == ATTRIBUTES
+    assert ET.tostring(clone.find("connects")) == ET.tostring(proto.find("connects"))
+    # Nothing is shared with the prototype
+    clone.find("connects/connect").set("pad", "X")
+    assert ET.tostring(proto) == before
+
+
+def test_copy_matches_deepcopy(sample_tree):
+    proto = _device(sample_tree)
+    assert ET.tostring(XMLHandler._copy(proto)) == ET.tostring(copy.deepcopy(proto))
+
+
+def test_sorted_insert_bisects_the_children(sample_tree, monkeypatch):
+    monkeypatch.setattr(core.xml_handler, "SORT_DEVICESETS", True)
+    ds_parent = sample_tree.getroot().find("./drawing/library/devicesets")
+    # Sorted, with a duplicate name (which a set of names would merge)
+    ds_parent[:] = sorted(ds_parent, key=lambda ds: LibraryIndex.sort_key(ds.get("name")))
+    ds_parent.insert(0, ET.Element("deviceset", name="1K"))
+    XMLHandler.insert_deviceset(sample_tree, ds_parent, ET.Element("deviceset", name="2K5"))
+    names = [ds.get("name") for ds in ds_parent]
+    assert names == sorted(names, key=LibraryIndex.sort_key)
+    assert names.index("2K5") == names.index("2K") + 1
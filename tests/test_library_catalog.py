@@ -0,0 +1,54 @@
+# tests/test_library_catalog.py
+
+import core.library_catalog as library_catalog
+from core.library_catalog import LibraryCatalog, find_sections, parse_chunk, split_section
+from core.library_index import LibraryIndex
+from core.sample_library import write_sample_library
+from core.xml_handler import XMLHandler
+
+
+def _assert_matches_tree(catalog, tree):
+    index = LibraryIndex.for_tree(tree)
+    assert catalog.list_packages() == XMLHandler.list_packages(tree)
+    assert catalog.list_symbols() == XMLHandler.list_symbols(tree)
+    assert catalog.content_hashes("package") == index.content_hashes("package")
+    assert catalog.content_hashes("symbol") == index.content_hashes("symbol")
+    root = tree.getroot()
+    assert set(catalog.devicesets) == {ds.get("name") for ds in root.iter("deviceset")}
+    prefix, gates, devices = catalog.devicesets["1K"]
+    ds = index.deviceset("1K")
+    assert prefix == "R" and gates == (("G$1", "RESISTOR"),)
+    assert [(name, package) for name, package, _ in devices] == [
+        (dev.get("name"), dev.get("package")) for dev in ds.iterfind("devices/device")]
+
+
+def test_catalog_matches_full_parse(sample_path, sample_tree):
+    _assert_matches_tree(LibraryCatalog.load(sample_path, workers=1), sample_tree)
+    assert LibraryCatalog.load(sample_path, workers=1).packages["P0000"][0] == ("1", "2")
+
+
+def test_split_section_cuts_at_element_boundaries(tmp_path):
+    path = str(tmp_path / "big.lbr")
+    write_sample_library(path, n_packages=50, n_devicesets=10)
+    start, end = find_sections(path)["packages"]
+    chunks = split_section(path, "packages", start, end, 4)
+    assert len(chunks) == 4 and chunks[0][0] == start and chunks[-1][1] == end
+    names = [row[0] for a, b in chunks for row in parse_chunk(path, "packages", a, b)]
+    assert names == [f"P{i:04d}" for i in range(50)]
+
+
+def test_parallel_load_matches_full_parse(tmp_path, monkeypatch):
+    path = str(tmp_path / "big.lbr")
+    write_sample_library(path, n_packages=50, n_devicesets=20)
+    monkeypatch.setattr(library_catalog, "PARALLEL_MIN_BYTES", 1)
+    _assert_matches_tree(LibraryCatalog.load(path, workers=2), XMLHandler.parse_library(path))
+
+
+def test_sections_subset_and_missing_sections(sample_path, tmp_path):
+    catalog = LibraryCatalog.load(sample_path, sections=("packages",), workers=1)
+    assert catalog.packages and not catalog.symbols and not catalog.devicesets
+
+    empty = tmp_path / "empty.lbr"
+    empty.write_text('<eagle><drawing><library><packages/></library></drawing></eagle>', encoding="utf-8")
+    assert find_sections(str(empty)) == {}
+    assert LibraryCatalog.load(str(empty), workers=1).list_packages() == []
@@ -0,0 +1,73 @@
+# tests/test_library_import.py
+
+import copy
+
+import pytest
+
+from core.library_import import LibraryImporter
+from core.xml_handler import XMLHandler
+
+
+def _source(sample_tree, dx=None):
+    """
+    A copy of the sample library whose DEVICE_NAME is called NEW (so it doesn't collide),
+    optionally with a different P0000 footprint.
+    """
+    src = copy.deepcopy(sample_tree)
+    root = src.getroot()
+    root.find("./drawing/library/devicesets/deviceset[@name='DEVICE_NAME']").set("name", "NEW")
+    if dx is not None:
+        root.find("./drawing/library/packages/package[@name='P0000']/smd").set("dx", dx)
+    return src
+
+
+def _packages(tree):
+    return [p.get("name") for p in tree.getroot().iterfind("./drawing/library/packages/package")]
+
+
+def _devices(tree, ds_name):
+    ds = tree.getroot().find(f"./drawing/library/devicesets/deviceset[@name='{ds_name}']")
+    return None if ds is None else [dev.get("package") for dev in ds.iterfind("devices/device")]
+
+
+def test_identical_elements_are_reused(sample_tree):
+    report = LibraryImporter.import_devicesets(sample_tree, _source(sample_tree), policy="skip")
+    assert report["added"] == ["deviceset NEW"]
+    assert "package P0000" in report["reused"] and "symbol RESISTOR" in report["reused"]
+    assert sorted(report["skipped"]) == ["deviceset 1K", "deviceset 2K", "deviceset 3K", "deviceset 4K"]
+    assert len(_packages(sample_tree)) == 8
+    assert XMLHandler.validate(sample_tree) == []
+
+
+def test_skip_refuses_deviceset_with_conflicting_package(sample_tree):
+    before = {kind: XMLHandler.find_unused(sample_tree, kind) for kind in ("package", "symbol")}
+    report = LibraryImporter.import_devicesets(sample_tree, _source(sample_tree, dx="0.9"), ["NEW"], "skip")
+    assert report["added"] == []
+    assert "package P0000: differs from the destination's (use rename or replace)" in report["conflict"]
+    assert any(line.startswith("deviceset NEW: not imported, needs P0000") for line in report["conflict"])
+    assert _devices(sample_tree, "NEW") is None
+    # Nothing was copied for the refused deviceset
+    assert {kind: XMLHandler.find_unused(sample_tree, kind) for kind in before} == before
+
+
+def test_rename_imports_conflicting_package_under_free_name(sample_tree):
+    report = LibraryImporter.import_devicesets(sample_tree, _source(sample_tree, dx="0.9"), ["NEW"], "rename")
+    assert report["renamed"] == ["package P0000 → P0000_1"]
+    assert _devices(sample_tree, "NEW")[0] == "P0000_1"
+    assert sample_tree.getroot().find(
+        "./drawing/library/packages/package[@name='P0000']/smd").get("dx") == "0.6"
+    assert XMLHandler.validate(sample_tree) == []
+
+
+def test_replace_overwrites_conflicting_package(sample_tree):
+    report = LibraryImporter.import_devicesets(sample_tree, _source(sample_tree, dx="0.9"), ["NEW"], "replace")
+    assert report["replaced"] == ["package P0000"]
+    assert _packages(sample_tree).count("P0000") == 1
+    assert sample_tree.getroot().find(
+        "./drawing/library/packages/package[@name='P0000']/smd").get("dx") == "0.9"
+    assert _devices(sample_tree, "NEW")[0] == "P0000"
+
+
+def test_unknown_policy_raises(sample_tree):
+    with pytest.raises(RuntimeError, match="Unknown collision policy"):
+        LibraryImporter.import_devicesets(sample_tree, _source(sample_tree), policy="merge")
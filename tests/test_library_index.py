@@ -0,0 +1,46 @@
+# tests/test_library_index.py
+
+import copy
+
+from core.library_import import LibraryImporter
+from core.library_index import LibraryIndex, natural_key
+from core.value_series import ValueSeries
+from core.xml_handler import XMLHandler
+
+
+def test_natural_key_orders_numbers_numerically_and_ignores_case():
+    names = ["R10", "r2", "R1", "C0402", "C402", "pad 10", "pad 9", "R2"]
+    assert sorted(names, key=LibraryIndex.sort_key) == [
+        "C0402", "C402", "pad 9", "pad 10", "R1", "R2", "r2", "R10"]
+    assert natural_key("R2") == natural_key("r2")
+
+
+def test_sorted_names_are_maintained_through_edits(sample_tree):
+    index = LibraryIndex.for_tree(sample_tree)
+    for kind in ("package", "symbol", "deviceset"):
+        index.sorted_names(kind)    # build the tables before editing
+
+    src = copy.deepcopy(sample_tree)
+    src.getroot().find("./drawing/library/packages/package[@name='P0003']/smd").set("dx", "0.9")
+    src.getroot().find("./drawing/library/devicesets/deviceset[@name='DEVICE_NAME']").set("name", "NEW")
+    LibraryImporter.import_devicesets(sample_tree, src, ["NEW"], policy="rename")    # adds P0003_1
+    ValueSeries.generate(sample_tree, "E6", "10", "100", ["P0000"], lcsc_template="C{value}")
+    XMLHandler.rename(sample_tree, "package", "P0001", "P10")
+    XMLHandler.rename(sample_tree, "deviceset", "2K", "k2")
+    XMLHandler.prune_unused(sample_tree, "package")
+
+    fresh = LibraryIndex(sample_tree)
+    for kind in ("package", "symbol", "deviceset"):
+        assert index.sorted_names(kind) == fresh.sorted_names(kind)
+        assert index.sorted_keys(kind) == sorted(index.sorted_keys(kind))
+    assert "P0003_1" in index.sorted_names("package")
+    assert index.sorted_names("package")[-1] == "P10"
+    devicesets = index.sorted_names("deviceset")
+    assert devicesets[:4] == ["1K", "3K", "4K", "10R"] and "k2" in devicesets and "2K" not in devicesets
+
+
+def test_names_ignoring_case(sample_tree):
+    index = LibraryIndex.for_tree(sample_tree)
+    assert index.names_ignoring_case("deviceset", "1k") == ["1K"]
+    assert index.names_ignoring_case("package", "p0000") == ["P0000"]
+    assert index.names_ignoring_case("package", "P00") == []
@@ -0,0 +1,95 @@
+# tests/test_library_session.py
+
+import json
+import os
+import socket
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from core.library_session import LibraryLock, LibrarySession
+from core.xml_handler import XMLHandler
+
+PACKAGE = {"value": "10K", "desc": "RES 10K", "lcsc": "C25804"}
+
+
+def _dead_lock(path):
+    with open(path + ".lock", "w", encoding="utf-8") as f:
+        json.dump({"owner": "x", "pid": 2 ** 22 + 1, "host": socket.gethostname(), "time": 0}, f)
+
+
+def test_concurrent_saves_keep_both_changes(sample_path):
+    mine = LibrarySession.open(sample_path)
+    theirs = LibrarySession.open(sample_path)
+    theirs.apply("add 10K", XMLHandler.add_or_merge_deviceset, "10K", "R", {"P0001": PACKAGE})
+    assert theirs.save() == []
+
+    mine.apply("rename 1K", XMLHandler.rename_many, [("deviceset", "1K", "ONE")])
+    assert mine.save() == ["rename 1K"]
+    names = [ds.get("name") for ds in XMLHandler.parse_library(sample_path).getroot().iter("deviceset")]
+    assert "10K" in names and "ONE" in names and "1K" not in names
+    assert mine.journal == []
+
+
+def test_failed_replay_writes_nothing(sample_path):
+    mine = LibrarySession.open(sample_path)
+    theirs = LibrarySession.open(sample_path)
+    theirs.apply("rename 4K", XMLHandler.rename_many, [("deviceset", "4K", "QUAD")])
+    theirs.save()
+    on_disk = open(sample_path, "rb").read()
+
+    mine.apply("rename 2K", XMLHandler.rename_many, [("deviceset", "2K", "TWO")])
+    mine.apply("rename 4K", XMLHandler.rename_many, [("deviceset", "4K", "FOUR")])
+    before = ET.tostring(mine.tree.getroot())
+    with pytest.raises(RuntimeError, match="Could not replay 'rename 4K'"):
+        mine.save()
+    assert open(sample_path, "rb").read() == on_disk
+    assert ET.tostring(mine.tree.getroot()) == before
+    assert [label for label, *_ in mine.journal] == ["rename 2K", "rename 4K"]
+    assert not os.path.exists(sample_path + ".lock")
+
+
+def test_replay_does_not_repeat_warnings(sample_path):
+    def warn(tree, warnings=None):
+        warnings.append("check me")
+
+    mine = LibrarySession.open(sample_path)
+    theirs = LibrarySession.open(sample_path)    # someone else saves: forces a replay
+    theirs.apply("rename 3K", XMLHandler.rename_many, [("deviceset", "3K", "THREE")])
+    theirs.save()
+    warnings = []
+    mine.apply("warn", warn, warnings=warnings)
+    assert mine.save() == ["warn"]
+    assert warnings == ["check me"]
+
+
+def test_stale_lock_is_broken(sample_path):
+    _dead_lock(sample_path)
+    with LibraryLock(sample_path, timeout=1) as lock:
+        assert lock.read_holder()["pid"] == os.getpid()
+    assert not os.path.exists(sample_path + ".lock")
+
+
+def test_breaking_a_stale_lock_spares_a_fresh_one(sample_path):
+    _dead_lock(sample_path)
+    first = LibraryLock(sample_path, timeout=1)
+    first.acquire()    # broke the stale lock and took its own
+    # A second waiter that also saw the stale lock acts on that observation late
+    LibraryLock(sample_path)._break_stale()
+    assert first.read_holder()["pid"] == os.getpid()
+    with pytest.raises(RuntimeError, match="is locked by"):
+        LibraryLock(sample_path, timeout=0.3).acquire()
+    first.release()
+
+
+def test_failed_write_leaves_the_library_intact(sample_path, monkeypatch):
+    from core.canonical_xml import CanonicalWriter
+
+    session = LibrarySession.open(sample_path)
+    session.apply("rename", XMLHandler.rename_many, [("package", "P0001", "PX")])
+    on_disk = open(sample_path, "rb").read()
+    monkeypatch.setattr(CanonicalWriter, "_write_element", lambda *args: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        session.save()
+    assert open(sample_path, "rb").read() == on_disk
+    assert not os.path.exists(sample_path + ".tmp")
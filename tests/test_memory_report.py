@@ -0,0 +1,53 @@
+# tests/test_memory_report.py
+
+import sys
+import xml.etree.ElementTree as ET
+
+from core.memory_report import NOISE_FLOOR_BYTES, MemoryReport, deep_size
+
+
+def test_tree_sections_count_every_element_once(sample_tree):
+    rows = MemoryReport.tree_sections(sample_tree)
+    assert [r["section"] for r in rows] == ["packages", "symbols", "devicesets", "other"]
+    assert sum(r["elements"] for r in rows) == sum(1 for _ in sample_tree.getroot().iter())
+    packages = rows[0]
+    assert packages["elements"] == 8 * 5 and packages["per_element"] == round(packages["bytes"] / 40, 1)
+
+
+def test_index_tables_cover_every_table(sample_tree):
+    index = MemoryReport.build_index(sample_tree)
+    rows = {r["section"]: r for r in MemoryReport.index_tables(index)}
+    assert set(rows) == {"index." + name.lstrip("_") for name in vars(index) if name != "tree"}
+    assert rows["index.sorted"]["elements"] == 8 + 2 + 5
+    assert rows["index.content_hashes"]["elements"] == 8 + 2
+
+
+def test_deep_size_does_not_follow_elements():
+    elem = ET.Element("package", name="X" * 1000)
+    assert deep_size([elem]) == sys.getsizeof([elem])
+    assert deep_size(["abc", "abc"]) == sys.getsizeof(["abc", "abc"]) + sys.getsizeof("abc")
+
+
+def test_profile_rows_per_mode(sample_path):
+    rows = MemoryReport.profile(sample_path)
+    assert [r["mode"] for r in rows if r["section"] == "traced"] == list(MemoryReport.MODES)
+    sections = {(r["mode"], r["section"]) for r in rows}
+    assert ("tree", "devicesets") in sections and ("tree", "index.sorted") not in sections
+    assert ("indexed", "index.sorted") in sections
+    assert ("catalog", "catalog.packages") in sections
+    for r in rows:
+        if r["section"] == "traced":
+            assert r["bytes"] > 0
+    assert MemoryReport.format_table(rows).splitlines()[0].split() == [
+        "mode", "section", "elements", "bytes", "per_element"]
+
+
+def test_compare_ignores_noise_and_peaks():
+    base = [MemoryReport.row("tree", "packages", 10, 10 * NOISE_FLOOR_BYTES),
+            MemoryReport.row("tree", "symbols", 10, 1000),
+            MemoryReport.row("tree", "peak", None, 1000)]
+    rows = [MemoryReport.row("tree", "packages", 10, 13 * NOISE_FLOOR_BYTES),
+            MemoryReport.row("tree", "symbols", 10, 3000),
+            MemoryReport.row("tree", "peak", None, 10 ** 9)]
+    assert MemoryReport.compare(rows, base, 0.2) == ["tree packages: 640.0 KB → 832.0 KB"]
+    assert MemoryReport.compare(rows, base, 0.5) == []
@@ -0,0 +1,71 @@
+# tests/test_package_store.py
+
+import pytest
+
+from gui.package_store import PackageStore
+
+
+def _store():
+    store = PackageStore()
+    diffs = []
+    store.subscribe(diffs.append)
+    store.load(["R0402", "R0603", "R0805"], prefill={"R0603": {"desc": "RES", "lcsc": "C1"}})
+    diffs.clear()
+    return store, diffs
+
+
+def test_changes_notify_only_the_changed_rows():
+    store, diffs = _store()
+    store.set_selected("R0402")
+    store.set_field("R0805", "lcsc", "C2")
+    store.set_field("R0805", "lcsc", "C2")    # unchanged: no notification
+    assert diffs == [
+        {"reset": False, "selected": {"R0402"}, "fields": set()},
+        {"reset": False, "selected": set(), "fields": {"R0805"}},
+    ]
+    assert store.get("R0603", "desc") == "RES"
+
+
+def test_selected_rows_in_display_order():
+    store, _diffs = _store()
+    store.set_selection(["R0805", "R0402", "NOT_LISTED"])
+    store.set_field("R0402", "desc", "RES 0402")
+    assert store.selected_rows() == [("R0402", "RES 0402", ""), ("R0805", "", "")]
+
+
+def test_bulk_operations_notify_once():
+    store, diffs = _store()
+    store.select_all()
+    store.invert_selection()
+    store.select_present()
+    store.select_none()
+    assert [diff["selected"] for diff in diffs] == [
+        {"R0402", "R0603", "R0805"}, {"R0402", "R0603", "R0805"}, {"R0603"}, {"R0603"}]
+    store.select_none()    # nothing changes: no notification
+    assert len(diffs) == 4
+
+
+def test_select_matching():
+    store, diffs = _store()
+    assert store.select_matching("r06") == 1
+    assert store.select_matching(r"0[48]0", regex=True, add=True) == 2
+    assert store.selected == {"R0402", "R0603", "R0805"}
+    assert store.select_matching("^R04", regex=True) == 1
+    assert store.selected == {"R0402"} and len(diffs) == 3
+
+
+def test_select_matching_rejects_invalid_regex():
+    store, diffs = _store()
+    store.set_selected("R0402")
+    with pytest.raises(RuntimeError, match="Invalid regular expression"):
+        store.select_matching("R0(", regex=True)
+    assert store.selected == {"R0402"} and len(diffs) == 1
+
+
+def test_reset_values_is_one_notification():
+    store, diffs = _store()
+    store.select_all()
+    diffs.clear()
+    store.reset_values()
+    assert diffs == [{"reset": False, "selected": {"R0402", "R0603", "R0805"}, "fields": {"R0603"}}]
+    assert store.selected_rows() == []
@@ -0,0 +1,65 @@
+# tests/test_parts_index.py
+
+import os
+
+import pytest
+
+from core.parts_index import PartsIndex, scan_library
+from core.sample_library import write_sample_library
+
+
+@pytest.fixture
+def libraries(tmp_path):
+    root = tmp_path / "libs"
+    (root / "sub").mkdir(parents=True)
+    paths = [str(root / "a.lbr"), str(root / "sub" / "b.lbr")]
+    for seed, path in enumerate(paths):
+        write_sample_library(path, n_packages=8, n_devicesets=4, seed=seed)
+    return str(root), paths
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = PartsIndex(str(tmp_path / "parts.sqlite"))
+    yield index
+    index.close()
+
+
+def test_scan_library_rows(sample_path):
+    path, rows = scan_library(sample_path)
+    assert path == sample_path
+    assert len(rows) == 8 + 4 * 3    # DEVICE_NAME's devices plus three per deviceset
+    row = next(r for r in rows if r[1] == "1K")
+    assert row[5].startswith("C") and row[6] == "1K" and row[7].startswith("RES 1K ")
+
+
+def test_update_and_search(libraries, index):
+    root, paths = libraries
+    rescanned, removed, failed = index.update(root, workers=1)
+    assert sorted(rescanned) == sorted(paths) and removed == [] and failed == []
+    assert index.count() == (2, 40)
+
+    hits = index.search("res 2k")
+    assert hits and all(row[1] == "2K" for row in hits)
+    assert {row[0] for row in hits} == set(paths)
+    assert index.search("") == []
+    assert index.search("100%") == []    # LIKE wildcards are matched literally
+
+
+def test_update_rescans_only_changed_files(libraries, index):
+    root, paths = libraries
+    index.update(root, workers=1)
+    assert index.update(root, workers=1) == ([], [], [])
+
+    write_sample_library(paths[0], n_packages=8, n_devicesets=5, seed=7)
+    st = os.stat(paths[0])
+    os.utime(paths[0], ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    os.remove(paths[1])
+    with open(os.path.join(root, "broken.lbr"), "w", encoding="utf-8") as f:
+        f.write("<eagle><drawing>")
+
+    rescanned, removed, failed = index.update(root, workers=1)
+    assert rescanned == [paths[0]] and removed == [paths[1]]
+    assert [os.path.basename(path) for path, _ in failed] == ["broken.lbr"]
+    assert index.count() == (1, 8 + 5 * 3)
+    assert index.search("5k")
@@ -0,0 +1,30 @@
+# tests/test_perf_harness.py
+
+from gui.perf_harness import NOISE_FLOOR_MS, compare, format_table
+
+
+def _row(op, ms, created=0, size="100x10"):
+    return {"size": size, "op": op, "ms": ms, "widgets": 50, "created": created, "rss_mb": None}
+
+
+def test_compare_flags_slowdowns_above_tolerance_and_noise_floor():
+    baseline = [_row("open", 100.0), _row("select", 1.0), _row("add", 40.0)]
+    results = [
+        _row("open", 160.0),                     # +60 %: a regression at 50 % tolerance
+        _row("select", 1.0 + NOISE_FLOOR_MS),    # doubled, but within the noise floor
+        _row("add", 50.0),                       # +25 %
+        _row("search", 999.0),                   # not in the baseline
+    ]
+    assert compare(results, baseline, 0.5) == ["100x10 open: 100.0 → 160.0 ms"]
+    assert compare(results, baseline, 1.0) == []
+
+
+def test_compare_flags_new_widgets():
+    assert compare([_row("select", 1.0, created=3)], [_row("select", 1.0, created=0)], 0.5) == [
+        "100x10 select: creates 3 widgets (was 0)"]
+
+
+def test_format_table():
+    lines = format_table([_row("open", 12.5, created=4)]).splitlines()
+    assert lines[0].split() == ["size", "op", "ms", "widgets", "created", "rss_mb"]
+    assert lines[1].split() == ["100x10", "open", "12.5", "50", "4"]
@@ -0,0 +1,65 @@
+# tests/test_preview.py
+
+import copy
+import struct
+import xml.etree.ElementTree as ET
+import zlib
+
+from core.library_index import LibraryIndex
+from core.preview import PreviewRenderer, ThumbnailCache
+
+
+def _decode_png(data):
+    """
+    (width, height, RGBA bytes) of a PNG written by PreviewRenderer.encode_png.
+    """
+    assert data.startswith(b"\x89PNG\r\n\x1a\n")
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, = struct.unpack(">I", data[pos:pos + 4])
+        tag, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        assert struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(tag + body)
+        chunks[tag] = chunks.get(tag, b"") + body
+        pos += 12 + length
+    width, height = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    stride = width * 4 + 1
+    return width, height, b"".join(raw[y * stride + 1:(y + 1) * stride] for y in range(height))
+
+
+def _package(tree, name="P0000"):
+    return LibraryIndex.for_tree(tree).element("package", name)
+
+
+def test_render_png_draws_the_footprint(sample_tree):
+    width, height, rgba = _decode_png(PreviewRenderer.render_png(_package(sample_tree), 48, 32))
+    assert (width, height) == (48, 32) and len(rgba) == 48 * 32 * 4
+    assert any(rgba[3::4])    # something opaque was drawn
+
+
+def test_render_empty_element_is_transparent():
+    assert not any(PreviewRenderer.render(ET.Element("package", name="EMPTY"), 16, 16))
+
+
+def test_cache_is_keyed_by_content(sample_tree):
+    cache = ThumbnailCache()
+    renamed = copy.deepcopy(_package(sample_tree))
+    renamed.set("name", "OTHER")
+    key, data = cache.thumbnail(_package(sample_tree), 32, 32)
+    assert cache.thumbnail(renamed, 32, 32) == (key, data)
+    assert cache.rendered == 1
+    assert cache.thumbnail(_package(sample_tree, "P0001"), 32, 32)[0] != key
+    assert cache.thumbnail(_package(sample_tree), 64, 64)[0] != key
+    assert cache.rendered == 3
+
+
+def test_disk_cache_survives_instances_and_memory_is_lru(sample_tree, tmp_path):
+    first = ThumbnailCache(str(tmp_path / "thumbs"), memory_items=1)
+    key, data = first.thumbnail(_package(sample_tree), 32, 32)
+    first.thumbnail(_package(sample_tree, "P0001"), 32, 32)
+    assert list(first._memory) != [key]    # evicted from memory…
+    assert first.get(key) == data          # …but still on disk
+
+    second = ThumbnailCache(str(tmp_path / "thumbs"))
+    assert second.thumbnail(_package(sample_tree), 32, 32) == (key, data)
+    assert second.rendered == 0
@@ -0,0 +1,59 @@
+# tests/test_rename.py
+
+import pytest
+
+from core.library_import import LibraryImporter
+from core.library_index import LibraryIndex
+from core.sample_library import write_sample_library
+from core.xml_handler import XMLHandler
+
+
+def _sample(tmp_path, name):
+    path = tmp_path / name
+    write_sample_library(str(path), n_packages=4, n_devicesets=3)
+    return XMLHandler.parse_library(str(path))
+
+
+def test_rename_after_replace_import(tmp_path):
+    dst = _sample(tmp_path, "dst.lbr")
+    src = _sample(tmp_path, "src.lbr")
+    # A different P0000 in the source, so "replace" swaps in a new <package>, used by a
+    # deviceset the destination doesn't have
+    smd = src.getroot().find("./drawing/library/packages/package[@name='P0000']/smd")
+    smd.set("dx", "0.9")
+    src.getroot().find("./drawing/library/devicesets/deviceset[@name='DEVICE_NAME']").set("name", "NEW")
+
+    LibraryIndex.for_tree(dst).element("package", "P0000")    # build the table first
+    report = LibraryImporter.import_devicesets(dst, src, ["NEW"], policy="replace")
+    assert "package P0000" in report["replaced"]
+
+    XMLHandler.rename(dst, "package", "P0000", "PNEW")
+    names = [p.get("name") for p in dst.getroot().iterfind("./drawing/library/packages/package")]
+    assert "PNEW" in names and "P0000" not in names
+    assert XMLHandler.validate(dst) == []
+    assert LibraryIndex.for_tree(dst).element("package", "PNEW").find("smd").get("dx") == "0.9"
+
+
+def test_undo_restores_the_actual_deviceset_name(sample_tree):
+    updated, undo = XMLHandler.rename_many(sample_tree, [("deviceset", "1k", "ONE")])
+    assert undo == [("deviceset", "ONE", "1K")]
+    XMLHandler.rename_many(sample_tree, undo)
+    assert XMLHandler.get_existing_deviceset(sample_tree, "1K").get("name") == "1K"
+
+
+def test_rename_rejects_names_equal_ignoring_case(sample_tree):
+    with pytest.raises(RuntimeError, match="P0001"):
+        XMLHandler.rename(sample_tree, "package", "P0000", "p0001")
+    with pytest.raises(RuntimeError, match="already exists"):
+        XMLHandler.rename(sample_tree, "deviceset", "1K", "2k")
+    # A change of case of the name itself is fine
+    assert XMLHandler.rename(sample_tree, "package", "P0000", "p0000")[1] == "P0000"
+    assert XMLHandler.validate(sample_tree) == []
+
+
+def test_rename_updates_references_and_fails_cleanly(sample_tree):
+    referrers = len(LibraryIndex.for_tree(sample_tree).referrers("package", "P0003"))
+    assert XMLHandler.rename(sample_tree, "package", "P0003", "R0603") == (referrers, "P0003")
+    assert XMLHandler.validate(sample_tree) == []
+    with pytest.raises(RuntimeError, match="not found"):
+        XMLHandler.rename(sample_tree, "symbol", "NOSYM", "X")
@@ -0,0 +1,102 @@
+# tests/test_schematic_scan.py
+
+import pytest
+
+from core.library_index import LibraryIndex
+from core.schematic_scan import SchematicScanner, scan_schematic
+from core.xml_handler import XMLHandler
+
+
+def _lcsc(tree, device):
+    tech = LibraryIndex.for_tree(tree).technology("DEVICE_NAME", device, "")
+    return next(a.get("value") for a in tech.iterfind("attribute") if a.get("name") == "LCSC_PART")
+
+
+def _write_schematic(path, embedded, parts):
+    """
+    embedded: [(library, deviceset, device, package, lcsc)]; parts: [(name, library,
+    deviceset, device, override lcsc or None)].
+    """
+    libraries = {}
+    for library, ds, device, package, lcsc in embedded:
+        package_attr = f' package="{package}"' if package else ""
+        libraries.setdefault(library, []).append(
+            f'<deviceset name="{ds}"><devices><device name="{device}"{package_attr}>'
+            f'<technologies><technology name=""><attribute name="LCSC_PART" value="{lcsc}"/></technology>'
+            f'</technologies></device></devices></deviceset>'
+        )
+    part_xml = "".join(
+        f'<part name="{name}" library="{library}" deviceset="{ds}" device="{device}" value="V">'
+        + ("" if lcsc is None else f'<attribute name="LCSC_PART" value="{lcsc}"/>') + "</part>"
+        for name, library, ds, device, lcsc in parts
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "<eagle><drawing><schematic><libraries>"
+            + "".join(f'<library name="{lib}"><devicesets>{"".join(sets)}</devicesets></library>'
+                      for lib, sets in libraries.items())
+            + f"</libraries><parts>{part_xml}</parts><sheets/></schematic></drawing></eagle>"
+        )
+
+
+@pytest.fixture
+def schematic(sample_path, sample_tree, tmp_path):
+    # P0002 has no LCSC_PART in the library: a gap
+    XMLHandler.set_lcsc(sample_tree, [("DEVICE_NAME", "P0002", "", "")])
+    XMLHandler.save_library(sample_tree, sample_path)
+    ok, other = _lcsc(sample_tree, "P0000"), _lcsc(sample_tree, "P0001")
+    path = str(tmp_path / "project" / "board.sch")
+    (tmp_path / "project").mkdir()
+    _write_schematic(path, [
+        ("library", "DEVICE_NAME", "P0000", "P0000", ok),
+        ("library", "DEVICE_NAME", "P0001", "P0001", "C1"),    # older copy in the schematic
+        ("library", "DEVICE_NAME", "P0002", "P0002", ""),
+        ("supply", "GND", "", "", ""),                         # no package: not a part to order
+    ], [
+        ("R1", "library", "DEVICE_NAME", "P0000", None),
+        ("R2", "library", "DEVICE_NAME", "P0001", None),
+        ("R3", "library", "DEVICE_NAME", "P0001", other),      # part attribute overrides the copy
+        ("R4", "library", "DEVICE_NAME", "P0002", None),
+        ("R5", "library", "GONE", "P0000", None),
+        ("R6", "elsewhere", "X", "Y", None),
+        ("R7", "elsewhere", "X", "Y", "C7"),
+        ("GND1", "supply", "GND", "", None),
+    ])
+    return path, other
+
+
+def test_scan_schematic_rows(schematic):
+    path, other = schematic
+    _path, parts = scan_schematic(path)
+    assert [p[0] for p in parts] == ["R1", "R2", "R3", "R4", "R5", "R6", "R7"]
+    assert parts[1][-1] == "C1" and parts[2][-1] == other
+
+
+def test_statuses(schematic, sample_path):
+    path, other = schematic
+    report = SchematicScanner.for_paths([sample_path]).scan([path], workers=1)
+    status = {row["part"]: row["status"] for row in report["issues"]}
+    assert status == {"R2": "stale", "R4": "missing", "R5": "not in library", "R6": "unknown library"}
+    assert report["counts"] == {"missing": 1, "stale": 1, "not in library": 1, "unknown library": 1, "ok": 3}
+    stale = next(row for row in report["issues"] if row["part"] == "R2")
+    assert (stale["sch_lcsc"], stale["lib_lcsc"]) == ("C1", other)
+
+
+def test_gaps_fill_the_library(schematic, sample_path, tmp_path):
+    path, _other = schematic
+    report = SchematicScanner.for_paths([sample_path]).scan([str(tmp_path / "project")], workers=1)
+    SchematicScanner.save_report(report, str(tmp_path / "report.json"))
+    gaps = SchematicScanner.gaps(SchematicScanner.load_report(str(tmp_path / "report.json")), sample_path)
+    assert [(g["device"], g["status"]) for g in gaps] == [("P0002", "missing"), ("P0001", "stale")]
+
+    tree = XMLHandler.parse_library(sample_path)
+    fixes = [("DEVICE_NAME", "P0002", "", "C2002"), ("GONE", "P0000", "", "C5")]
+    assert XMLHandler.set_lcsc(tree, fixes) == (1, ["GONE/P0000/-"])
+    assert _lcsc(tree, "P0002") == "C2002"
+
+
+def test_load_report_rejects_other_files(tmp_path):
+    path = tmp_path / "x.json"
+    path.write_text("[1, 2]", encoding="utf-8")
+    with pytest.raises(RuntimeError, match="Not a schematic report"):
+        SchematicScanner.load_report(str(path))
@@ -0,0 +1,81 @@
+# tests/test_server.py
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from server import LibraryClient, LibraryService, RPCError, make_server
+
+PING = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"})
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, body=PING, **headers):
+    headers = {"Content-Type": "application/json", "X-Library-Token": server.token, **headers}
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    conn.putrequest("POST", "/", skip_host="Host" in headers)
+    for name, value in headers.items():
+        conn.putheader(name, value)
+    data = body.encode("utf-8")
+    if "Content-Length" not in headers:
+        conn.putheader("Content-Length", str(len(data)))
+    conn.endheaders(data)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def test_client_calls_and_batches(server, sample_path):
+    client = LibraryClient(port=server.server_address[1], token=server.token)
+    assert client.call("ping") == "pong"
+    packages, devicesets = client.batch([("list_packages", [sample_path]), ("list_devicesets", [sample_path])])
+    assert packages[0] == "P0000" and "1K" in devicesets
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({"Content-Type": "text/plain"}, 415),
+    ({"Origin": "http://example.com"}, 403),
+    ({"Host": "evil.example:8765"}, 403),
+    ({"X-Library-Token": "wrong"}, 403),
+])
+def test_refuses_browser_and_foreign_requests(server, headers, status):
+    assert _post(server, **headers)[0] == status
+
+
+def test_refuses_bad_content_length(server):
+    assert _post(server, **{"Content-Length": "-5"})[0] == 400
+    assert _post(server, **{"Content-Length": "abc"})[0] == 400
+    assert _post(server, **{"Content-Length": str(10 ** 12)})[0] == 413
+
+
+def test_wrong_token_raises_in_the_client(server):
+    with pytest.raises(RPCError, match="X-Library-Token"):
+        LibraryClient(port=server.server_address[1], token="wrong").call("ping")
+
+
+def test_notifications_get_no_response(server):
+    assert _post(server, json.dumps({"jsonrpc": "2.0", "method": "nope"})) == (204, b"")
+    status, body = _post(server, json.dumps([
+        {"jsonrpc": "2.0", "method": "ping", "params": [1]},
+        {"jsonrpc": "2.0", "id": 7, "method": "ping"},
+    ]))
+    assert status == 200 and [r["id"] for r in json.loads(body)] == [7]
+
+
+def test_params_are_checked_against_the_signature(sample_path):
+    service = LibraryService()
+    bad = service.handle({"jsonrpc": "2.0", "id": 1, "method": "ping", "params": [1]})
+    assert bad["error"]["code"] == -32602
+    # A TypeError raised inside a method is a server error, not INVALID_PARAMS
+    failed = service.handle({"jsonrpc": "2.0", "id": 2, "method": "query", "params": [sample_path, "", "10"]})
+    assert failed["error"]["code"] == -32000 and "TypeError" in failed["error"]["message"]
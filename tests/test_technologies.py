@@ -0,0 +1,51 @@
+# tests/test_technologies.py
+
+import pytest
+
+from core.library_index import LibraryIndex
+from core.transaction import TreeTransaction
+from core.value_series import ValueSeries
+from core.xml_handler import XMLHandler
+
+
+def _vals(value):
+    return {"value": value, "desc": f"RES {value}", "lcsc": f"C{value}"}
+
+
+def test_set_technologies_adds_then_updates(sample_tree):
+    rows = [("P0000", "1K", _vals("1K")), ("P0000", "2K2", _vals("2K2")), ("P0001", "1K", _vals("1K"))]
+    assert XMLHandler.set_technologies(sample_tree, "R_E12", "R", rows) == (3, 0)
+    ds = LibraryIndex.for_tree(sample_tree).deviceset("R_E12")
+    assert ds.get("prefix") == "R" and ds.get("uservalue") == "yes"
+    assert [row[:3] for row in XMLHandler.technology_rows(ds)] == [
+        ("P0000", "P0000", "1K"), ("P0000", "P0000", "2K2"), ("P0001", "P0001", "1K")]
+    assert XMLHandler.technology_rows(ds)[1][3]["LCSC_PART"] == "C2K2"
+
+    rows = [("P0000", "2K2", {"value": "2K2", "desc": "RES 2.2k 1%", "lcsc": "C99"}),
+            ("P0001", "4K7", _vals("4K7"))]
+    assert XMLHandler.set_technologies(sample_tree, "R_E12", "R", rows) == (1, 1)
+    techs = {(dev, tech): attrs for dev, _pkg, tech, attrs in XMLHandler.technology_rows(ds)}
+    assert techs[("P0000", "2K2")]["DESCRIPTION"] == "RES 2.2k 1%"
+    assert techs[("P0001", "4K7")]["VALUE"] == "4K7"
+    assert len(techs) == 4 and len(ds.findall("devices/device")) == 2
+    assert XMLHandler.validate(sample_tree) == []
+
+
+def test_value_series_as_technologies(sample_tree):
+    args = ("E6", "10", "100", ["P0000", "P0001"])
+    kwargs = {"name_template": "R_{series}", "lcsc_template": "C{value}", "technologies": True}
+    assert ValueSeries.generate(sample_tree, *args, **kwargs) == (1, 0)
+    assert ValueSeries.generate(sample_tree, *args, **kwargs) == (0, 1)
+    ds = LibraryIndex.for_tree(sample_tree).deviceset("R_E6")
+    names = [tech for _dev, pkg, tech, _attrs in XMLHandler.technology_rows(ds) if pkg == "P0000"]
+    assert names == ["10R", "15R", "22R", "33R", "47R", "68R", "100R"]
+    with pytest.raises(RuntimeError, match="deviceset name"):
+        ValueSeries.generate(sample_tree, *args, name_template="{value}", technologies=True)
+
+
+def test_unknown_package_changes_nothing(sample_tree):
+    before = len(sample_tree.getroot().findall(".//deviceset"))
+    with pytest.raises(RuntimeError, match="NOPE"):
+        with TreeTransaction(sample_tree):
+            XMLHandler.set_technologies(sample_tree, "R_E12", "R", [("NOPE", "1K", _vals("1K"))])
+    assert len(sample_tree.getroot().findall(".//deviceset")) == before
@@ -0,0 +1,46 @@
+# tests/test_templates.py
+
+import copy
+
+import pytest
+
+from core.library_index import LibraryIndex
+from core.xml_handler import XMLHandler
+
+PACKAGE = {"value": "1u", "desc": "CAP 1u", "lcsc": "C15849"}
+
+
+def _add_cap_template(tree):
+    """
+    TEMPLATE_CAP: a copy of DEVICE_NAME whose gate uses the CAPACITOR symbol.
+    """
+    ds_parent = tree.getroot().find("./drawing/library/devicesets")
+    template = copy.deepcopy(XMLHandler.get_existing_deviceset(tree, "DEVICE_NAME"))
+    template.set("name", "TEMPLATE_CAP")
+    template.find("gates/gate").set("symbol", "CAPACITOR")
+    XMLHandler.insert_deviceset(tree, ds_parent, template)
+    LibraryIndex.for_tree(tree).deviceset_changed(template)
+
+
+def test_template_names_default_first(sample_tree):
+    _add_cap_template(sample_tree)
+    index = LibraryIndex.for_tree(sample_tree)
+    assert index.template_names() == ["DEVICE_NAME", "TEMPLATE_CAP"]
+    assert index.template("template_cap").gate_symbols == {"G$1": "CAPACITOR"}
+    with pytest.raises(RuntimeError, match="not found"):
+        index.template("TEMPLATE_NONE")
+
+
+def test_new_deviceset_uses_the_chosen_template(sample_tree):
+    _add_cap_template(sample_tree)
+    ds = XMLHandler.add_or_merge_deviceset(sample_tree, "1u", "C", {"P0002": PACKAGE}, template="TEMPLATE_CAP")
+    assert XMLHandler.gate_symbol_map(ds.find("gates")) == {"G$1": "CAPACITOR"}
+    assert XMLHandler.validate(sample_tree) == []
+
+
+def test_changed_template_is_recompiled(sample_tree):
+    index = LibraryIndex.for_tree(sample_tree)
+    template = index.template()
+    assert "P0000" in template.devices
+    XMLHandler.add_or_merge_deviceset(sample_tree, "DEVICE_NAME", "R", {"P0000": PACKAGE}, symbol_name="CAPACITOR")
+    assert index.template().gate_symbols == {"G$1": "CAPACITOR"}
@@ -0,0 +1,43 @@
+# tests/test_transaction.py
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from core.library_session import LibrarySession
+from core.transaction import TreeTransaction
+from core.xml_handler import XMLHandler
+
+PACKAGE = {"value": "10K", "desc": "RES 10K", "lcsc": "C25804"}
+
+
+def test_unknown_symbol_raises_and_restores_the_tree(sample_path):
+    session = LibrarySession.open(sample_path)
+    before = ET.tostring(session.tree.getroot())
+    with pytest.raises(RuntimeError, match="NOSYM"):
+        with session.transaction():
+            session.apply("add 10K", XMLHandler.add_or_merge_deviceset, "10K", "R", {"P0001": PACKAGE})
+            session.apply("add 22K", XMLHandler.add_or_merge_deviceset, "22K", "R", {"P0001": PACKAGE},
+                          symbol_name="NOSYM")
+    assert ET.tostring(session.tree.getroot()) == before
+    assert session.journal == []
+
+
+def test_unknown_package_raises(sample_tree):
+    before = ET.tostring(sample_tree.getroot())
+    with pytest.raises(RuntimeError, match="NOPE"):
+        with TreeTransaction(sample_tree):
+            XMLHandler.add_or_merge_deviceset(sample_tree, "1K", "R", {"P0001": PACKAGE, "NOPE": PACKAGE})
+    assert ET.tostring(sample_tree.getroot()) == before
+    assert XMLHandler.validate(sample_tree) == []
+
+
+def test_rollback_restores_changed_elements(sample_tree):
+    before = ET.tostring(sample_tree.getroot())
+    with pytest.raises(ZeroDivisionError):
+        with TreeTransaction(sample_tree):
+            XMLHandler.add_or_merge_deviceset(sample_tree, "1K", "R", {"P0001": PACKAGE})
+            XMLHandler.rename(sample_tree, "package", "P0002", "P9999")
+            1 / 0
+    assert ET.tostring(sample_tree.getroot()) == before
+    assert "P0002" in XMLHandler.list_packages(sample_tree)
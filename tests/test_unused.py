@@ -0,0 +1,71 @@
+# tests/test_unused.py
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from core.library_catalog import LibraryCatalog
+from core.library_index import LibraryIndex
+from core.sample_library import write_sample_library
+from core.transaction import TreeTransaction
+from core.xml_handler import XMLHandler
+
+
+@pytest.fixture
+def library(tmp_path):
+    """
+    P0000…P0011, of which DEVICE_NAME uses P0000…P0007; CAPACITOR is used by nothing.
+    """
+    path = str(tmp_path / "unused.lbr")
+    write_sample_library(path, n_packages=12, n_devicesets=2)
+    return path, XMLHandler.parse_library(path)
+
+
+def _brute_force(tree, kind):
+    root = tree.getroot()
+    attr, tag = ("package", "device") if kind == "package" else ("symbol", "gate")
+    used = {elem.get(attr) for elem in root.iter(tag)}
+    return sorted((e.get("name") for e in root.iter(kind) if e.get("name") not in used),
+                  key=LibraryIndex.sort_key)
+
+
+def test_find_unused_agrees_with_catalog_and_brute_force(library):
+    path, tree = library
+    catalog = LibraryCatalog.load(path, workers=1)
+    for kind in ("package", "symbol"):
+        assert XMLHandler.find_unused(tree, kind) == catalog.unused(kind) == _brute_force(tree, kind)
+    assert XMLHandler.find_unused(tree, "symbol") == ["CAPACITOR"]
+
+
+def test_find_unused_follows_edits(library):
+    _path, tree = library
+    unused = XMLHandler.find_unused(tree, "package")
+    XMLHandler.add_or_merge_deviceset(tree, "1K", "R", {unused[0]: {"value": "1K", "desc": "RES 1K", "lcsc": "C1"}})
+    assert XMLHandler.find_unused(tree, "package") == _brute_force(tree, "package") == unused[1:]
+    XMLHandler.rename(tree, "symbol", "CAPACITOR", "C_SYM")
+    assert XMLHandler.find_unused(tree, "symbol") == ["C_SYM"]
+
+
+def test_prune_unused_only_removes_unreferenced_names(library):
+    _path, tree = library
+    unused = XMLHandler.find_unused(tree, "package")
+    assert XMLHandler.prune_unused(tree, "package", [unused[0], "P0000", "GONE"]) == [unused[0]]
+    assert XMLHandler.find_unused(tree, "package") == unused[1:]
+    assert XMLHandler.prune_unused(tree, "package") == unused[1:]
+    assert XMLHandler.prune_unused(tree, "symbol") == ["CAPACITOR"]
+    assert XMLHandler.find_unused(tree, "package") == [] and XMLHandler.validate(tree) == []
+    assert _brute_force(tree, "package") == []
+
+
+def test_prune_rolls_back_exactly(library):
+    _path, tree = library
+    before = ET.tostring(tree.getroot())
+    unused = XMLHandler.find_unused(tree, "package")
+    with pytest.raises(ZeroDivisionError):
+        with TreeTransaction(tree):
+            XMLHandler.prune_unused(tree, "package")
+            XMLHandler.prune_unused(tree, "symbol")
+            1 / 0
+    assert ET.tostring(tree.getroot()) == before
+    assert XMLHandler.find_unused(tree, "package") == unused
+    assert XMLHandler.find_unused(tree, "symbol") == ["CAPACITOR"]
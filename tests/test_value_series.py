@@ -0,0 +1,66 @@
+# tests/test_value_series.py
+
+from decimal import Decimal
+
+import pytest
+
+from core.library_index import LibraryIndex
+from core.value_series import ValueSeries
+from core.xml_handler import XMLHandler
+
+
+@pytest.mark.parametrize("text, kind, expected", [
+    ("4K7", "resistor", Decimal("4700")),
+    ("4.7k", "resistor", Decimal("4700")),
+    ("100", "resistor", Decimal("100")),
+    ("1M", "resistor", Decimal("1000000")),
+    ("10Ω", "resistor", Decimal("10")),
+    ("100n", "capacitor", Decimal("100e-9")),
+    ("4u7F", "capacitor", Decimal("4.7e-6")),
+    ("22", "capacitor", Decimal("22e-12")),    # a bare capacitor value is in pF
+])
+def test_parse(text, kind, expected):
+    assert ValueSeries.parse(text, kind) == expected
+
+
+@pytest.mark.parametrize("text", ["", "abc", "4.7K7", "10X"])
+def test_parse_rejects_garbage(text):
+    with pytest.raises(RuntimeError):
+        ValueSeries.parse(text)
+
+
+@pytest.mark.parametrize("value, kind, rkm, si", [
+    (Decimal("4700"), "resistor", "4K7", "4.7k"),
+    (Decimal("100"), "resistor", "100R", "100"),
+    (Decimal("0.47"), "resistor", "R47", "0.47"),
+    (Decimal("1000000"), "resistor", "1M", "1M"),
+    (Decimal("4.7e-9"), "capacitor", "4n7", "4.7n"),
+    (Decimal("1e-6"), "capacitor", "1u", "1u"),
+])
+def test_rkm_and_si(value, kind, rkm, si):
+    assert ValueSeries.rkm(value, kind) == rkm
+    assert ValueSeries.si(value, kind) == si
+
+
+def test_series_values():
+    assert {name: len(m) for name, m in ValueSeries.SERIES.items()} == {
+        "E6": 6, "E12": 12, "E24": 24, "E48": 48, "E96": 96, "E192": 192}
+    assert Decimal("9.20") in ValueSeries.SERIES["E192"]
+    e12 = ValueSeries.values("E12", Decimal(10), Decimal(100))
+    assert [ValueSeries.rkm(v) for v in e12[:3]] + [ValueSeries.rkm(e12[-1])] == ["10R", "12R", "15R", "100R"]
+    assert len(ValueSeries.values("E96", Decimal(10), Decimal(10) ** 6)) == 96 * 5 + 1
+    with pytest.raises(RuntimeError):
+        ValueSeries.values("E12", Decimal(100), Decimal(10))
+
+
+def test_generate_creates_and_merges(sample_tree):
+    created, merged = ValueSeries.generate(sample_tree, "E12", "1K", "10K", ["P0000", "P0001"],
+                                           desc_template="RES {si}Ω {package}", lcsc_template="C{value}")
+    assert (created, merged) == (12, 1)    # 1K already exists
+    index = LibraryIndex.for_tree(sample_tree)
+    ds = index.deviceset("4K7")
+    assert ds.get("prefix") == "R"
+    assert [dev.get("package") for dev in ds.iterfind("devices/device")] == ["P0000", "P0001"]
+    attrs = {a.get("name"): a.get("value") for a in ds.find("devices/device").iter("attribute")}
+    assert attrs["VALUE"] == "4K7" and attrs["DESCRIPTION"] == "RES 4.7kΩ P0000"
+    assert XMLHandler.validate(sample_tree) == []